@@ -45,7 +45,6 @@ def get_coord_dump_freq(inlines):
 
 
 def get_coords_from_dump(dumplines, natoms):
-    nlines = len(dumplines)
     total_natoms = sum(natoms)
     # The output of VIRIAL, FORCE, and VELOCITY are controlled by INPUT parameters dump_virial, dump_force, and dump_vel, respectively.
     # So the search of keywords can determine whether these datas are printed into MD_dump.
@@ -60,77 +59,85 @@ def get_coords_from_dump(dumplines, natoms):
     )
     if "FORCE" in dumplines[check_line]:
         calc_force = True
-
-    nframes_dump = -1
-    if calc_stress:
-        nframes_dump = int(nlines / (total_natoms + 13))
-    else:
-        nframes_dump = int(nlines / (total_natoms + 9))
+    skipline = check_line + 1
+
+    # locate the frame blocks by their MDSTEP markers, dropping a truncated last block
+    starts = [
+        iline
+        for iline, line in enumerate(dumplines)
+        if line.startswith("MDSTEP")
+        and iline + skipline + total_natoms <= len(dumplines)
+    ]
+    nframes_dump = len(starts)
     assert nframes_dump > 0, (
         "Number of lines in MD_dump file = %d. Number of atoms = %d. The MD_dump file is incomplete."  # noqa: UP031
-        % (nlines, total_natoms)
+        % (len(dumplines), total_natoms)
     )
-    cells = np.zeros([nframes_dump, 3, 3])
-    stresses = np.zeros([nframes_dump, 3, 3])
-    forces = np.zeros([nframes_dump, total_natoms, 3])
-    coords = np.zeros([nframes_dump, total_natoms, 3])
-    iframe = 0
-    for iline in range(nlines):
-        if "MDSTEP" in dumplines[iline]:
-            # read in LATTICE_CONSTANT
-            # for abacus version >= v3.1.4, the unit is angstrom, and "ANGSTROM" is added at the end
-            # for abacus version <  v3.1.4, the unit is bohr
-            celldm = float(dumplines[iline + 1].split()[1])
-            newversion = True
-            if "Angstrom" not in dumplines[iline + 1]:
-                celldm *= bohr2ang  # transfer unit to ANGSTROM
-                newversion = False
-
-            # read in LATTICE_VECTORS
-            for ix in range(3):
-                cells[iframe, ix] = (
-                    np.array([float(i) for i in dumplines[iline + 3 + ix].split()[0:3]])
-                    * celldm
-                )
-                if calc_stress:
-                    stresses[iframe, ix] = np.array(
-                        [float(i) for i in dumplines[iline + 7 + ix].split()[0:3]]
-                    )
-
-            if calc_stress:
-                skipline = 11
-            else:
-                skipline = 7
-
-            for iat in range(total_natoms):
-                # INDEX    LABEL    POSITION (Angstrom)    FORCE (eV/Angstrom)    VELOCITY (Angstrom/fs)
-                # 0  Sn  0.000000000000  0.000000000000  0.000000000000  -0.000000000000  -0.000000000001  -0.000000000001  0.001244557166  -0.000346684288  0.000768457739
-                # 1  Sn  0.000000000000  3.102800034079  3.102800034079  -0.000186795145  -0.000453823768  -0.000453823768  0.000550996187  -0.000886442775  0.001579501983
-                # for abacus version >= v3.1.4, the value of POSITION is the real cartessian position, and unit is angstrom, and if cal_force the VELOCITY is added at the end.
-                # for abacus version < v3.1.4, the real position = POSITION * celldm
-                coords[iframe, iat] = np.array(
-                    [float(i) for i in dumplines[iline + skipline + iat].split()[2:5]]
-                )
-
-                if not newversion:
-                    coords[iframe, iat] *= celldm
-
-                if calc_force:
-                    forces[iframe, iat] = np.array(
-                        [
-                            float(i)
-                            for i in dumplines[iline + skipline + iat].split()[5:8]
-                        ]
-                    )
-            iframe += 1
-    assert iframe == nframes_dump, (
-        "iframe=%d, nframe_dump=%d. Number of frames does not match number of lines in MD_dump."  # noqa: UP031
-        % (iframe, nframes_dump)
+
+    # read in LATTICE_CONSTANT
+    # for abacus version >= v3.1.4, the unit is angstrom, and "ANGSTROM" is added at the end
+    # for abacus version <  v3.1.4, the unit is bohr
+    newversion = "Angstrom" in dumplines[starts[0] + 1]
+    celldm = np.array([float(dumplines[ii + 1].split()[1]) for ii in starts])
+    if not newversion:
+        celldm *= bohr2ang  # transfer unit to ANGSTROM
+
+    # read in LATTICE_VECTORS and VIRIAL of all frames at once
+    cells = _parse_block(dumplines, starts, 3, 3, 0, 3).reshape(nframes_dump, 3, 3)
+    cells *= celldm[:, None, None]
+    if calc_stress:
+        stresses = _parse_block(dumplines, starts, 7, 3, 0, 3).reshape(
+            nframes_dump, 3, 3
+        )
+    else:
+        stresses = np.zeros([nframes_dump, 3, 3])
+
+    # INDEX    LABEL    POSITION (Angstrom)    FORCE (eV/Angstrom)    VELOCITY (Angstrom/fs)
+    # 0  Sn  0.000000000000  0.000000000000  0.000000000000  -0.000000000000  -0.000000000001  -0.000000000001  0.001244557166  -0.000346684288  0.000768457739
+    # 1  Sn  0.000000000000  3.102800034079  3.102800034079  -0.000186795145  -0.000453823768  -0.000453823768  0.000550996187  -0.000886442775  0.001579501983
+    # for abacus version >= v3.1.4, the value of POSITION is the real cartessian position, and unit is angstrom, and if cal_force the VELOCITY is added at the end.
+    # for abacus version < v3.1.4, the real position = POSITION * celldm
+    atoms = _parse_block(
+        dumplines, starts, skipline, total_natoms, 2, 8 if calc_force else 5
     )
+    atoms = atoms.reshape(nframes_dump, total_natoms, -1)
+    coords = atoms[:, :, 0:3].copy()
+    if not newversion:
+        coords *= celldm[:, None, None]
+    if calc_force:
+        forces = atoms[:, :, 3:6].copy()
+    else:
+        forces = np.zeros([nframes_dump, total_natoms, 3])
     stresses *= kbar2evperang3
     return coords, cells, forces, stresses
 
 
+def _parse_block(lines, starts, offset, nrows, col_begin, col_end):
+    """Parse the same table of every frame into one float array.
+
+    Parameters
+    ----------
+    lines : list of str
+        lines of the file
+    starts : list of int
+        index of the first line of each frame
+    offset : int
+        offset of the table from the first line of a frame
+    nrows : int
+        number of rows of the table
+    col_begin, col_end : int
+        columns (whitespace separated) to be read
+
+    Returns
+    -------
+    np.ndarray
+        array of shape (nframes * nrows, col_end - col_begin)
+    """
+    rows = [lines[ii + offset + jj] for ii in starts for jj in range(nrows)]
+    tokens = np.array(" ".join(rows).split()).reshape(len(rows), -1)
+    return tokens[:, col_begin:col_end].astype(float)
+
+
 def get_energy(outlines, ndump, dump_freq):
     energy = []
     nenergy = 0
@@ -182,21 +189,19 @@ def get_frame(fname):
         outlines = fp.read().split("\n")
     energy = get_energy(outlines, ndump, dump_freq)
 
-    unconv_stru = ""
-    for i, iene in enumerate(energy):
-        if np.isnan(iene):
-            coords = np.delete(coords, i - ndump, axis=0)
-            cells = np.delete(cells, i - ndump, axis=0)
-            force = np.delete(force, i - ndump, axis=0)
-            stress = np.delete(stress, i - ndump, axis=0)
-            energy = np.delete(energy, i - ndump, axis=0)
-            unconv_stru += "%d " % i  # noqa: UP031
-    ndump = len(energy)
-    if unconv_stru != "":
+    unconv = np.isnan(energy)
+    if np.any(unconv):
+        conv = ~unconv
+        coords = coords[conv]
+        cells = cells[conv]
+        force = force[conv]
+        stress = stress[conv]
+        energy = energy[conv]
+        unconv_stru = "".join("%d " % i for i in np.flatnonzero(unconv))  # noqa: UP031
         warnings.warn(f"Structure {unconv_stru} are unconverged and not collected!")
+    ndump = len(energy)
 
-    for iframe in range(ndump):
-        stress[iframe] *= np.linalg.det(cells[iframe, :, :].reshape([3, 3]))
+    stress *= np.linalg.det(cells)[:, None, None]
     if np.sum(np.abs(stress[0])) < 1e-10:
         stress = None
 
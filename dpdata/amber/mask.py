@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 try:
     import parmed
 except ImportError:
@@ -33,6 +35,58 @@ def pick_by_amber_mask(param, maskstr, coords=None):
     return sele
 
 
+def pick_by_amber_mask_frames(param, maskstr, coords, nprocs=None):
+    """Pick atoms by amber masks for each frame.
+
+    Parameters
+    ----------
+    param : str or parmed.Structure
+        filename of Amber param file or parmed.Structure
+    maskstr : str
+        Amber masks
+    coords : np.ndarray
+        coordinates of all frames, shape: nframes*N*3
+    nprocs : int, optional
+        number of processes. The structure is sent to each process only once.
+
+    Returns
+    -------
+    list[tuple[int]]
+        selected atom indexes of each frame
+    """
+    parm = load_param_file(param)
+    if nprocs is None or nprocs <= 1 or len(coords) <= 1:
+        return [tuple(pick_by_amber_mask(parm, maskstr, cc)) for cc in coords]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # several chunks per process to balance the load
+    chunks = np.array_split(coords, min(len(coords), nprocs * 4))
+    with ProcessPoolExecutor(
+        max_workers=nprocs, initializer=_init_worker, initargs=(parm,)
+    ) as executor:
+        return [
+            sele
+            for chunk_sele in executor.map(
+                _pick_frames_worker, [maskstr] * len(chunks), chunks
+            )
+            for sele in chunk_sele
+        ]
+
+
+# the structure shared by the frames in a worker process
+_worker_parm = None
+
+
+def _init_worker(parm):
+    global _worker_parm
+    _worker_parm = parm
+
+
+def _pick_frames_worker(maskstr, coords):
+    return [tuple(pick_by_amber_mask(_worker_parm, maskstr, cc)) for cc in coords]
+
+
 def load_param_file(param_file):
     if isinstance(param_file, str):
         return parmed.load_file(param_file)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import re
+from functools import lru_cache
 
 import numpy as np
 
@@ -18,36 +19,43 @@ energy_convert = kcalmol2eV
 force_convert = energy_convert
 
 
-def read_amber_traj(
-    parm7_file,
-    nc_file,
-    mdfrc_file=None,
-    mden_file=None,
-    mdout_file=None,
-    use_element_symbols=None,
-    labeled=True,
-):
-    """The amber trajectory includes:
-    * nc, NetCDF format, stores coordinates
-    * mdfrc, NetCDF format, stores forces
-    * mden (optional), text format, stores energies
-    * mdout (optional), text format, may store energies if there is no mden_file
-    * parm7, text format, stores types.
+def read_parm7_types(parm7_file, read_atomic_number=False):
+    """Read Amber atom types and atomic numbers from a parm7 file.
+
+    The result is cached by the path and the modification time of the file,
+    so repeated loads of the same topology do not parse it again.
 
     Parameters
     ----------
-    parm7_file, nc_file, mdfrc_file, mden_file, mdout_file:
-        filenames
-    use_element_symbols : None or list or str
-        If use_element_symbols is a list of atom indexes, these atoms will use element symbols
-        instead of amber types. For example, a ligand will use C, H, O, N, and so on
-        instead of h1, hc, o, os, and so on.
-        IF use_element_symbols is str, it will be considered as Amber mask.
-    labeled : bool
-        Whether to return labeled data
+    parm7_file : str or file object
+        parm7 file
+    read_atomic_number : bool, default=False
+        whether to read atomic numbers
+
+    Returns
+    -------
+    amber_types : list of str
+        Amber atom types
+    atomic_number : list of int
+        atomic numbers, empty if `read_atomic_number` is False
     """
-    from scipy.io import netcdf_file
+    if isinstance(parm7_file, (str, os.PathLike)):
+        path = os.path.abspath(parm7_file)
+        amber_types, atomic_number = _read_parm7_types_cached(
+            path, os.path.getmtime(path), read_atomic_number
+        )
+    else:
+        amber_types, atomic_number = _read_parm7_types(parm7_file, read_atomic_number)
+    # return copies as the cached results should not be modified
+    return list(amber_types), list(atomic_number)
+
 
+@lru_cache(maxsize=16)
+def _read_parm7_types_cached(path, mtime, read_atomic_number):
+    return _read_parm7_types(path, read_atomic_number)
+
+
+def _read_parm7_types(parm7_file, read_atomic_number):
     flag_atom_type = False
     flag_atom_numb = False
     amber_types = []
@@ -56,7 +64,7 @@ def read_amber_traj(
         for line in f:
             if line.startswith("%FLAG"):
                 flag_atom_type = line.startswith("%FLAG AMBER_ATOM_TYPE")
-                flag_atom_numb = (use_element_symbols is not None) and line.startswith(
+                flag_atom_numb = read_atomic_number and line.startswith(
                     "%FLAG ATOMIC_NUMBER"
                 )
             elif flag_atom_type or flag_atom_numb:
@@ -75,16 +83,60 @@ def read_amber_traj(
                             amber_types.append(content)
                         elif flag_atom_numb:
                             atomic_number.append(int(content))
+    return tuple(amber_types), tuple(atomic_number)
+
+
+def read_amber_traj(
+    parm7_file,
+    nc_file,
+    mdfrc_file=None,
+    mden_file=None,
+    mdout_file=None,
+    use_element_symbols=None,
+    labeled=True,
+    begin=0,
+    end=None,
+    step=1,
+):
+    """The amber trajectory includes:
+    * nc, NetCDF format, stores coordinates
+    * mdfrc, NetCDF format, stores forces
+    * mden (optional), text format, stores energies
+    * mdout (optional), text format, may store energies if there is no mden_file
+    * parm7, text format, stores types.
+
+    Parameters
+    ----------
+    parm7_file, nc_file, mdfrc_file, mden_file, mdout_file:
+        filenames
+    use_element_symbols : None or list or str
+        If use_element_symbols is a list of atom indexes, these atoms will use element symbols
+        instead of amber types. For example, a ligand will use C, H, O, N, and so on
+        instead of h1, hc, o, os, and so on.
+        IF use_element_symbols is str, it will be considered as Amber mask.
+    labeled : bool
+        Whether to return labeled data
+    begin, end, step : int, optional
+        The frames to read. NetCDF files are memory-mapped, so only the
+        requested frames are read from the disk.
+    """
+    from scipy.io import netcdf_file
+
+    frames = slice(begin, end, step)
+    amber_types, atomic_number = read_parm7_types(
+        parm7_file, read_atomic_number=use_element_symbols is not None
+    )
     if use_element_symbols is not None:
         if isinstance(use_element_symbols, str):
             use_element_symbols = pick_by_amber_mask(parm7_file, use_element_symbols)
         for ii in use_element_symbols:
             amber_types[ii] = symbols[atomic_number[ii]]
 
-    with netcdf_file(nc_file, "r") as f:
-        coords = np.array(f.variables["coordinates"][:])
-        cell_lengths = np.array(f.variables["cell_lengths"][:])
-        cell_angles = np.array(f.variables["cell_angles"][:])
+    # arrays are copied from the memory map before the file is closed
+    with netcdf_file(nc_file, "r", mmap=True) as f:
+        coords = np.array(f.variables["coordinates"][frames])
+        cell_lengths = np.array(f.variables["cell_lengths"][frames])
+        cell_angles = np.array(f.variables["cell_angles"][frames])
         if np.all(cell_angles > 89.99) and np.all(cell_angles < 90.01):
             # only support 90
             # TODO: support other angles
@@ -96,8 +148,8 @@ def read_amber_traj(
             raise RuntimeError("Unsupported cells")
 
     if labeled:
-        with netcdf_file(mdfrc_file, "r") as f:
-            forces = np.array(f.variables["forces"][:])
+        with netcdf_file(mdfrc_file, "r", mmap=True) as f:
+            forces = np.array(f.variables["forces"][frames])
 
         # load energy from mden_file or mdout_file
         energies = []
@@ -116,6 +168,7 @@ def read_amber_traj(
                         energies.append(float(s[-1]))
         else:
             raise RuntimeError("Please provide one of mden_file and mdout_file")
+        energies = energies[frames]
 
     atom_names, atom_types, atom_numbs = np.unique(
         amber_types, return_inverse=True, return_counts=True
@@ -87,7 +87,11 @@ def parse_sqm_out(fname: FileType):
     return data
 
 
-def make_sqm_in(data, fname: FileType | None = None, frame_idx=0, **kwargs):
+def _make_sqm_template(data, **kwargs):
+    """Make the template of the sqm input file shared by all frames.
+
+    The coordinates are ``%16.6f`` placeholders.
+    """
     symbols = [data["atom_names"][ii] for ii in data["atom_types"]]
     atomic_numbers = [ELEMENTS.index(ss) + 1 for ss in symbols]
     charge = kwargs.get("charge", 0)
@@ -106,15 +110,34 @@ def make_sqm_in(data, fname: FileType | None = None, frame_idx=0, **kwargs):
     ret += f"     maxcyc={maxcyc}\n"
     ret += "     verbosity=4\n"
     ret += " /\n"
-    for ii in range(len(data["atom_types"])):
-        ret += "{:>4s}{:>6s}{:>16s}{:>16s}{:>16s}\n".format(
-            str(atomic_numbers[ii]),
-            str(symbols[ii]),
-            f"{data['coords'][frame_idx][ii, 0]:.6f}",
-            f"{data['coords'][frame_idx][ii, 1]:.6f}",
-            f"{data['coords'][frame_idx][ii, 2]:.6f}",
-        )
+    ret = ret.replace("%", "%%")
+    for number, symbol in zip(atomic_numbers, symbols):
+        ret += f"{number!s:>4s}{symbol.replace('%', '%%'):>6s}%16.6f%16.6f%16.6f\n"
+    return ret
+
+
+def make_sqm_in(data, fname: FileType | None = None, frame_idx=0, **kwargs):
+    ret = _make_sqm_template(data, **kwargs) % tuple(data["coords"][frame_idx].ravel())
     if fname is not None:
         with open_file(fname, "w") as fp:
             fp.write(ret)
     return ret
+
+
+def make_sqm_inputs(data, **kwargs):
+    """Make sqm input files of all frames, which share the same template.
+
+    Parameters
+    ----------
+    data : dict
+        system data
+    **kwargs : dict
+        other parameters. See :meth:`dpdata.plugins.amber.SQMINFormat.to_system`
+
+    Returns
+    -------
+    list[str]
+        sqm input string of each frame
+    """
+    template = _make_sqm_template(data, **kwargs)
+    return [template % tuple(cc.ravel()) for cc in data["coords"]]
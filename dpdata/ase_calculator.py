@@ -2,14 +2,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
 from ase.calculators.calculator import (  # noqa: TID253
     Calculator,
     PropertyNotImplementedError,
     all_changes,
 )
 
-import dpdata
-
 from .driver import Driver
 
 if TYPE_CHECKING:
@@ -19,6 +18,11 @@ if TYPE_CHECKING:
 class DPDataCalculator(Calculator):
     """Implementation of ASE deepmd calculator based on a driver.
 
+    The coordinates and the cell of the atoms are passed to the driver as
+    arrays, without building a System. The atom types are computed again
+    only when the atomic numbers are changed, e.g. between the steps of a
+    MD simulation or an optimization they are reused.
+
     Parameters
     ----------
     driver : Driver
@@ -34,6 +38,41 @@ class DPDataCalculator(Calculator):
     def __init__(self, driver: Driver, **kwargs) -> None:
         Calculator.__init__(self, label=Driver.__name__, **kwargs)
         self.driver = driver
+        # atomic numbers, atom names, atom numbers, and atom types of the last atoms
+        self._types = None
+
+    def _get_data(self, atoms: Atoms) -> dict:
+        """Get the system data of the atoms.
+
+        Parameters
+        ----------
+        atoms : Atoms
+            atoms object
+
+        Returns
+        -------
+        dict
+            system data with a single frame
+        """
+        numbers = atoms.get_atomic_numbers()
+        if self._types is None or not np.array_equal(numbers, self._types[0]):
+            symbols = atoms.get_chemical_symbols()
+            atom_names = list(dict.fromkeys(symbols))
+            atom_numbs = [symbols.count(symbol) for symbol in atom_names]
+            atom_types = np.array(
+                [atom_names.index(symbol) for symbol in symbols], dtype=int
+            )
+            self._types = (numbers, atom_names, atom_numbs, atom_types)
+        _, atom_names, atom_numbs, atom_types = self._types
+        return {
+            "atom_names": list(atom_names),
+            "atom_numbs": list(atom_numbs),
+            "atom_types": atom_types,
+            "cells": np.array(atoms.cell, dtype=float).reshape(1, 3, 3),
+            "coords": np.array(atoms.positions, dtype=float).reshape(1, -1, 3),
+            "orig": np.zeros(3),
+            "nopbc": not np.any(atoms.get_pbc()),
+        }
 
     def calculate(
         self,
@@ -54,10 +93,7 @@ class DPDataCalculator(Calculator):
             unused, only for function signature compatibility, by default all_changes
         """
         assert atoms is not None
-        atoms = atoms.copy()
-
-        system = dpdata.System(atoms, fmt="ase/structure")
-        data = system.predict(driver=self.driver).data
+        data = self.driver.label(self._get_data(atoms))
 
         self.results["energy"] = data["energies"][0]
         # see https://gitlab.com/ase/ase/-/merge_requests/2485
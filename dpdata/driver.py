@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Callable
 
+import numpy as np
+
 from .plugin import Plugin
 
 if TYPE_CHECKING:
@@ -116,23 +124,40 @@ class HybridDriver(Driver):
         list of drivers or drivers dict. For a dict, it should
         contain `type` as the name of the driver, and others
         are arguments of the driver.
+    parallel : bool, default=False
+        run the drivers concurrently
+    executor : {"thread", "process"}, default="thread"
+        run the drivers in threads or processes when `parallel` is set.
+        Drivers must be picklable to run in processes.
+    max_workers : int, optional
+        maximum number of concurrent drivers, defaults to the number of
+        drivers
 
     Raises
     ------
     TypeError
         The value of `drivers` is not a dict or `Driver`.
+    ValueError
+        The value of `executor` is not "thread" or "process".
 
     Examples
     --------
     >>> driver = HybridDriver([
     ...     {"type": "sqm", "qm_theory": "DFTB3"},
     ...     {"type": "dp", "dp": "frozen_model.pb"},
-    ... ])
+    ... ], parallel=True)
 
-    This driver is the hybrid of SQM and DP.
+    This driver is the hybrid of SQM and DP. The SQM and DP parts
+    run concurrently.
     """
 
-    def __init__(self, drivers: list[dict | Driver]) -> None:
+    def __init__(
+        self,
+        drivers: list[dict | Driver],
+        parallel: bool = False,
+        executor: str = "thread",
+        max_workers: int | None = None,
+    ) -> None:
         self.drivers = []
         for driver in drivers:
             if isinstance(driver, Driver):
@@ -143,11 +168,50 @@ class HybridDriver(Driver):
                 self.drivers.append(Driver.get_driver(type)(**driver))
             else:
                 raise TypeError("driver should be Driver or dict")
+        if executor not in ("thread", "process"):
+            raise ValueError("executor should be 'thread' or 'process'")
+        self.parallel = parallel
+        self.executor = executor
+        self.max_workers = max_workers
+
+    @property
+    def fingerprint(self) -> list[str]:
+        """Fingerprints of the drivers, in order. See :func:`driver_fingerprint`."""
+        return [driver_fingerprint(driver) for driver in self.drivers]
+
+    def _label_all(self, data: dict):
+        """Label the data by each driver, concurrently if `parallel` is set.
+
+        Each driver gets a shallow copy of the data, as a driver may add
+        keys to the dict it gets. The arrays are shared by all drivers as
+        read-only views, so a driver must not modify them in place.
+        """
+        if not self.parallel or len(self.drivers) <= 1:
+            for driver in self.drivers:
+                yield driver.label(dict(data))
+            return
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+        max_workers = self.max_workers or len(self.drivers)
+        with pool(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(driver.label, dict(data)) for driver in self.drivers
+            ]
+            for future in futures:
+                yield future.result()
 
     def label(self, data: dict) -> dict:
         """Label a system data.
 
-        Energies and forces are the sum of those of each driver.
+        Energies and forces are the sum of those of each driver. With
+        `parallel`, the drivers run concurrently in threads, which suits
+        drivers waiting for external programs, or in processes if `executor`
+        is "process". The labels are summed in the order of the drivers.
+
+        The drivers get read-only views of the arrays in `data`, which are
+        shared by the threads; a driver modifying them in place raises
+        ValueError.
 
         Parameters
         ----------
@@ -159,20 +223,448 @@ class HybridDriver(Driver):
         dict
             labeled data with energies and forces
         """
+        readonly_data = {}
+        for key, value in data.items():
+            if isinstance(value, np.ndarray):
+                value = value.view()
+                value.setflags(write=False)
+            readonly_data[key] = value
         labeled_data = {}
-        for ii, driver in enumerate(self.drivers):
-            lb_data = driver.label(data.copy())
+        for ii, lb_data in enumerate(self._label_all(readonly_data)):
             if ii == 0:
-                labeled_data = lb_data.copy()
+                labeled_data = dict(lb_data)
+                # the sum is accumulated in place in new arrays
+                for key in ("energies", "forces", "virials"):
+                    if key in labeled_data:
+                        labeled_data[key] = np.array(labeled_data[key], dtype=float)
             else:
                 labeled_data["energies"] += lb_data["energies"]
-                if "forces" in labeled_data and "forces" in lb_data:
-                    labeled_data["forces"] += lb_data["forces"]
-                if "virials" in labeled_data and "virials" in lb_data:
-                    labeled_data["virials"] += lb_data["virials"]
+                for key in ("forces", "virials"):
+                    if key in labeled_data and key in lb_data:
+                        labeled_data[key] += lb_data[key]
+        # the returned arrays of the input are writable as the input
+        for key, value in readonly_data.items():
+            if labeled_data.get(key) is value:
+                labeled_data[key] = data[key]
         return labeled_data
 
 
+@Driver.register("cached")
+class CachedDriver(Driver):
+    """Driver that caches the labels of each frame on disk.
+
+    A frame is identified by the hash of its atoms, coordinates and cell,
+    which are rounded to `decimals` decimals, together with the fingerprint
+    of the wrapped driver. Only the frames missing in the cache are labeled
+    by the wrapped driver, in a single batch. If the wrapped driver drops
+    some frames, e.g. not converged ones, the missing frames are labeled
+    again one by one, and only the labeled frames are cached and returned.
+
+    Parameters
+    ----------
+    driver : dict or Driver
+        the wrapped driver. For a dict, it should contain `type` as the name
+        of the driver, and others are arguments of the driver.
+    cache_dir : str
+        directory of the cache
+    fingerprint : str, optional
+        identifies the driver and its settings. By default, it is made by
+        :func:`driver_fingerprint`. It must be given if the driver has
+        settings that cannot be represented in this way, e.g. a loaded model.
+    decimals : int, default=6
+        number of decimals to round the coordinates and the cell
+    max_size : int, optional
+        maximum size of the cache in bytes. The least recently used frames
+        are evicted when the cache is larger.
+
+    Raises
+    ------
+    TypeError
+        The value of `driver` is not a dict or `Driver`.
+    ValueError
+        `fingerprint` is not given, and the driver cannot be fingerprinted.
+
+    Examples
+    --------
+    >>> driver = CachedDriver({"type": "sqm", "qm_theory": "DFTB3"}, "sqm_cache")
+    >>> labeled_system = system.predict(driver=driver)
+    """
+
+    def __init__(
+        self,
+        driver: dict | Driver,
+        cache_dir: str,
+        fingerprint: str | None = None,
+        decimals: int = 6,
+        max_size: int | None = None,
+    ) -> None:
+        if isinstance(driver, Driver):
+            self.driver = driver
+        elif isinstance(driver, dict):
+            driver = driver.copy()
+            driver_type = driver.pop("type")
+            self.driver = Driver.get_driver(driver_type)(**driver)
+        else:
+            raise TypeError("driver should be Driver or dict")
+        if fingerprint is None:
+            fingerprint = driver_fingerprint(self.driver)
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        self.decimals = decimals
+        self.max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def frame_keys(self, data: dict) -> list[str]:
+        """Get the cache key of each frame.
+
+        Parameters
+        ----------
+        data : dict
+            data with coordinates and atom types
+
+        Returns
+        -------
+        list[str]
+            the key of each frame
+        """
+        symbols = np.array(data["atom_names"])[data["atom_types"]]
+        prefix = hashlib.sha256()
+        prefix.update(self.fingerprint.encode())
+        prefix.update(" ".join(symbols).encode())
+        prefix.update(b"nopbc" if data.get("nopbc", False) else b"pbc")
+        # adding zero turns -0.0 into 0.0
+        coords = np.round(data["coords"], self.decimals) + 0.0
+        cells = np.round(data["cells"], self.decimals) + 0.0
+        keys = []
+        for cc, bb in zip(coords, cells):
+            hh = prefix.copy()
+            hh.update(np.ascontiguousarray(cc, dtype=np.float64).tobytes())
+            hh.update(np.ascontiguousarray(bb, dtype=np.float64).tobytes())
+            keys.append(hh.hexdigest())
+        return keys
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".npz")
+
+    def _load(self, key: str) -> dict | None:
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "rb") as f, np.load(f) as ff:
+                frame = {kk: ff[kk] for kk in ff.files}
+        except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile):
+            # a corrupt file, e.g. truncated, is removed and labeled again
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+        # mark as recently used
+        os.utime(path)
+        return frame
+
+    def _save(self, key: str, frame: dict) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first, so that readers never see a partial file
+        tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **frame)
+        os.replace(tmp_path, path)
+
+    def _evict(self) -> None:
+        """Remove the least recently used frames until the cache fits `max_size`."""
+        entries = []
+        total = 0
+        for sub_dir in os.scandir(self.cache_dir):
+            if not sub_dir.is_dir():
+                continue
+            for entry in os.scandir(sub_dir.path):
+                if entry.name.endswith(".npz") and ".tmp." not in entry.name:
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def label(self, data: dict) -> dict:
+        """Label a system data, using the cached labels of the frames.
+
+        Parameters
+        ----------
+        data : dict
+            data with coordinates and atom types
+
+        Returns
+        -------
+        dict
+            labeled data with energies and forces
+        """
+        from dpdata.data_type import Axis
+        from dpdata.system import LabeledSystem
+        from dpdata.utils import sub_frames
+
+        keys = self.frame_keys(data)
+        frames = [self._load(key) for key in keys]
+        miss_idx = [ii for ii, ff in enumerate(frames) if ff is None]
+        if miss_idx:
+            lb_data = self.driver.label(sub_frames(data, miss_idx))
+            if len(lb_data["coords"]) == len(miss_idx):
+                results = [(miss_idx, lb_data)]
+            elif len(miss_idx) == 1:
+                results = []
+            else:
+                # some frames are dropped by the driver, e.g. not converged,
+                # so it is not known which labels belong to which frames
+                results = []
+                for ii in miss_idx:
+                    lb_frame = self.driver.label(sub_frames(data, [ii]))
+                    if len(lb_frame["coords"]) == 1:
+                        results.append(([ii], lb_frame))
+            for idx, lb_data in results:
+                frame_dtypes = [
+                    tt
+                    for tt in LabeledSystem.DTYPES
+                    if tt.name in lb_data
+                    and tt.name not in ("coords", "cells")
+                    and tt.shape is not None
+                    and Axis.NFRAMES in tt.shape
+                ]
+                for jj, ii in enumerate(idx):
+                    frame = {
+                        tt.name: np.take(
+                            lb_data[tt.name], jj, axis=tt.shape.index(Axis.NFRAMES)
+                        )
+                        for tt in frame_dtypes
+                    }
+                    self._save(keys[ii], frame)
+                    frames[ii] = frame
+            if self.max_size is not None:
+                self._evict()
+        # the frames that the driver fails to label are dropped
+        kept_idx = [ii for ii, ff in enumerate(frames) if ff is not None]
+        frames = [frames[ii] for ii in kept_idx]
+        if len(kept_idx) == len(keys):
+            labeled_data = data.copy()
+        else:
+            labeled_data = sub_frames(data, kept_idx)
+        if not frames:
+            # all frames are dropped
+            natoms = len(data["atom_types"])
+            labeled_data["energies"] = np.zeros((0,))
+            labeled_data["forces"] = np.zeros((0, natoms, 3))
+            return labeled_data
+        dtypes = {tt.name: tt for tt in LabeledSystem.DTYPES}
+        for name in frames[0]:
+            tt = dtypes[name]
+            labeled_data[name] = np.stack(
+                [ff[name] for ff in frames], axis=tt.shape.index(Axis.NFRAMES)
+            )
+        return labeled_data
+
+
+# the settings of drivers that do not change the labels
+_CONCURRENCY_SETTINGS = frozenset(
+    ("max_workers", "nprocs", "max_jobs", "parallel", "executor")
+)
+
+
+def driver_fingerprint(driver: Driver) -> str:
+    """Make the fingerprint of a driver from its class and settings.
+
+    If the driver has a `fingerprint` attribute, e.g. the hash of its model
+    file, it is used. Otherwise, the public attributes of the driver, which
+    should be serializable to JSON, are used, except the settings of
+    concurrency such as `max_workers` and `nprocs`, which do not change
+    the labels.
+
+    Parameters
+    ----------
+    driver : Driver
+        the driver
+
+    Returns
+    -------
+    str
+        the fingerprint
+
+    Raises
+    ------
+    ValueError
+        if an attribute of the driver cannot be serialized to JSON
+    """
+    settings = getattr(driver, "fingerprint", None)
+    if settings is None:
+        settings = {
+            kk: vv
+            for kk, vv in vars(driver).items()
+            if not kk.startswith("_") and kk not in _CONCURRENCY_SETTINGS
+        }
+    try:
+        return json.dumps(
+            [type(driver).__module__, type(driver).__qualname__, settings],
+            sort_keys=True,
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(
+            f"cannot make the fingerprint of {type(driver).__name__}; "
+            "fingerprint should be given"
+        ) from e
+
+
+class AsyncDriver(Driver):
+    """The base class for a driver labeling the data by a coroutine.
+
+    Many frames can be labeled concurrently in a single process, which
+    suits drivers waiting for external programs. :meth:`label` runs
+    :meth:`alabel` in a new event loop, so it cannot be called from a
+    running event loop; use :meth:`dpdata.System.apredict` instead.
+    """
+
+    @abstractmethod
+    async def alabel(self, data: dict) -> dict:
+        """Label a system data asynchronously.
+
+        Parameters
+        ----------
+        data : dict
+            data with coordinates and atom types
+
+        Returns
+        -------
+        dict
+            labeled data with energies and forces
+        """
+        return NotImplemented
+
+    def label(self, data: dict) -> dict:
+        """Label a system data. Returns new data with energy, forces, and virials.
+
+        Parameters
+        ----------
+        data : dict
+            data with coordinates and atom types
+
+        Returns
+        -------
+        dict
+            labeled data with energies and forces
+        """
+        return asyncio.run(self.alabel(data))
+
+
+@Driver.register("async")
+class AsyncSubprocessDriver(AsyncDriver):
+    """Run the external program of a driver by asyncio subprocesses.
+
+    The wrapped driver should run each frame by an external program and
+    implement `prepare_frame(ss, work_dir)`, which writes the input files of
+    a frame and returns the command, and `read_frame(work_dir, returncode)`,
+    which reads the labeled frame. The `gaussian` and `sqm` drivers
+    implement them.
+
+    Parameters
+    ----------
+    driver : Driver or dict
+        the wrapped driver, or a dict with `type` as the name of the driver
+        and others as arguments of the driver
+    max_jobs : int, default=16
+        maximum number of programs running concurrently. The limit is shared
+        by all the labeling calls in the same event loop
+
+    Raises
+    ------
+    TypeError
+        The wrapped driver does not implement `prepare_frame` and
+        `read_frame`.
+
+    Examples
+    --------
+    Keep 200 Gaussian jobs running at the same time:
+
+    >>> driver = AsyncSubprocessDriver(
+    ...     {"type": "gaussian", "keywords": "force B3LYP/6-31G*"}, max_jobs=200
+    ... )
+    >>> labeled_system = asyncio.run(system.apredict(driver=driver))
+    """
+
+    def __init__(self, driver: dict | Driver, max_jobs: int = 16) -> None:
+        if isinstance(driver, dict):
+            driver = driver.copy()
+            driver = Driver.get_driver(driver.pop("type"))(**driver)
+        if not (hasattr(driver, "prepare_frame") and hasattr(driver, "read_frame")):
+            raise TypeError(
+                "driver should implement prepare_frame and read_frame to run asynchronously"
+            )
+        self.driver = driver
+        self.max_jobs = max_jobs
+        self._semaphore = None
+        self._loop = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint of the wrapped driver. See :func:`driver_fingerprint`."""
+        return driver_fingerprint(self.driver)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # a semaphore can only be used in one event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_jobs)
+            self._loop = loop
+        return self._semaphore
+
+    async def _alabel_frame(self, ss, work_dir: str):
+        async with self._get_semaphore():
+            cmd = self.driver.prepare_frame(ss, work_dir)
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.DEVNULL
+            )
+            returncode = await proc.wait()
+        return self.driver.read_frame(work_dir, returncode)
+
+    async def alabel(self, data: dict) -> dict:
+        """Label a system data asynchronously.
+
+        Each frame is run in its own directory, and the results keep the
+        order of the frames.
+
+        Parameters
+        ----------
+        data : dict
+            data with coordinates and atom types
+
+        Returns
+        -------
+        dict
+            labeled data with energies and forces
+        """
+        import dpdata
+        from dpdata.utils import concat_systems
+
+        ori_system = dpdata.System(data=data)
+        with tempfile.TemporaryDirectory() as d:
+            # wait for all the programs before the directory is removed
+            systems = await asyncio.gather(
+                *[
+                    self._alabel_frame(ss, os.path.join(d, str(ii)))
+                    for ii, ss in enumerate(ori_system)
+                ],
+                return_exceptions=True,
+            )
+        for ss in systems:
+            if isinstance(ss, BaseException):
+                raise ss
+        return concat_systems(systems, cls=dpdata.LabeledSystem).data
+
+
 class Minimizer(ABC):
     """The base class for a minimizer plugin. A minimizer can
     minimize geometry.
@@ -1,17 +1,9 @@
 from __future__ import annotations
 
-import re
 import warnings
 
 import numpy as np
 
-latt_patt = r"\|\s+([0-9]{1,}[.][0-9]*)\s+([0-9]{1,}[.][0-9]*)\s+([0-9]{1,}[.][0-9]*)"
-pos_patt_first = r"\|\s+[0-9]{1,}[:]\s\w+\s(\w+)(\s.*[-]?[0-9]{1,}[.][0-9]*)(\s+[-]?[0-9]{1,}[.][0-9]*)(\s+[-]?[0-9]{1,}[.][0-9]*)"
-pos_patt_other = r"\s+[a][t][o][m]\s+([-]?[0-9]{1,}[.][0-9]*)\s+([-]?[0-9]{1,}[.][0-9]*)\s+([-]?[0-9]{1,}[.][0-9]*)\s+(\w{1,2})"
-force_patt = r"\|\s+[0-9]{1,}\s+([-]?[0-9]{1,}[.][0-9]*[E][+-][0-9]{1,})\s+([-]?[0-9]{1,}[.][0-9]*[E][+-][0-9]{1,})\s+([-]?[0-9]{1,}[.][0-9]*[E][+-][0-9]{1,})"
-eng_patt = r"Total energy uncorrected.*([-]?[0-9]{1,}[.][0-9]*[E][+-][0-9]{1,})\s+eV"
-# atom_numb_patt=r"Number of atoms.*([0-9]{1,})"
-
 debug = False
 
 
@@ -22,12 +14,7 @@ def get_info(lines, type_idx_zero=False):
     atom_numbs = None
     _atom_names = []
 
-    contents = "\n".join(lines)
     # cell
-    # _tmp=re.findall(latt_patt,contents)
-    # for ii in _tmp:
-    #    vect=[float(kk) for kk in ii]
-    #    cell.append(vect)
     # ------------------
     for ln, l in enumerate(lines):
         if l.startswith("  | Unit cell"):
@@ -38,9 +25,10 @@ def get_info(lines, type_idx_zero=False):
         vect = [float(kk) for kk in v_str]
         cell.append(vect)
 
-    _tmp = re.findall(pos_patt_first, contents)
-    for ii in _tmp:
-        _atom_names.append(ii[0])
+    for l in lines:
+        words = _split_species_line(l)
+        if words is not None:
+            _atom_names.append(words[3])
     atom_names = []
     for ii in _atom_names:
         if ii not in atom_names:
@@ -57,6 +45,38 @@ def get_info(lines, type_idx_zero=False):
     return [cell, atom_numbs, atom_names, atom_types]
 
 
+def _split_species_line(line):
+    """Split a line of the input geometry table, e.g. ``|    1: Species B  0.0  0.0  0.0``.
+
+    Returns
+    -------
+    list of str or None
+        the words of the line, or None if the line is not in the table
+    """
+    if not line.startswith("  |"):
+        return None
+    words = line.split()
+    if len(words) == 7 and words[2] == "Species" and words[1][:-1].isdigit():
+        return words
+    return None
+
+
+def skip_fhi_aims_block(fp):
+    """Skip a block without storing its lines.
+
+    Returns
+    -------
+    bool
+        whether a (possibly incomplete) block is skipped
+    """
+    found = False
+    for ii in fp:
+        found = True
+        if "Begin self-consistency loop: Re-initialization" in ii:
+            break
+    return found
+
+
 def get_fhi_aims_block(fp):
     blk = []
     for ii in fp:
@@ -102,7 +122,7 @@ def get_frames(fname, md=True, begin=0, step=1, convergence_check=True):
             if is_converge or not convergence_check:
                 all_coords.append(coord)
 
-                if _cell:
+                if len(_cell) > 0:
                     all_cells.append(_cell)
                 else:
                     all_cells.append(cell)
@@ -114,8 +134,13 @@ def get_frames(fname, md=True, begin=0, step=1, convergence_check=True):
             if not is_converge:
                 rec_failed.append(cc + 1)
 
-        blk = get_fhi_aims_block(fp)
         cc += 1
+        # skip the frames that are not requested without parsing them
+        while cc < begin or (cc - begin) % step != 0:
+            if not skip_fhi_aims_block(fp):
+                break
+            cc += 1
+        blk = get_fhi_aims_block(fp)
 
     if len(rec_failed) > 0:
         prt = (
@@ -150,43 +175,53 @@ def analyze_block(lines, first_blk=False, md=True):
     energy = None
     force = []
     virial = None
-    atom_names = []
-    _atom_names = []
-
-    contents = "\n".join(lines)
-    try:
-        natom = int(re.findall("Number of atoms.*([0-9]{1,})", lines)[0])
-    except Exception:
-        natom = 0
+    is_converge = False
+
+    # collect the numeric fields of each quantity by anchored prefix checks,
+    # and convert them to floats at once in the end
+    species_coord = []
+    atom_coord = []
+    in_force = False
+    for l in lines:
+        sl = l.lstrip()
+        if in_force:
+            # |   1    -0.167475636711612E+03   -0.167475668675202E+03   -0.167475668675069E+03
+            words = sl.split()
+            if len(words) == 5 and words[0] == "|" and words[1].isdigit():
+                force.append(words[2:5])
+                continue
+            in_force = False
+        if sl.startswith("atom "):
+            # atom   3.58320000   3.58320000   3.58320000  B
+            words = sl.split()
+            if len(words) == 5:
+                atom_coord.append(words[1:4])
+        elif sl.startswith("lattice_vector ") and not first_blk:
+            cell.append(sl.split()[1:4])
+        elif sl.startswith("Total atomic forces"):
+            in_force = True
+        elif sl.startswith("| Total energy uncorrected"):
+            if energy is None:
+                energy = float(sl.split()[-2])
+        elif sl.startswith("Self-consistency cycle converged"):
+            is_converge = True
+        elif first_blk and not md:
+            words = _split_species_line(l)
+            if words is not None:
+                species_coord.append(words[4:7])
 
     if first_blk:
         if md:
-            _tmp = re.findall(pos_patt_other, contents)[:]
-            for ii in _tmp[slice(int(len(_tmp) / 2), len(_tmp))]:
-                coord.append([float(kk) for kk in ii[:-1]])
+            # the first half are the atoms repeated from geometry.in
+            coord = atom_coord[len(atom_coord) // 2 :]
         else:
-            _tmp = re.findall(pos_patt_first, contents)
-            for ii in _tmp:
-                coord.append([float(kk) for kk in ii[1:]])
+            coord = species_coord
     else:
-        _tmp = re.findall(pos_patt_other, contents)
-        for ii in _tmp:
-            coord.append([float(kk) for kk in ii[:-1]])
-
-    _tmp = re.findall(force_patt, contents)
-    for ii in _tmp:
-        force.append([float(kk) for kk in ii])
-
-    if "Self-consistency cycle converged" in contents:
-        is_converge = True
-    else:
-        is_converge = False
-
-    try:
-        _eng_patt = re.compile(eng_patt)
-        energy = float(_eng_patt.search(contents).group().split()[-2])
-    except Exception:
-        energy = None
+        coord = atom_coord
+    coord = np.array(coord, dtype=float).reshape(-1, 3)
+    force = np.array(force, dtype=float).reshape(-1, 3)
+    if len(cell) > 0:
+        cell = np.array(cell, dtype=float)
 
     if not energy:
         is_converge = False
@@ -101,7 +101,7 @@ def detect_multiplicity(symbols: np.ndarray) -> int:
     return n_total % 2 + 1
 
 
-def make_gaussian_input(
+def _make_gaussian_template(
     sys_data: dict,
     keywords: str | list[str],
     multiplicity: str | int = "auto",
@@ -111,43 +111,12 @@ def make_gaussian_input(
     keywords_high_multiplicity: str | None = None,
     nproc: int = 1,
 ) -> str:
-    """Make gaussian input file.
+    """Make the template of the gaussian input file.
 
-    Parameters
-    ----------
-    sys_data : dict
-        system data
-    keywords : str or list[str]
-        Gaussian keywords, e.g. force b3lyp/6-31g**. If a list,
-        run multiple steps
-    multiplicity : str or int, default=auto
-        spin multiplicity state. It can be a number. If auto,
-        multiplicity will be detected automatically, with the
-        following rules:
-            fragment_guesses=True
-                multiplicity will +1 for each radical, and +2
-                for each oxygen molecule
-            fragment_guesses=False
-                multiplicity will be 1 or 2, but +2 for each
-                oxygen molecule
-    charge : int, default=0
-        molecule charge. Only used when charge is not provided
-        by the system
-    fragment_guesses : bool, default=False
-        initial guess generated from fragment guesses. If True,
-        multiplicity should be auto
-    basis_set : str, default=None
-        custom basis set
-    keywords_high_multiplicity : str, default=None
-        keywords for points with multiple raicals. multiplicity
-        should be auto. If not set, fallback to normal keywords
-    nproc : int, default=1
-        Number of CPUs to use
-
-    Returns
-    -------
-    str
-        gjf output string
+    The coordinates and the cell vectors are ``%f`` placeholders, which are
+    filled with :func:`_frame_values`. The coordinates of the first frame are
+    only used to detect the fragments. See :func:`make_gaussian_input` for
+    the parameters.
     """
     coordinates = sys_data["coords"][0]
     atom_names = sys_data["atom_names"]
@@ -236,24 +205,25 @@ def make_gaussian_input(
         (chargekeywords_frag if use_fragment_guesses else chargekeywords),
     ]
 
-    for ii, (symbol, coordinate) in enumerate(zip(symbols, coordinates)):
+    # escape the literal lines, as the coordinates are filled by the % operator
+    buff = [line.replace("%", "%%") for line in buff]
+    for ii, symbol in enumerate(symbols):
+        symbol = symbol.replace("%", "%%")
         if use_fragment_guesses:
-            buff.append(
-                "%s(Fragment=%d) %f %f %f" % (symbol, frag_index[ii] + 1, *coordinate)  # noqa: UP031
-            )
+            buff.append(f"{symbol}(Fragment={frag_index[ii] + 1:d}) %f %f %f")
         else:
-            buff.append("{} {:f} {:f} {:f}".format(symbol, *coordinate))  # noqa: UP031
+            buff.append(f"{symbol} %f %f %f")
     if not sys_data.get("nopbc", False):
         # PBC condition
-        cell = sys_data["cells"][0]
         for ii in range(3):
             # use TV as atomic symbol, see https://gaussian.com/pbc/
-            buff.append("TV {:f} {:f} {:f}".format(*cell[ii]))
+            buff.append("TV %f %f %f")
+    tail = []
     if basis_set is not None:
         # custom basis set
-        buff.extend(["", basis_set, ""])
+        tail.extend(["", basis_set, ""])
     for kw in itertools.islice(keywords, 1, None):
-        buff.extend(
+        tail.extend(
             [
                 "\n--link1--",
                 *chkkeywords,
@@ -266,10 +236,125 @@ def make_gaussian_input(
                 "",
             ]
         )
-    buff.append("\n")
+    tail.append("\n")
+    buff.extend(line.replace("%", "%%") for line in tail)
     return "\n".join(buff)
 
 
+def make_gaussian_input(
+    sys_data: dict,
+    keywords: str | list[str],
+    multiplicity: str | int = "auto",
+    charge: int = 0,
+    fragment_guesses: bool = False,
+    basis_set: str | None = None,
+    keywords_high_multiplicity: str | None = None,
+    nproc: int = 1,
+) -> str:
+    """Make gaussian input file.
+
+    Parameters
+    ----------
+    sys_data : dict
+        system data
+    keywords : str or list[str]
+        Gaussian keywords, e.g. force b3lyp/6-31g**. If a list,
+        run multiple steps
+    multiplicity : str or int, default=auto
+        spin multiplicity state. It can be a number. If auto,
+        multiplicity will be detected automatically, with the
+        following rules:
+            fragment_guesses=True
+                multiplicity will +1 for each radical, and +2
+                for each oxygen molecule
+            fragment_guesses=False
+                multiplicity will be 1 or 2, but +2 for each
+                oxygen molecule
+    charge : int, default=0
+        molecule charge. Only used when charge is not provided
+        by the system
+    fragment_guesses : bool, default=False
+        initial guess generated from fragment guesses. If True,
+        multiplicity should be auto
+    basis_set : str, default=None
+        custom basis set
+    keywords_high_multiplicity : str, default=None
+        keywords for points with multiple raicals. multiplicity
+        should be auto. If not set, fallback to normal keywords
+    nproc : int, default=1
+        Number of CPUs to use
+
+    Returns
+    -------
+    str
+        gjf output string
+    """
+    template = _make_gaussian_template(
+        sys_data,
+        keywords,
+        multiplicity=multiplicity,
+        charge=charge,
+        fragment_guesses=fragment_guesses,
+        basis_set=basis_set,
+        keywords_high_multiplicity=keywords_high_multiplicity,
+        nproc=nproc,
+    )
+    return template % _frame_values(sys_data, 0)
+
+
+def _frame_values(sys_data: dict, frame_idx: int) -> tuple:
+    """Get the values to fill the template of a frame."""
+    values = sys_data["coords"][frame_idx].ravel()
+    if not sys_data.get("nopbc", False):
+        values = np.concatenate((values, sys_data["cells"][frame_idx].ravel()))
+    return tuple(values)
+
+
+def make_gaussian_inputs(
+    sys_data: dict,
+    keywords: str | list[str],
+    multiplicity: str | int = "auto",
+    charge: int = 0,
+    fragment_guesses: bool = False,
+    basis_set: str | None = None,
+    keywords_high_multiplicity: str | None = None,
+    nproc: int = 1,
+) -> list[str]:
+    """Make gaussian input files of all frames.
+
+    The template of the input file is made once and shared by all frames,
+    unless it depends on the frame, i.e. the multiplicity is detected from
+    the fragments of each frame, or a unique checkpoint file is used by
+    multiple steps. See :func:`make_gaussian_input` for the parameters.
+
+    Returns
+    -------
+    list[str]
+        gjf output string of each frame
+    """
+    shared = (
+        multiplicity != "auto"
+        and not fragment_guesses
+        and (isinstance(keywords, str) or len(keywords) == 1)
+    )
+    texts = []
+    template = None
+    for ii in range(len(sys_data["coords"])):
+        if template is None or not shared:
+            template = _make_gaussian_template(
+                {**sys_data, "coords": sys_data["coords"][ii : ii + 1]},
+                keywords,
+                multiplicity=multiplicity,
+                charge=charge,
+                fragment_guesses=fragment_guesses,
+                basis_set=basis_set,
+                keywords_high_multiplicity=keywords_high_multiplicity,
+                nproc=nproc,
+            )
+        texts.append(template % _frame_values(sys_data, ii))
+    return texts
+
+
 def read_gaussian_input(inp: str):
     """Read Gaussian input.
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -19,6 +20,129 @@ force_convert = ForceConversion("hartree/bohr", "eV/angstrom").value()
 symbols = ["X"] + ELEMENTS
 
 
+# the headers of the sections, which are searched in the raw bytes
+SCF_PATTERN = rb"^ SCF Done[^\n]*"
+FORCE_PATTERN = rb"^ Center     Atomic                   Forces \(Hartrees/Bohr\)"
+ORIENTATION_PATTERN = (
+    rb"^                          Input orientation:"
+    rb"|^                         Z-Matrix orientation:"
+)
+section_pattern = re.compile(
+    b"(?P<scf>" + SCF_PATTERN + b")"
+    b"|(?P<force>" + FORCE_PATTERN + b")"
+    b"|(?P<orientation>" + ORIENTATION_PATTERN + b")",
+    re.M,
+)
+# number of lines between the header and the table
+ORIENTATION_SKIP = 4
+FORCE_SKIP = 2
+TABLE_END = b"\n -------"
+
+
+def _find_table(content, pos, nskip):
+    """Find the rows of a table whose header ends at `pos`.
+
+    Parameters
+    ----------
+    content : bytes
+        content of the log file
+    pos : int
+        position in the header line
+    nskip : int
+        number of lines between the header and the rows
+
+    Returns
+    -------
+    bytes or None
+        the rows of the table, or None if the table is incomplete
+    """
+    for _ in range(nskip + 1):
+        pos = content.find(b"\n", pos) + 1
+        if pos == 0:
+            return None
+    end = content.find(TABLE_END, pos - 1)
+    if end < 0:
+        return None
+    return content[pos:end]
+
+
+def _parse_orientation(rows):
+    """Parse the rows of the orientation table.
+
+    Returns
+    -------
+    atomic_numbers : np.ndarray
+        atomic numbers of the atoms
+    coords : np.ndarray
+        coordinates of the atoms
+    cells : np.ndarray
+        the translation vectors of PBC, see https://gaussian.com/pbc/
+    """
+    table = np.array(rows.split()).reshape(-1, 6)
+    numbers = table[:, 1].astype(int)
+    xyz = table[:, 3:6].astype(float)
+    is_cell = numbers == -2
+    return numbers[~is_cell], xyz[~is_cell], xyz[is_cell]
+
+
+def _parse_forces(rows):
+    """Parse the rows of the force table by their fixed-width columns.
+
+    The columns may not be separated by spaces when the forces are large.
+    """
+    lines = rows.split(b"\n")
+    chars = np.array(lines, dtype="S68").view("S1").reshape(len(lines), 68)
+    # the rows of PBC translation vectors are skipped
+    is_cell = np.ascontiguousarray(chars[:, 14:16]).view("S2").ravel() == b"-2"
+    forces = np.ascontiguousarray(chars[:, 23:68]).view("S15").astype(float)
+    return forces[~is_cell]
+
+
+def read_frames(content):
+    """Read the frames of a Gaussian log file.
+
+    The sections are located by searching their headers in the raw bytes,
+    and each table is parsed in bulk.
+
+    Parameters
+    ----------
+    content : bytes
+        content of the log file
+
+    Returns
+    -------
+    list[tuple]
+        the atomic numbers, coordinates, cells, energy, and forces of each frame
+
+    Raises
+    ------
+    RuntimeError
+        if the input orientation is not found
+    """
+    frames = []
+    energy = None
+    orientation = None
+    for match in section_pattern.finditer(content):
+        if match.lastgroup == "scf":
+            energy = float(match.group().split()[4])
+        elif match.lastgroup == "orientation":
+            rows = _find_table(content, match.end(), ORIENTATION_SKIP)
+            orientation = _parse_orientation(rows) if rows is not None else None
+        else:
+            rows = _find_table(content, match.end(), FORCE_SKIP)
+            if rows is None:
+                continue
+            if orientation is None:
+                raise RuntimeError(
+                    "Input orientation is not found. Using Gaussian keyword "
+                    "`Geom=PrintInputOrient` to always print the input orientation. "
+                    "See https://gaussian.com/geom/ for more details."
+                )
+            frames.append((*orientation, energy, _parse_forces(rows)))
+            orientation = None
+    return frames
+
+
 def to_system_data(file_name: FileType, md=False):
     """Read Gaussian log file.
 
@@ -39,98 +163,72 @@ def to_system_data(file_name: FileType, md=False):
     RuntimeError
         if the input orientation is not found
     """
-    data = {}
-    # read from log lines
-    flag = 0
-    energy_t = []
-    coords_t = []
-    atom_symbols = []
-    forces_t = []
-    cells_t = []
-    nopbc = True
-    coords = None
-
-    with open_file(file_name) as fp:
-        for line in fp:
-            if line.startswith(" SCF Done"):
-                # energies
-                energy = float(line.split()[4])
-            elif line.startswith(
-                " Center     Atomic                   Forces (Hartrees/Bohr)"
-            ):
-                flag = 1
-                forces = []
-            elif line.startswith(
-                "                          Input orientation:"
-            ) or line.startswith("                         Z-Matrix orientation:"):
-                flag = 5
-                coords = []
-                atom_symbols = []
-                cells = []
-
-            if 1 <= flag <= 3 or 5 <= flag <= 9:
-                flag += 1
-            elif flag == 4:
-                # forces
-                if line.startswith(" -------"):
-                    if coords is None:
-                        raise RuntimeError(
-                            "Input orientation is not found. Using Gaussian keyword "
-                            "`Geom=PrintInputOrient` to always print the input orientation. "
-                            "See https://gaussian.com/geom/ for more details."
-                        )
-                    forces_t.append(forces)
-                    energy_t.append(energy)
-                    coords_t.append(coords)
-                    if cells:
-                        nopbc = False
-                        cells_t.append(cells)
-                    else:
-                        cells_t.append(
-                            [[100.0, 0.0, 0.0], [0.0, 100.0, 0.0], [0.0, 0.0, 100.0]]
-                        )
-                    flag = 0
-                    coords = None
-                else:
-                    s = line.split()
-                    if line[14:16] == "-2":
-                        # PBC
-                        pass
-                    else:
-                        forces.append(
-                            [float(line[23:38]), float(line[38:53]), float(line[53:68])]
-                        )
-            elif flag == 10:
-                # atom_symbols and coords
-                if line.startswith(" -------"):
-                    flag = 0
-                else:
-                    s = line.split()
-                    if int(s[1]) == -2:
-                        # PBC cells, see https://gaussian.com/pbc/
-                        cells.append([float(x) for x in s[3:6]])
-                    else:
-                        coords.append([float(x) for x in s[3:6]])
-                        atom_symbols.append(symbols[int(s[1])])
-
-    assert coords_t, "cannot find coords"
-    assert energy_t, "cannot find energies"
-    assert forces_t, "cannot find forces"
+    with open_file(file_name, "rb") as fp:
+        content = fp.read()
+    if isinstance(content, str):
+        content = content.encode()
+    frames = read_frames(content)
+
+    assert frames, "cannot find coords"
+    assert all(ff[3] is not None for ff in frames), "cannot find energies"
+
+    nopbc = not any(len(ff[2]) for ff in frames)
+    if not md:
+        frames = frames[-1:]
+    numbers, _, _, _, _ = frames[-1]
+    atom_symbols = np.array(symbols)[numbers]
 
+    data = {}
     atom_names, data["atom_types"], atom_numbs = np.unique(
         atom_symbols, return_inverse=True, return_counts=True
     )
     data["atom_names"] = list(atom_names)
     data["atom_numbs"] = list(atom_numbs)
-    if not md:
-        forces_t = forces_t[-1:]
-        energy_t = energy_t[-1:]
-        coords_t = coords_t[-1:]
-        cells_t = cells_t[-1:]
-    data["forces"] = np.array(forces_t) * force_convert
-    data["energies"] = np.array(energy_t) * energy_convert
-    data["coords"] = np.array(coords_t)
+    data["forces"] = np.array([ff[4] for ff in frames]) * force_convert
+    data["energies"] = np.array([ff[3] for ff in frames]) * energy_convert
+    data["coords"] = np.array([ff[1] for ff in frames])
     data["orig"] = np.array([0, 0, 0])
-    data["cells"] = np.array(cells_t)
+    data["cells"] = np.array(
+        [ff[2] if len(ff[2]) else np.eye(3) * 100.0 for ff in frames]
+    )
     data["nopbc"] = nopbc
     return data
+
+
+def _read_log(file_name, md):
+    try:
+        return to_system_data(file_name, md=md)
+    except AssertionError:
+        return None
+
+
+def read_logs(file_names, md=False, nprocs=None):
+    """Read many Gaussian log files, optionally in parallel.
+
+    Parameters
+    ----------
+    file_names : list[str]
+        file names
+    md : bool, default False
+        whether to read multiple frames
+    nprocs : int, optional
+        number of processes to read the files
+
+    Returns
+    -------
+    list[dict or None]
+        system data of each file, or None if no frame is found
+    """
+    if nprocs is None or nprocs <= 1 or len(file_names) <= 1:
+        return [_read_log(ff, md) for ff in file_names]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=nprocs) as executor:
+        # several chunks per process to balance the load
+        chunksize = max(1, len(file_names) // (nprocs * 4))
+        return list(
+            executor.map(
+                _read_log, file_names, [md] * len(file_names), chunksize=chunksize
+            )
+        )
@@ -25,16 +25,6 @@ def _format_atom_name(atom_name):
     return fmt_name
 
 
-def _get_line(line, fmt_atom_name=True):
-    atom_name = line[10:15].split()[0]
-    if fmt_atom_name:
-        atom_name = _format_atom_name(atom_name)
-    atom_idx = int(line[15:20].split()[0])
-    posis = [float(line[ii : ii + 8]) for ii in range(20, 44, 8)]
-    posis = np.array(posis) * nm2ang
-    return atom_name, atom_idx, posis
-
-
 def _get_cell(line):
     cell = np.zeros([3, 3])
     lengths = [float(ii) for ii in line.split()]
@@ -54,6 +44,36 @@ def _get_cell(line):
     return cell
 
 
+def _get_atoms(lines, fmt_atom_name=True):
+    """Parse the atom lines of a frame by their fixed-width columns.
+
+    Parameters
+    ----------
+    lines : list[str]
+        the atom lines
+    fmt_atom_name : bool
+        whether to format the atom names
+
+    Returns
+    -------
+    names : np.ndarray
+        atom name of each atom
+    posis : np.ndarray
+        positions of the atoms in Angstrom
+    """
+    natoms = len(lines)
+    # the lines are truncated after the positions, i.e. the velocities are dropped
+    chars = np.array(lines, dtype="U44").view("U1").reshape(natoms, 44)
+    raw_names = np.ascontiguousarray(chars[:, 10:15]).view("U5").ravel()
+    posis = np.ascontiguousarray(chars[:, 20:44]).view("U8").astype(float) * nm2ang
+    # each distinct name is only parsed once
+    unique_names, inverse = np.unique(raw_names, return_inverse=True)
+    names = [nn.split()[0] for nn in unique_names]
+    if fmt_atom_name:
+        names = [_format_atom_name(nn) for nn in names]
+    return np.array(names)[inverse.ravel()], posis
+
+
 def file_to_system_data(fname: FileType, format_atom_name=True, **kwargs):
     system = {"coords": [], "cells": []}
     with open_file(fname) as fp:
@@ -64,27 +84,28 @@ def file_to_system_data(fname: FileType, format_atom_name=True, **kwargs):
                 break
             else:
                 frame += 1
-                names = []
-                idxs = []
-                posis = []
                 natoms = int(fp.readline())
-                for ii in range(natoms):
-                    n, i, p = _get_line(fp.readline(), fmt_atom_name=format_atom_name)
-                    names.append(n)
-                    idxs.append(i)
-                    posis.append(p)
+                lines = [fp.readline() for _ in range(natoms)]
                 cell = _get_cell(fp.readline())
-                posis = np.array(posis)
                 if frame == 1:
+                    names, posis = _get_atoms(lines, fmt_atom_name=format_atom_name)
+                    # atom names are ordered by their first appearance
+                    unique_names, first_index, atom_types, atom_numbs = np.unique(
+                        names,
+                        return_index=True,
+                        return_inverse=True,
+                        return_counts=True,
+                    )
+                    order = np.argsort(first_index)
+                    rank = np.empty_like(order)
+                    rank[order] = np.arange(len(order))
                     system["orig"] = np.zeros(3)
-                    system["atom_names"] = list(set(names))
-                    system["atom_numbs"] = [
-                        names.count(ii) for ii in system["atom_names"]
-                    ]
-                    system["atom_types"] = [
-                        system["atom_names"].index(ii) for ii in names
-                    ]
-                    system["atom_types"] = np.array(system["atom_types"], dtype=int)
+                    system["atom_names"] = unique_names[order].tolist()
+                    system["atom_numbs"] = atom_numbs[order].tolist()
+                    system["atom_types"] = rank[atom_types.ravel()].astype(int)
+                else:
+                    # the atoms are the same as the first frame
+                    _, posis = _get_atoms(lines, fmt_atom_name=False)
                 system["coords"].append(posis)
                 system["cells"].append(cell)
     system["coords"] = np.array(system["coords"])
@@ -92,21 +113,53 @@ def file_to_system_data(fname: FileType, format_atom_name=True, **kwargs):
     return system
 
 
+def _frame_template(system, resname="MOL", shift=0):
+    """Get the template of a frame, which is shared by all frames.
+
+    The atom indexes wrap around at 100000, as GROMACS does.
+    """
+    names = np.array(system["atom_names"])[system["atom_types"]]
+    atom_lines = [
+        f"{1:>5d}{resname:<5s}{name:>5s}{(i + shift + 1) % 100000:5d}".replace(
+            "%", "%%"
+        )
+        + "%8.3f%8.3f%8.3f\n"
+        for i, name in enumerate(names)
+    ]
+    cell_line = " " + " ".join(["%.3f"] * 9)
+    return f" molecule\n {len(names)}\n" + "".join(atom_lines) + cell_line
+
+
 def from_system_data(system, f_idx=0, **kwargs):
+    return from_system_frames(system, frame_idx=[f_idx], **kwargs)
+
+
+def from_system_frames(system, frame_idx=None, **kwargs):
+    """Format frames of a system in the .gro format.
+
+    Parameters
+    ----------
+    system : dict
+        system data
+    frame_idx : list[int], optional
+        indexes of the frames. All frames are formatted by default
+    **kwargs : dict
+        resname and shift of the atom indexes
+
+    Returns
+    -------
+    str
+        the frames separated by new lines
+    """
     resname = kwargs.get("resname", "MOL")
     shift = kwargs.get("shift", 0)
-    ret = ""
-    ret += " molecule" + "\n"
-    n_atoms = sum(system["atom_numbs"])
-    ret += " " + str(n_atoms) + "\n"
-    for i in range(n_atoms):
-        atom_type = system["atom_types"][i]
-        atom_name = system["atom_names"][atom_type]
-        coords = system["coords"][f_idx] * ang2nm
-        ret += "{:>5d}{:<5s}{:>5s}{:5d}{:8.3f}{:8.3f}{:8.3f}\n".format(
-            1, resname, atom_name, i + shift + 1, *tuple(coords[i])
-        )
-    cell = (system["cells"][f_idx].flatten() * ang2nm)[cell_idx_gmx2dp]
-    ret += " " + " ".join([f"{x:.3f}" for x in cell])
-
-    return ret
+    template = _frame_template(system, resname=resname, shift=shift)
+    if frame_idx is None:
+        frame_idx = np.arange(len(system["coords"]))
+    nframes = len(frame_idx)
+    coords = system["coords"][frame_idx].reshape(nframes, -1) * ang2nm
+    cells = (system["cells"][frame_idx].reshape(nframes, 9) * ang2nm)[
+        :, cell_idx_gmx2dp
+    ]
+    values = np.concatenate((coords, cells), axis=1)
+    return "\n".join(template % tuple(vv) for vv in values)
@@ -2,57 +2,201 @@ from __future__ import annotations
 
 import numpy as np
 
-from .pbc import system_pbc_shift
-
-
-def _msd(coords, cells, pbc_shift, begin):
-    nframes = cells.shape[0]
-    natoms = coords.shape[1]
-    ff = begin
-    prev_coord = coords[ff] + np.matmul(pbc_shift[ff], cells[ff])
-    msds = [0.0]
-    for ff in range(begin + 1, nframes):
-        curr_coord = coords[ff] + np.matmul(pbc_shift[ff], cells[ff])
-        diff_coord = curr_coord - prev_coord
-        msds.append(np.sum(diff_coord * diff_coord) / natoms)
-    return np.array(msds)
-
-
-def _msd_win(coords, cells, pbc_shift, begin, window):
-    nframes = cells.shape[0]
-    natoms = coords.shape[1]
-    ncoords = np.zeros(coords.shape)
-    msd = np.zeros([window])
-    for ff in range(nframes):
-        ncoords[ff] = coords[ff] + np.matmul(pbc_shift[ff], cells[ff])
-    cc = 0
-    for ii in range(begin, nframes - window + 1):
-        start = np.tile(ncoords[ii], (window, 1, 1))
-        diff_coord = ncoords[ii : ii + window] - start
-        diff_coord = np.reshape(diff_coord, [-1, natoms * 3])
-        msd += np.sum(diff_coord * diff_coord, axis=1) / natoms
-        cc += 1
-    return np.array(msd) / cc
-
-
-def msd(system, sel=None, begin=0, window=0):
+from .pbc import unwrap_coords
+
+
+def _fft_correlation(aa, bb, nlags):
+    """Compute sum_k aa[k] . bb[k + m] of each atom for the lags m < nlags.
+
+    Parameters
+    ----------
+    aa : np.ndarray
+        coordinates in shape (na, natoms, 3)
+    bb : np.ndarray
+        coordinates in shape (nb, natoms, 3), where nb >= na + nlags - 1
+
+    Returns
+    -------
+    np.ndarray
+        correlations in shape (nlags, natoms)
+    """
+    # zero padding avoids the circular correlation
+    nfft = 1 << int(len(aa) + len(bb) - 1).bit_length()
+    fa = np.fft.rfft(aa, n=nfft, axis=0)
+    fb = np.fft.rfft(bb, n=nfft, axis=0)
+    corr = np.fft.irfft(np.conj(fa) * fb, n=nfft, axis=0)[:nlags]
+    return np.sum(corr, axis=-1)
+
+
+def _msd(coords, begin):
+    """MSD of each atom relative to the frame `begin`.
+
+    Returns
+    -------
+    np.ndarray
+        msd in shape (nframes - begin, natoms)
+    """
+    diff_coord = coords[begin:] - coords[begin]
+    return np.sum(diff_coord * diff_coord, axis=-1)
+
+
+def _msd_win(coords, begin, window):
+    """MSD of each atom averaged over the time origins from `begin` to
+    `nframes - window`, for the lags smaller than `window`.
+
+    Returns
+    -------
+    np.ndarray
+        msd in shape (window, natoms)
+    """
+    nframes = coords.shape[0]
+    end = nframes - window + 1
+    norigins = end - begin
+    sq = np.sum(coords * coords, axis=-1)
+    cum_sq = np.concatenate((np.zeros((1, sq.shape[1])), np.cumsum(sq, axis=0)))
+    lags = np.arange(window)
+    # sum_k |r(k)|^2 and sum_k |r(k + m)|^2 over the origins k
+    sq_origin = cum_sq[end] - cum_sq[begin]
+    sq_lag = cum_sq[end + lags] - cum_sq[begin + lags]
+    corr = _fft_correlation(coords[begin:end], coords[begin:], window)
+    msd = (sq_origin + sq_lag - 2 * corr) / norigins
+    # exactly zero, without the round-off error of FFT
+    msd[0] = 0.0
+    return msd
+
+
+def _msd_fft(coords, begin):
+    """MSD of each atom averaged over all time origins for all lags, by the
+    FFT algorithm of Calandrini et al. (nMoldyn).
+
+    Returns
+    -------
+    np.ndarray
+        msd in shape (nframes - begin, natoms)
+    """
+    coords = coords[begin:]
+    nframes = coords.shape[0]
+    sq = np.sum(coords * coords, axis=-1)
+    cum_sq = np.concatenate((np.zeros((1, sq.shape[1])), np.cumsum(sq, axis=0)))
+    lags = np.arange(nframes)
+    # sum_k (|r(k)|^2 + |r(k + m)|^2) over k < nframes - m
+    sq_sum = cum_sq[nframes - lags] + cum_sq[nframes] - cum_sq[lags]
+    corr = _fft_correlation(coords, coords, nframes)
+    msd = (sq_sum - 2 * corr) / (nframes - lags)[:, None]
+    msd[0] = 0.0
+    return msd
+
+
+def _group_msd(system, sel, per_type, chunk_size, func, nframes_fft=None):
+    """Compute the MSD of the selected atoms, chunk by chunk of atoms.
+
+    The coordinates of each chunk are unwrapped and centered, and the MSD of
+    each atom is summed into its group.
+    """
     natoms = system.get_natoms()
     if sel is None:
         sel_idx = np.arange(natoms)
     else:
-        sel_idx = []
-        for ii in range(natoms):
-            if sel[ii]:
-                sel_idx.append(ii)
-        sel_idx = np.array(sel_idx, dtype=int)
-    nsel = sel_idx.size
-    nframes = system.get_nframes()
-    pbc_shift = system_pbc_shift(system)
+        sel_idx = np.flatnonzero(np.asarray(sel)[:natoms])
+    if per_type:
+        groups = np.asarray(system["atom_types"])[sel_idx]
+        names = system["atom_names"]
+        ngroups = len(names)
+    else:
+        groups = np.zeros(len(sel_idx), dtype=int)
+        ngroups = 1
+    if chunk_size is None:
+        # bound the size of the arrays of FFT
+        nframes = nframes_fft or system.get_nframes()
+        chunk_size = max(1, (1 << 22) // nframes)
     coords = system["coords"]
     cells = system["cells"]
-    pbc_shift = pbc_shift[:, sel_idx, :]
-    coords = coords[:, sel_idx, :]
+    msd_sum = None
+    for start in range(0, len(sel_idx), chunk_size):
+        idx = sel_idx[start : start + chunk_size]
+        ncoords = unwrap_coords(coords[:, idx], cells)
+        # the msd is invariant to the translation of each atom
+        ncoords -= np.mean(ncoords, axis=0)
+        msd_atoms = func(ncoords)
+        onehot = groups[start : start + chunk_size] == np.arange(ngroups)[:, None]
+        chunk_sum = np.matmul(onehot, msd_atoms.T)
+        msd_sum = chunk_sum if msd_sum is None else msd_sum + chunk_sum
+    counts = np.bincount(groups, minlength=ngroups)
+    if not per_type:
+        return msd_sum[0] / counts[0]
+    return {names[ii]: msd_sum[ii] / counts[ii] for ii in range(ngroups) if counts[ii]}
+
+
+def msd(system, sel=None, begin=0, window=0, per_type=False, chunk_size=None):
+    """Compute the mean squared displacement (MSD) of a system.
+
+    The coordinates are unwrapped according to the periodic boundary
+    conditions.
+
+    Parameters
+    ----------
+    system : System
+        The dpdata system
+    sel : np.ndarray, optional
+        Boolean mask of the selected atoms. If None, all atoms are selected
+    begin : int
+        The first frame
+    window : int
+        If 0, the MSD relative to the frame `begin`. Otherwise, the MSD of the
+        lags smaller than `window`, averaged over the time origins from
+        `begin` to `nframes - window`
+    per_type : bool
+        Compute the MSD of each atom type
+    chunk_size : int, optional
+        Number of atoms processed at a time, to bound the memory
+
+    Returns
+    -------
+    np.ndarray or dict[str, np.ndarray]
+        The MSD, or the MSD of each atom name if `per_type`
+    """
     if window <= 0:
-        return _msd(coords, cells, pbc_shift, begin)
-    else:
-        return _msd_win(coords, cells, pbc_shift, begin, window)
+        return _group_msd(system, sel, per_type, chunk_size, lambda cc: _msd(cc, begin))
+    return _group_msd(
+        system,
+        sel,
+        per_type,
+        chunk_size,
+        lambda cc: _msd_win(cc, begin, window),
+        nframes_fft=2 * system.get_nframes(),
+    )
+
+
+def msd_fft(system, sel=None, begin=0, per_type=False, chunk_size=None):
+    """Compute the mean squared displacement (MSD) of all lags by FFT.
+
+    For each lag, the MSD is averaged over all time origins from `begin`,
+    which costs O(T log T) for T frames.
+
+    Parameters
+    ----------
+    system : System
+        The dpdata system
+    sel : np.ndarray, optional
+        Boolean mask of the selected atoms. If None, all atoms are selected
+    begin : int
+        The first frame
+    per_type : bool
+        Compute the MSD of each atom type
+    chunk_size : int, optional
+        Number of atoms processed at a time, to bound the memory
+
+    Returns
+    -------
+    np.ndarray or dict[str, np.ndarray]
+        The MSD of the lags from 0 to `nframes - begin - 1`, or the MSD of
+        each atom name if `per_type`
+    """
+    return _group_msd(
+        system,
+        sel,
+        per_type,
+        chunk_size,
+        lambda cc: _msd_fft(cc, begin),
+        nframes_fft=2 * system.get_nframes(),
+    )
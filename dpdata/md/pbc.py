@@ -39,27 +39,55 @@ def dir_coord(coord, box):
     return np.matmul(coord, rbox)
 
 
+def pbc_shift(coords, cells):
+    """Compute the periodic image of each atom in each frame.
+
+    An atom is considered to cross the box when its direct coordinate
+    changes by more than half of the box between two frames. The crossings
+    are accumulated by a cumulative sum over frames.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        coordinates in shape (nframes, natoms, 3)
+    cells : np.ndarray
+        cells in shape (nframes, 3, 3)
+
+    Returns
+    -------
+    np.ndarray
+        integer shifts in shape (nframes, natoms, 3), relative to the first frame
+    """
+    ncoords = dir_coord(coords, cells)
+    diff_ncoord = np.diff(ncoords, axis=0)
+    crossing = (diff_ncoord < -0.5).astype(int) - (diff_ncoord > 0.5)
+    shifts = np.zeros(coords.shape, dtype=int)
+    np.cumsum(crossing, axis=0, out=shifts[1:])
+    return shifts
+
+
+def unwrap_coords(coords, cells):
+    """Unwrap the coordinates, so that the atoms move continuously.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        coordinates in shape (nframes, natoms, 3)
+    cells : np.ndarray
+        cells in shape (nframes, 3, 3)
+
+    Returns
+    -------
+    np.ndarray
+        unwrapped coordinates in shape (nframes, natoms, 3)
+    """
+    return coords + np.matmul(pbc_shift(coords, cells), cells)
+
+
 def system_pbc_shift(system):
-    f_idx = 0
-    prev_ncoord = dir_coord(system["coords"][f_idx], system["cells"][f_idx])
-    shifts = np.zeros([system.get_nframes(), system.get_natoms(), 3], dtype=int)
-    curr_shift = np.zeros([system.get_natoms(), 3], dtype=int)
-    half = 0.5 * np.ones([system.get_natoms(), 3])
-    for ii in range(system.get_nframes()):
-        curr_ncoord = dir_coord(system["coords"][ii], system["cells"][ii])
-        diff_ncoord = curr_ncoord - prev_ncoord
-        curr_shift -= diff_ncoord > half
-        curr_shift += diff_ncoord < -half
-        shifts[ii] = np.copy(curr_shift)
-        prev_ncoord = curr_ncoord
-    return np.array(shifts, dtype=int)
+    return pbc_shift(system["coords"], system["cells"])
 
 
 def apply_pbc(system_coords, system_cells):
-    coords = []
-    nframes = system_cells.shape[0]
-    for ff in range(nframes):
-        ncoord = dir_coord(system_coords[ff], system_cells[ff])
-        ncoord = ncoord % 1
-        coords.append(np.matmul(ncoord, system_cells[ff]))
-    return np.array(coords)
+    ncoord = dir_coord(system_coords, system_cells) % 1
+    return np.matmul(ncoord, system_cells)
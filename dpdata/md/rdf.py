@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import itertools
+
 import numpy as np
 
 
-def rdf(sys, sel_type=[None, None], max_r=5, nbins=100):
+def rdf(sys, sel_type=[None, None], max_r=5, nbins=100, nprocs=None):
     """Compute the rdf of a system.
 
     Parameters
@@ -20,6 +22,8 @@ def rdf(sys, sel_type=[None, None], max_r=5, nbins=100):
         Maximal range of rdf calculation
     nbins : int
         Number of bins for rdf calculation
+    nprocs : int, optional
+        Number of processes to compute the frames
 
     Returns
     -------
@@ -37,87 +41,185 @@ def rdf(sys, sel_type=[None, None], max_r=5, nbins=100):
         sel_type=sel_type,
         max_r=max_r,
         nbins=nbins,
+        nprocs=nprocs,
     )
 
 
-def compute_rdf(box, posis, atype, sel_type=[None, None], max_r=5, nbins=100):
-    nframes = box.shape[0]
-    xx = None
-    all_rdf = []
-    all_cod = []
-    for ii in range(nframes):
-        xx, rdf, cod = _compute_rdf_1frame(
-            box[ii], posis[ii], atype, sel_type, max_r, nbins
+def partial_rdf(sys, max_r=5, nbins=100, nprocs=None):
+    """Compute the rdf of every pair of atom types of a system in one pass.
+
+    Parameters
+    ----------
+    sys : System or LabeledSystem
+        The dpdata system
+    max_r : float
+        Maximal range of rdf calculation
+    nbins : int
+        Number of bins for rdf calculation
+    nprocs : int, optional
+        Number of processes to compute the frames
+
+    Returns
+    -------
+    xx: np.array
+        The lattice of r
+    rdf: np.array
+        The value of rdf at r, in shape (ntypes, ntypes, nbins). rdf[i, j] is
+        the rdf of atoms of type j around atoms of type i
+    coord: np.array
+        The coordination number up to r, in shape (ntypes, ntypes, nbins)
+    """
+    ntypes = len(sys["atom_names"])
+    counts = _pair_counts(
+        sys["cells"], sys["coords"], sys["atom_types"], ntypes, max_r, nbins, nprocs
+    )
+    xx = np.arange(0, max_r - 1e-12, max_r / float(nbins))
+    all_rdf = np.zeros((ntypes, ntypes, nbins))
+    all_cod = np.zeros((ntypes, ntypes, nbins))
+    for t0, t1 in itertools.product(range(ntypes), repeat=2):
+        all_rdf[t0, t1], all_cod[t0, t1] = _normalize(
+            counts, sys["cells"], sys["atom_types"], [t0], [t1], max_r, nbins
         )
-        all_rdf.append(rdf)
-        all_cod.append(cod)
-    all_rdf = np.array(all_rdf).reshape([nframes, -1])
-    all_cod = np.array(all_cod).reshape([nframes, -1])
-    all_rdf = np.average(all_rdf, axis=0)
-    all_cod = np.average(all_cod, axis=0)
     return xx, all_rdf, all_cod
 
 
-def _compute_rdf_1frame(box, posis, atype, sel_type=[None, None], max_r=5, nbins=100):
-    all_types = list(set(list(np.sort(atype, kind="stable"))))
-    if sel_type[0] is None:
-        sel_type[0] = all_types
-    if sel_type[1] is None:
-        sel_type[1] = all_types
-    if not isinstance(sel_type[0], list):
-        sel_type[0] = [sel_type[0]]
-    if not isinstance(sel_type[1], list):
-        sel_type[1] = [sel_type[1]]
+def compute_rdf(
+    box, posis, atype, sel_type=[None, None], max_r=5, nbins=100, nprocs=None
+):
+    """Compute the rdf averaged over frames.
+
+    The pairs within `max_r` are found by a cell list, and the pairs of all
+    types are counted at once. See :func:`rdf` for the parameters.
+    """
+    atype = np.asarray(atype)
+    ntypes = int(atype.max()) + 1
+    sel = []
+    for ss in sel_type:
+        if ss is None:
+            ss = list(range(ntypes))
+        elif not isinstance(ss, list):
+            ss = [ss]
+        sel.append([tt for tt in ss if tt < ntypes])
+    counts = _pair_counts(box, posis, atype, ntypes, max_r, nbins, nprocs)
+    xx = np.arange(0, max_r - 1e-12, max_r / float(nbins))
+    all_rdf, all_cod = _normalize(counts, box, atype, sel[0], sel[1], max_r, nbins)
+    return xx, all_rdf, all_cod
+
+
+def _normalize(counts, box, atype, sel0, sel1, max_r, nbins):
+    """Normalize the pair counts of the selected types to the rdf and the
+    coordination number, averaged over frames.
+    """
+    stat = counts[:, sel0][:, :, sel1].sum(axis=(1, 2))
+    c0 = np.isin(atype, sel0).sum()
+    c1 = np.isin(atype, sel1).sum()
+    rho1 = c1 / np.linalg.det(box)
+    hh = max_r / float(nbins)
+    edges = np.arange(nbins + 1) * hh
+    vol = 4.0 / 3.0 * np.pi * (edges[1:] ** 3 - edges[:-1] ** 3)
+    all_rdf = stat / vol / rho1[:, None] / c0
+    # the coordination number up to the lower edge of each bin
+    all_cod = np.zeros_like(all_rdf)
+    all_cod[:, 1:] = np.cumsum(stat[:, :-1], axis=1) / c0
+    return np.average(all_rdf, axis=0), np.average(all_cod, axis=0)
+
+
+def _pair_counts(box, posis, atype, ntypes, max_r, nbins, nprocs=None):
+    """Count the pairs of each pair of types in each bin of each frame.
+
+    Returns
+    -------
+    np.ndarray
+        counts in shape (nframes, ntypes, ntypes, nbins)
+    """
+    nframes = len(box)
+    if nprocs is None or nprocs <= 1 or nframes <= 1:
+        return _pair_counts_frames(box, posis, atype, ntypes, max_r, nbins)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # several chunks per process to balance the load
+    chunks = np.array_split(np.arange(nframes), min(nframes, nprocs * 4))
+    with ProcessPoolExecutor(max_workers=nprocs) as executor:
+        counts = list(
+            executor.map(
+                _pair_counts_frames,
+                [box[cc] for cc in chunks],
+                [posis[cc] for cc in chunks],
+                [atype] * len(chunks),
+                [ntypes] * len(chunks),
+                [max_r] * len(chunks),
+                [nbins] * len(chunks),
+            )
+        )
+    return np.concatenate(counts)
+
+
+def _pair_counts_frames(box, posis, atype, ntypes, max_r, nbins):
+    return np.array(
+        [
+            _pair_counts_1frame(bb, pp, atype, ntypes, max_r, nbins)
+            for bb, pp in zip(box, posis)
+        ]
+    ).reshape(len(box), ntypes, ntypes, nbins)
+
+
+def _pair_counts_1frame(box, posis, atype, ntypes, max_r, nbins):
+    """Count the pairs within `max_r` of a periodic frame by a cell list.
+
+    The box is divided into cells no thinner than `max_r`, so the neighbors
+    of an atom are in the 27 cells around it. Along a direction where the box
+    is thinner than three cells, the box is not divided, and all periodic
+    images within `max_r` are searched instead. The pairs between an atom
+    and the atoms in a neighbor cell are computed for all atoms at once.
+    """
     natoms = len(posis)
-    import ase.neighborlist
-    from ase import Atoms
-
-    atoms = Atoms(positions=posis, cell=box, pbc=[1, 1, 1])
-    nlist = ase.neighborlist.NeighborList(
-        max_r,
-        self_interaction=False,
-        bothways=True,
-        primitive=ase.neighborlist.NewPrimitiveNeighborList,
-    )
-    nlist.update(atoms)
-    stat = np.zeros(nbins)
-    stat_acc = np.zeros(nbins)
     hh = max_r / float(nbins)
-    for ii in range(natoms):
-        # atom "0"
-        if atype[ii] in sel_type[0]:
-            indices, offsets = nlist.get_neighbors(ii)
-            for jj, os in zip(indices, offsets):
-                # atom "1"
-                if atype[jj] in sel_type[1]:
-                    posi_jj = atoms.positions[jj] + np.dot(os, atoms.get_cell())
-                    diff = posi_jj - atoms.positions[ii]
-                    dr = np.linalg.norm(diff)
-                    # if (np.linalg.norm(diff- diff_1)) > 1e-12 :
-                    #     raise RuntimeError
-                    si = int(dr / hh)
-                    if si < nbins:
-                        stat[si] += 1
-    # count the number of atom1
-    c0 = 0
-    for ii in sel_type[0]:
-        c0 += np.sum(atype == ii)
-    # count the number of atom1
-    c1 = 0
-    for ii in sel_type[1]:
-        c1 += np.sum(atype == ii)
-    rho1 = c1 / np.linalg.det(box)
-    # compute coordination number
-    for ii in range(1, nbins):
-        stat_acc[ii] = stat_acc[ii - 1] + stat[ii - 1]
-    stat_acc = stat_acc / c0
-    # compute rdf
-    for ii in range(nbins):
-        vol = 4.0 / 3.0 * np.pi * (((ii + 1) * hh) ** 3 - ((ii) * hh) ** 3)
-        rho = stat[ii] / vol
-        stat[ii] = rho / rho1 / c0
-    xx = np.arange(0, max_r - 1e-12, hh)
-    return xx, stat, stat_acc
+    counts = np.zeros(ntypes * ntypes * nbins, dtype=np.int64)
+    inv_box = np.linalg.inv(box)
+    frac = posis @ inv_box
+    frac -= np.floor(frac)
+    posis = frac @ box
+    # the distances between the opposite faces of the box
+    face_dist = 1.0 / np.linalg.norm(inv_box, axis=0)
+    ncells = np.floor(face_dist / max_r).astype(int)
+    ranges = []
+    for kk in range(3):
+        if ncells[kk] < 3:
+            ncells[kk] = 1
+            nimages = int(np.ceil(max_r / face_dist[kk]))
+            ranges.append(range(-nimages, nimages + 1))
+        else:
+            ranges.append(range(-1, 2))
+    cell_idx = np.minimum((frac * ncells).astype(int), ncells - 1)
+    linear_idx = np.ravel_multi_index(cell_idx.T, ncells)
+    order = np.argsort(linear_idx, kind="stable")
+    cell_counts = np.bincount(linear_idx, minlength=np.prod(ncells))
+    cell_start = np.concatenate(([0], np.cumsum(cell_counts)[:-1]))
+    pair_type = atype * ntypes
+    for offset in itertools.product(*ranges):
+        target = cell_idx + np.array(offset)
+        shift = np.floor_divide(target, ncells)
+        nb_idx = np.ravel_multi_index((target - shift * ncells).T, ncells)
+        # all pairs of each atom i and the atoms j in its neighbor cell
+        nj = cell_counts[nb_idx]
+        ii = np.repeat(np.arange(natoms), nj)
+        if len(ii) == 0:
+            continue
+        jj_start = np.repeat(cell_start[nb_idx] - (np.cumsum(nj) - nj), nj)
+        jj = order[jj_start + np.arange(len(ii))]
+        diff = posis[jj] - posis[ii] + (shift @ box)[ii]
+        dr = np.linalg.norm(diff, axis=1)
+        si = (dr / hh).astype(int)
+        mask = si < nbins
+        if not any(offset):
+            # exclude the atom itself
+            mask &= ii != jj
+        counts += np.bincount(
+            (pair_type[ii[mask]] + atype[jj[mask]]) * nbins + si[mask],
+            minlength=counts.size,
+        )
+    return counts.reshape(ntypes, ntypes, nbins)
 
 
 if __name__ == "__main__":
@@ -3,12 +3,15 @@ from __future__ import annotations
 import os
 import subprocess as sp
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 import dpdata.amber.md
 import dpdata.amber.sqm
 from dpdata.driver import Driver, Minimizer
 from dpdata.format import Format
-from dpdata.utils import open_file
+from dpdata.utils import concat_systems, dump_frames, frame_file_names, open_file
 
 
 @Format.register("amber/md")
@@ -19,6 +22,9 @@ class AmberMDFormat(Format):
         parm7_file=None,
         nc_file=None,
         use_element_symbols=None,
+        begin=0,
+        end=None,
+        step=1,
         **kwargs,
     ):
         # assume the prefix is the same if the spefic name is not given
@@ -31,6 +37,9 @@ class AmberMDFormat(Format):
             nc_file=nc_file,
             use_element_symbols=use_element_symbols,
             labeled=False,
+            begin=begin,
+            end=end,
+            step=step,
         )
 
     def from_labeled_system(
@@ -42,6 +51,9 @@ class AmberMDFormat(Format):
         mden_file=None,
         mdout_file=None,
         use_element_symbols=None,
+        begin=0,
+        end=None,
+        step=1,
         **kwargs,
     ):
         # assume the prefix is the same if the spefic name is not given
@@ -56,7 +68,15 @@ class AmberMDFormat(Format):
         if mdout_file is None:
             mdout_file = file_name + ".mdout"
         return dpdata.amber.md.read_amber_traj(
-            parm7_file, nc_file, mdfrc_file, mden_file, mdout_file, use_element_symbols
+            parm7_file,
+            nc_file,
+            mdfrc_file,
+            mden_file,
+            mdout_file,
+            use_element_symbols,
+            begin=begin,
+            end=end,
+            step=step,
         )
 
 
@@ -75,7 +95,16 @@ class SQMOutFormat(Format):
 
 @Format.register("sqm/in")
 class SQMINFormat(Format):
-    def to_system(self, data, fname=None, frame_idx=0, **kwargs):
+    def to_system(
+        self,
+        data,
+        fname=None,
+        frame_idx=0,
+        nprocs=None,
+        name_template="{idx:06d}.in",
+        shard_size=None,
+        **kwargs,
+    ):
         """Generate input files for semi-emperical calculation in sqm software.
 
         Parameters
@@ -83,12 +112,28 @@ class SQMINFormat(Format):
         data : dict
             system data
         fname : str
-            output file name
-        frame_idx : int, default=0
-            index of frame to write
+            output file name. If multiple frames are dumped, it is the
+            directory of the input files
+        frame_idx : int or list[int] or None, default=0
+            index of frame to write. If a list is given, an input file is
+            written for each listed frame. If None, all frames are written
+        nprocs : int, optional
+            number of processes to write multiple frames
+        name_template : str, default={idx:06d}.in
+            template of the file name of each frame, formatted with the frame
+            index ``idx``
+        shard_size : int, optional
+            if given, the files are sharded into subdirectories, each containing
+            ``shard_size`` frames
         **kwargs : dict
             other parameters
 
+        Returns
+        -------
+        str or list[str]
+            the input of the frame, or the file of each frame if multiple
+            frames are written
+
         Other Parameters
         ----------------
         **kwargs : dict
@@ -104,7 +149,22 @@ class SQMINFormat(Format):
                 mult : int, default=1
                     multiplicity. Only 1 is allowed.
         """
-        return dpdata.amber.sqm.make_sqm_in(data, fname, frame_idx, **kwargs)
+        if isinstance(frame_idx, (int, np.integer)):
+            return dpdata.amber.sqm.make_sqm_in(data, fname, frame_idx, **kwargs)
+        if frame_idx is None:
+            frame_idx = range(len(data["coords"]))
+        file_names = frame_file_names(
+            fname, frame_idx, name_template, shard_size=shard_size
+        )
+        dump_frames(
+            dpdata.amber.sqm.make_sqm_inputs,
+            data,
+            frame_idx,
+            file_names,
+            nprocs=nprocs,
+            **kwargs,
+        )
+        return file_names
 
 
 @Driver.register("sqm")
@@ -115,6 +175,8 @@ class SQMDriver(Driver):
     ----------
     sqm_exec : str, default=sqm
         path to sqm program
+    max_workers : int, default=1
+        maximum number of sqm processes running concurrently
     **kwargs : dict
         other arguments to make input files. See :class:`SQMINFormat`
 
@@ -127,29 +189,71 @@ class SQMDriver(Driver):
     -15.41111246
     """
 
-    def __init__(self, sqm_exec: str = "sqm", **kwargs) -> None:
+    def __init__(self, sqm_exec: str = "sqm", max_workers: int = 1, **kwargs) -> None:
         self.sqm_exec = sqm_exec
+        self.max_workers = max_workers
         self.kwargs = kwargs
 
+    def prepare_frame(self, ss, work_dir: str) -> list[str]:
+        """Write the input file of a frame.
+
+        Parameters
+        ----------
+        ss : dpdata.System
+            system with a single frame
+        work_dir : str
+            directory to run the frame, which is created
+
+        Returns
+        -------
+        list[str]
+            command to run sqm
+        """
+        os.makedirs(work_dir)
+        inp_fn = os.path.join(work_dir, "sqm.in")
+        out_fn = os.path.join(work_dir, "sqm.out")
+        ss.to("sqm/in", inp_fn, **self.kwargs)
+        return [*self.sqm_exec.split(), "-O", "-i", inp_fn, "-o", out_fn]
+
+    def read_frame(self, work_dir: str, returncode: int):
+        """Read the labeled frame after sqm exits.
+
+        Parameters
+        ----------
+        work_dir : str
+            directory to run the frame
+        returncode : int
+            exit code of sqm
+
+        Returns
+        -------
+        dpdata.LabeledSystem
+            labeled frame
+
+        Raises
+        ------
+        RuntimeError
+            if sqm fails
+        """
+        out_fn = os.path.join(work_dir, "sqm.out")
+        if returncode != 0:
+            with open_file(out_fn) as f:
+                raise RuntimeError("Run sqm failed! Output:\n" + f.read())
+        return dpdata.LabeledSystem(out_fn, fmt="sqm/out")
+
+    def _label_frame(self, ss, work_dir: str):
+        cmd = self.prepare_frame(ss, work_dir)
+        returncode = sp.run(cmd, stdout=sp.PIPE).returncode
+        return self.read_frame(work_dir, returncode)
+
     def label(self, data: dict) -> dict:
         ori_system = dpdata.System(data=data)
-        labeled_system = dpdata.LabeledSystem()
         with tempfile.TemporaryDirectory() as d:
-            for ii, ss in enumerate(ori_system):
-                inp_fn = os.path.join(d, "%d.in" % ii)  # noqa: UP031
-                out_fn = os.path.join(d, "%d.out" % ii)  # noqa: UP031
-                ss.to("sqm/in", inp_fn, **self.kwargs)
-                try:
-                    sp.check_output(
-                        [*self.sqm_exec.split(), "-O", "-i", inp_fn, "-o", out_fn]
-                    )
-                except sp.CalledProcessError as e:
-                    with open_file(out_fn) as f:
-                        raise RuntimeError(
-                            "Run sqm failed! Output:\n" + f.read()
-                        ) from e
-                labeled_system.append(dpdata.LabeledSystem(out_fn, fmt="sqm/out"))
-        return labeled_system.data
+            # each frame is run in its own directory, keeping the frame order
+            work_dirs = [os.path.join(d, str(ii)) for ii in range(len(ori_system))]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                systems = list(executor.map(self._label_frame, ori_system, work_dirs))
+        return concat_systems(systems, cls=dpdata.LabeledSystem).data
 
 
 @Minimizer.register("sqm")
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import itertools
 import os
-from typing import TYPE_CHECKING, Generator
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Generator
 
 import numpy as np
 
 import dpdata
-from dpdata.driver import Driver, Minimizer
+from dpdata.driver import Driver, Minimizer, driver_fingerprint
 from dpdata.format import Format
+from dpdata.utils import concat_systems, sub_frames
 
 if TYPE_CHECKING:
     import ase
@@ -25,13 +28,14 @@ class ASEStructureFormat(Format):
     automatic detection fails.
     """
 
-    def from_system(self, atoms: ase.Atoms, **kwargs) -> dict:
+    def from_system(self, atoms: ase.Atoms | list[ase.Atoms], **kwargs) -> dict:
         """Convert ase.Atoms to a System.
 
         Parameters
         ----------
-        atoms : ase.Atoms
-            an ASE Atoms, containing a structure
+        atoms : ase.Atoms or list[ase.Atoms]
+            an ASE Atoms, containing a structure, or a list of ASE Atoms
+            sharing the same chemical symbols
         **kwargs : dict
             other parameters
 
@@ -40,33 +44,30 @@ class ASEStructureFormat(Format):
         dict
             data dict
         """
-        symbols = atoms.get_chemical_symbols()
-        atom_names = list(dict.fromkeys(symbols))
-        atom_numbs = [symbols.count(symbol) for symbol in atom_names]
-        atom_types = np.array([atom_names.index(symbol) for symbol in symbols]).astype(
-            int
+        atoms_list = _to_atoms_list(atoms)
+        nframes = len(atoms_list)
+        natoms = len(atoms_list[0])
+        cells = np.empty((nframes, 3, 3))
+        coords = np.empty((nframes, natoms, 3))
+        for ii, aa in enumerate(atoms_list):
+            cells[ii] = aa.cell[:]
+            coords[ii] = aa.positions
+        return _build_data(
+            atoms_list[0].get_chemical_symbols(),
+            atoms_list[0].get_pbc(),
+            cells,
+            coords,
         )
-        cells = atoms.cell[:]
-        coords = atoms.get_positions()
-        info_dict = {
-            "atom_names": atom_names,
-            "atom_numbs": atom_numbs,
-            "atom_types": atom_types,
-            "cells": np.array([cells]),
-            "coords": np.array([coords]),
-            "orig": np.zeros(3),
-            "nopbc": not np.any(atoms.get_pbc()),
-        }
-        return info_dict
 
-    def from_labeled_system(self, atoms: ase.Atoms, **kwargs) -> dict:
+    def from_labeled_system(self, atoms: ase.Atoms | list[ase.Atoms], **kwargs) -> dict:
         """Convert ase.Atoms to a LabeledSystem. Energies and forces
         are calculated by the calculator.
 
         Parameters
         ----------
-        atoms : ase.Atoms
-            an ASE Atoms, containing a structure
+        atoms : ase.Atoms or list[ase.Atoms]
+            an ASE Atoms, containing a structure, or a list of ASE Atoms
+            sharing the same chemical symbols
         **kwargs : dict
             other parameters
 
@@ -83,23 +84,32 @@ class ASEStructureFormat(Format):
         """
         from ase.calculators.calculator import PropertyNotImplementedError
 
-        info_dict = self.from_system(atoms)
-        try:
-            energies = atoms.get_potential_energy(force_consistent=True)
-        except PropertyNotImplementedError:
-            energies = atoms.get_potential_energy()
-        forces = atoms.get_forces()
+        atoms_list = _to_atoms_list(atoms)
+        info_dict = self.from_system(atoms_list)
+        nframes, natoms = info_dict["coords"].shape[:2]
+        energies = np.empty(nframes)
+        forces = np.empty((nframes, natoms, 3))
+        virials = np.empty((nframes, 3, 3))
+        has_virial = True
+        for ii, aa in enumerate(atoms_list):
+            try:
+                energies[ii] = aa.get_potential_energy(force_consistent=True)
+            except PropertyNotImplementedError:
+                energies[ii] = aa.get_potential_energy()
+            forces[ii] = aa.get_forces()
+            if has_virial:
+                try:
+                    stress = aa.get_stress(voigt=False)
+                except PropertyNotImplementedError:
+                    has_virial = False
+                else:
+                    virials[ii] = -aa.get_volume() * stress
         info_dict = {
             **info_dict,
-            "energies": np.array([energies]),
-            "forces": np.array([forces]),
+            "energies": energies,
+            "forces": forces,
         }
-        try:
-            stress = atoms.get_stress(voigt=False)
-        except PropertyNotImplementedError:
-            pass
-        else:
-            virials = np.array([-atoms.get_volume() * stress])
+        if has_virial:
             info_dict["virials"] = virials
         return info_dict
 
@@ -111,10 +121,12 @@ class ASEStructureFormat(Format):
         step: int | None = None,
         ase_fmt: str | None = None,
         **kwargs,
-    ) -> Generator[ase.Atoms, None, None]:
+    ) -> Generator[list[ase.Atoms], None, None]:
         """Convert a ASE supported file to ASE Atoms.
 
-        It will finally be converted to MultiSystems.
+        It will finally be converted to MultiSystems. Consecutive frames
+        sharing the same chemical symbols are grouped, so that each group
+        is converted to a System at once.
 
         Parameters
         ----------
@@ -133,70 +145,59 @@ class ASEStructureFormat(Format):
 
         Yields
         ------
-        ase.Atoms
-            ASE atoms in the file
+        list[ase.Atoms]
+            consecutive ASE atoms in the file with the same chemical symbols
         """
         import ase.io
 
         frames = ase.io.read(file_name, format=ase_fmt, index=slice(begin, end, step))
-        yield from frames
+        for _, group in itertools.groupby(
+            frames,
+            key=lambda atoms: (
+                tuple(atoms.get_atomic_numbers()),
+                tuple(atoms.get_pbc()),
+            ),
+        ):
+            yield list(group)
 
     def to_system(self, data, **kwargs) -> list[ase.Atoms]:
         """Convert System to ASE Atom obj."""
         from ase import Atoms
 
-        structures = []
         species = [data["atom_names"][tt] for tt in data["atom_types"]]
+        template = Atoms(symbols=species, pbc=not data.get("nopbc", False))
 
+        structures = []
         for ii in range(data["coords"].shape[0]):
-            structure = Atoms(
-                symbols=species,
-                positions=data["coords"][ii],
-                pbc=not data.get("nopbc", False),
-                cell=data["cells"][ii],
-            )
+            structure = template.copy()
+            structure.set_cell(data["cells"][ii])
+            structure.set_positions(data["coords"][ii])
             structures.append(structure)
 
         return structures
 
     def to_labeled_system(self, data, *args, **kwargs) -> list[ase.Atoms]:
         """Convert System to ASE Atoms object."""
-        from ase import Atoms
         from ase.calculators.singlepoint import SinglePointCalculator
 
-        structures = []
-        species = [data["atom_names"][tt] for tt in data["atom_types"]]
-
-        for ii in range(data["coords"].shape[0]):
-            structure = Atoms(
-                symbols=species,
-                positions=data["coords"][ii],
-                pbc=not data.get("nopbc", False),
-                cell=data["cells"][ii],
-            )
-
+        structures = self.to_system(data)
+        if "virials" in data:
+            # convert to GPa as this is ase convention
+            # v_pref = 1 * 1e4 / 1.602176621e6
+            vol = np.abs(np.linalg.det(data["cells"]))
+            # stress = virials / (v_pref * vol)
+            stress33 = -data["virials"] / vol[:, None, None]
+            # voigt order: xx, yy, zz, yz, xz, xy
+            stress = stress33[:, [0, 1, 2, 1, 0, 0], [0, 1, 2, 2, 2, 1]]
+
+        for ii, structure in enumerate(structures):
             results = {"energy": data["energies"][ii]}
             if "forces" in data:
                 results["forces"] = data["forces"][ii]
             if "virials" in data:
-                # convert to GPa as this is ase convention
-                # v_pref = 1 * 1e4 / 1.602176621e6
-                vol = structure.get_volume()
-                # results['stress'] = data["virials"][ii] / (v_pref * vol)
-                stress33 = -data["virials"][ii] / vol
-                results["stress"] = np.array(
-                    [
-                        stress33[0][0],
-                        stress33[1][1],
-                        stress33[2][2],
-                        stress33[1][2],
-                        stress33[0][2],
-                        stress33[0][1],
-                    ]
-                )
+                results["stress"] = stress[ii]
 
             structure.calc = SinglePointCalculator(structure, **results)
-            structures.append(structure)
 
         return structures
 
@@ -237,19 +238,10 @@ class ASETrajFormat(Format):
         """
         from ase.io import Trajectory
 
-        traj = Trajectory(file_name)
-        sub_traj = traj[begin:end:step]
-        dict_frames = ASEStructureFormat().from_system(sub_traj[0])
-        for atoms in sub_traj[1:]:
-            tmp = ASEStructureFormat().from_system(atoms)
-            dict_frames["cells"] = np.append(dict_frames["cells"], tmp["cells"][0])
-            dict_frames["coords"] = np.append(dict_frames["coords"], tmp["coords"][0])
-
-        ## Correct the shape of numpy arrays
-        dict_frames["cells"] = dict_frames["cells"].reshape(-1, 3, 3)
-        dict_frames["coords"] = dict_frames["coords"].reshape(len(sub_traj), -1, 3)
-
-        return dict_frames
+        with Trajectory(file_name) as traj:
+            frames = range(len(traj))[begin:end:step]
+            cells, coords = _read_traj_arrays(traj, frames)
+            return _build_data(_traj_symbols(traj), traj.pbc, cells, coords)
 
     def from_labeled_system(
         self,
@@ -281,40 +273,24 @@ class ASETrajFormat(Format):
         """
         from ase.io import Trajectory
 
-        traj = Trajectory(file_name)
-        sub_traj = traj[begin:end:step]
-
-        ## check if the first frame has a calculator
-        if sub_traj[0].calc is None:
-            raise ValueError(
-                "The input trajectory does not contain energies and forces, may not be a labeled system."
-            )
+        with Trajectory(file_name) as traj:
+            frames = range(len(traj))[begin:end:step]
 
-        dict_frames = ASEStructureFormat().from_labeled_system(sub_traj[0])
-        for atoms in sub_traj[1:]:
-            tmp = ASEStructureFormat().from_labeled_system(atoms)
-            dict_frames["cells"] = np.append(dict_frames["cells"], tmp["cells"][0])
-            dict_frames["coords"] = np.append(dict_frames["coords"], tmp["coords"][0])
-            dict_frames["energies"] = np.append(
-                dict_frames["energies"], tmp["energies"][0]
-            )
-            if "forces" in tmp.keys() and "forces" in dict_frames.keys():
-                dict_frames["forces"] = np.append(
-                    dict_frames["forces"], tmp["forces"][0]
-                )
-            if "virials" in tmp.keys() and "virials" in dict_frames.keys():
-                dict_frames["virials"] = np.append(
-                    dict_frames["virials"], tmp["virials"][0]
+            ## check if the first frame has a calculator
+            if "calculator" not in traj.backend[frames[0]]:
+                raise ValueError(
+                    "The input trajectory does not contain energies and forces, may not be a labeled system."
                 )
 
-        ## Correct the shape of numpy arrays
-        dict_frames["cells"] = dict_frames["cells"].reshape(-1, 3, 3)
-        dict_frames["coords"] = dict_frames["coords"].reshape(len(sub_traj), -1, 3)
-        if "forces" in dict_frames.keys():
-            dict_frames["forces"] = dict_frames["forces"].reshape(len(sub_traj), -1, 3)
-        if "virials" in dict_frames.keys():
-            dict_frames["virials"] = dict_frames["virials"].reshape(-1, 3, 3)
-
+            cells, coords, energies, forces, virials = _read_traj_arrays(
+                traj, frames, labeled=True
+            )
+            dict_frames = _build_data(_traj_symbols(traj), traj.pbc, cells, coords)
+        dict_frames["energies"] = energies
+        if forces is not None:
+            dict_frames["forces"] = forces
+        if virials is not None:
+            dict_frames["virials"] = virials
         return dict_frames
 
     def to_system(self, data, file_name: str = "confs.traj", **kwargs) -> None:
@@ -358,19 +334,320 @@ class ASETrajFormat(Format):
         return
 
 
+def _to_atoms_list(atoms: ase.Atoms | list[ase.Atoms]) -> list[ase.Atoms]:
+    """Normalize the input to a list of ASE Atoms with the same chemical symbols.
+
+    Parameters
+    ----------
+    atoms : ase.Atoms or list[ase.Atoms]
+        an ASE Atoms or a list of ASE Atoms
+
+    Returns
+    -------
+    list[ase.Atoms]
+        a list of ASE Atoms
+
+    Raises
+    ------
+    ValueError
+        if the ASE Atoms do not share the same chemical symbols
+    """
+    from ase import Atoms
+
+    if isinstance(atoms, Atoms):
+        return [atoms]
+    atoms = list(atoms)
+    numbers = atoms[0].get_atomic_numbers()
+    for aa in atoms[1:]:
+        if not np.array_equal(aa.get_atomic_numbers(), numbers):
+            raise ValueError("All ASE Atoms should have the same chemical symbols.")
+    return atoms
+
+
+def _build_data(
+    symbols: list[str], pbc: np.ndarray, cells: np.ndarray, coords: np.ndarray
+) -> dict:
+    """Build the data dict from chemical symbols and arrays of all frames.
+
+    Parameters
+    ----------
+    symbols : list[str]
+        chemical symbols of atoms
+    pbc : np.ndarray
+        periodic boundary conditions along three directions
+    cells : np.ndarray
+        cells in shape (nframes, 3, 3)
+    coords : np.ndarray
+        coordinates in shape (nframes, natoms, 3)
+
+    Returns
+    -------
+    dict
+        data dict
+    """
+    atom_names = list(dict.fromkeys(symbols))
+    atom_numbs = [symbols.count(symbol) for symbol in atom_names]
+    atom_types = np.array([atom_names.index(symbol) for symbol in symbols]).astype(int)
+    return {
+        "atom_names": atom_names,
+        "atom_numbs": atom_numbs,
+        "atom_types": atom_types,
+        "cells": cells,
+        "coords": coords,
+        "orig": np.zeros(3),
+        "nopbc": not np.any(pbc),
+    }
+
+
+def _traj_symbols(traj) -> list[str]:
+    """Get the chemical symbols stored in the header of an ASE trajectory."""
+    from ase.data import chemical_symbols
+
+    return [chemical_symbols[nn] for nn in traj.numbers]
+
+
+def _read_traj_arrays(traj, frames: range, labeled: bool = False) -> tuple:
+    """Read arrays of the frames directly from the backend of an ASE trajectory.
+
+    No ASE Atoms or calculator is created for each frame.
+
+    Parameters
+    ----------
+    traj : ase.io.trajectory.TrajectoryReader
+        the opened trajectory
+    frames : range
+        indexes of frames to read
+    labeled : bool, default=False
+        whether to read energies, forces and virials
+
+    Returns
+    -------
+    tuple
+        cells and coords; energies, forces (or None), and virials (or None)
+        are appended if `labeled`
+
+    Raises
+    ------
+    ValueError
+        if the atoms change along the trajectory
+    """
+    from ase.stress import voigt_6_to_full_3x3_stress
+
+    nframes = len(frames)
+    natoms = len(traj.numbers)
+    cells = np.empty((nframes, 3, 3))
+    coords = np.empty((nframes, natoms, 3))
+    if labeled:
+        energies = np.empty(nframes)
+        forces = np.empty((nframes, natoms, 3))
+        virials = np.empty((nframes, 3, 3))
+        has_force = has_virial = True
+    for ii, ff in enumerate(frames):
+        b = traj.backend[ff]
+        if "numbers" in b and not np.array_equal(b.numbers, traj.numbers):
+            raise ValueError(
+                "The atoms in the trajectory are changed at frame %d." % ff  # noqa: UP031
+            )
+        cells[ii] = b.cell
+        coords[ii] = b.positions
+        if not labeled:
+            continue
+        c = b.calculator
+        # force consistent energy is prefered, as Atoms.get_potential_energy
+        energies[ii] = c.get("free_energy", c.get("energy"))
+        has_force = has_force and "forces" in c
+        if has_force:
+            forces[ii] = c.forces
+        has_virial = has_virial and "stress" in c
+        if has_virial:
+            stress = np.asarray(c.stress)
+            if stress.shape == (6,):
+                stress = voigt_6_to_full_3x3_stress(stress)
+            virials[ii] = -np.abs(np.linalg.det(cells[ii])) * stress
+    if not labeled:
+        return cells, coords
+    return (
+        cells,
+        coords,
+        energies,
+        forces if has_force else None,
+        virials if has_virial else None,
+    )
+
+
+def _calculate_frames(
+    data: dict,
+    calculator: ase.calculators.calculator.Calculator,
+    optimizer: type[Optimizer] | None = None,
+    optimizer_kwargs: dict | None = None,
+    fmax: float | None = None,
+    max_steps: int | None = None,
+) -> dict:
+    """Calculate the frames by an ASE calculator, optionally after optimizing them.
+
+    Parameters
+    ----------
+    data : dict
+        data with coordinates and atom types
+    calculator : ase.calculators.calculator.Calculator
+        ASE calculator
+    optimizer : type, optional
+        ase optimizer class. If not given, the frames are not optimized
+    optimizer_kwargs : dict, optional
+        other parameters for optimizer
+    fmax : float, optional
+        force convergence criterion
+    max_steps : int, optional
+        max steps to optimize
+
+    Returns
+    -------
+    dict
+        labeled data with energies and forces
+    """
+    system = dpdata.System(data=data)
+    # list[Atoms]
+    structures = system.to_ase_structure()
+    labeled_systems = []
+    for atoms in structures:
+        atoms.calc = calculator
+        if optimizer is not None:
+            dyn = optimizer(atoms, **optimizer_kwargs)
+            dyn.run(fmax=fmax, steps=max_steps)
+        labeled_systems.append(
+            dpdata.LabeledSystem(
+                atoms, fmt="ase/structure", type_map=data["atom_names"]
+            )
+        )
+    return concat_systems(labeled_systems, cls=dpdata.LabeledSystem).data
+
+
+def _map_frames(
+    data: dict,
+    calculator: ase.calculators.calculator.Calculator | None,
+    calculator_factory: Callable[[], ase.calculators.calculator.Calculator] | None,
+    nprocs: int | None,
+    **kwargs,
+) -> dict:
+    """Calculate the frames in a process pool, keeping the order of the frames.
+
+    The calculator, or the factory to create it, is sent to each process
+    only once.
+    """
+    nframes = len(data["coords"])
+    if nprocs is None or nprocs <= 1 or nframes <= 1:
+        if calculator is None:
+            calculator = calculator_factory()
+        return _calculate_frames(data, calculator, **kwargs)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # several chunks per process to balance the load
+    chunks = np.array_split(np.arange(nframes), min(nframes, nprocs * 4))
+    with ProcessPoolExecutor(
+        max_workers=nprocs,
+        initializer=_init_worker,
+        initargs=(calculator, calculator_factory),
+    ) as executor:
+        results = list(
+            executor.map(
+                partial(_calculate_frames_worker, **kwargs),
+                [sub_frames(data, chunk) for chunk in chunks],
+            )
+        )
+    return concat_systems(
+        [dpdata.LabeledSystem(data=dd) for dd in results], cls=dpdata.LabeledSystem
+    ).data
+
+
+# the calculator shared by the frames in a worker process
+_worker_calculator = None
+
+
+def _init_worker(calculator, calculator_factory):
+    global _worker_calculator
+    if calculator is None:
+        calculator = calculator_factory()
+    _worker_calculator = calculator
+
+
+def _calculate_frames_worker(data, **kwargs):
+    return _calculate_frames(data, _worker_calculator, **kwargs)
+
+
 @Driver.register("ase")
 class ASEDriver(Driver):
     """ASE Driver.
 
     Parameters
     ----------
-    calculator : ase.calculators.calculator.Calculato
+    calculator : ase.calculators.calculator.Calculato, optional
         ASE calculator
+    nprocs : int, optional
+        number of processes to calculate the frames. The calculator is
+        pickled and sent to each process
+    calculator_factory : Callable, optional
+        function without arguments returning the ASE calculator, called once
+        in each process. Use it instead of `calculator` if the calculator
+        cannot be pickled
+
+    Raises
+    ------
+    ValueError
+        if not exactly one of `calculator` and `calculator_factory` is given
+
+    Examples
+    --------
+    Calculate the frames by EMT in 8 processes:
+
+    >>> from ase.calculators.emt import EMT
+    >>> labeled_system = system.predict(calculator_factory=EMT, nprocs=8, driver="ase")
     """
 
-    def __init__(self, calculator: ase.calculators.calculator.Calculator) -> None:
+    def __init__(
+        self,
+        calculator: ase.calculators.calculator.Calculator | None = None,
+        nprocs: int | None = None,
+        calculator_factory: Callable[[], ase.calculators.calculator.Calculator]
+        | None = None,
+    ) -> None:
         """Setup the driver."""
+        if (calculator is None) == (calculator_factory is None):
+            raise ValueError("Either calculator or calculator_factory should be given")
         self.calculator = calculator
+        self.calculator_factory = calculator_factory
+        self.nprocs = nprocs
+
+    @property
+    def fingerprint(self) -> list:
+        """Fingerprint of the calculator for :func:`dpdata.driver.driver_fingerprint`.
+
+        It is made by the class and the parameters of the calculator, by the
+        driver of a :class:`dpdata.ase_calculator.DPDataCalculator`, or by
+        the name of `calculator_factory`.
+
+        Raises
+        ------
+        ValueError
+            if `calculator_factory` is not a module-level function or class,
+            e.g. a lambda or a partial, which cannot be identified by its name
+        """
+        calculator = self.calculator
+        if calculator is None:
+            factory = self.calculator_factory
+            name = getattr(factory, "__qualname__", None)
+            if name is None or "<" in name:
+                raise ValueError(
+                    f"cannot make the fingerprint of calculator_factory {factory!r}"
+                )
+            return [factory.__module__, name]
+        if isinstance(getattr(calculator, "driver", None), Driver):
+            return [driver_fingerprint(calculator.driver)]
+        return [
+            type(calculator).__module__,
+            type(calculator).__qualname__,
+            calculator.todict(),
+        ]
 
     def label(self, data: dict) -> dict:
         """Label a system data. Returns new data with energy, forces, and virials.
@@ -385,18 +662,7 @@ class ASEDriver(Driver):
         dict
             labeled data with energies and forces
         """
-        # convert data to ase data
-        system = dpdata.System(data=data)
-        # list[Atoms]
-        structures = system.to_ase_structure()
-        labeled_system = dpdata.LabeledSystem()
-        for atoms in structures:
-            atoms.calc = self.calculator
-            ls = dpdata.LabeledSystem(
-                atoms, fmt="ase/structure", type_map=data["atom_names"]
-            )
-            labeled_system.append(ls)
-        return labeled_system.data
+        return _map_frames(data, self.calculator, self.calculator_factory, self.nprocs)
 
 
 @Minimizer.register("ase")
@@ -415,6 +681,9 @@ class ASEMinimizer(Minimizer):
         max steps to optimize
     optimizer_kwargs : dict, optional
         other parameters for optimizer
+    nprocs : int, optional
+        number of processes to optimize the frames. The driver and the
+        optimizer are pickled and sent to each process
     """
 
     def __init__(
@@ -424,6 +693,7 @@ class ASEMinimizer(Minimizer):
         fmax: float = 5e-3,
         max_steps: int | None = None,
         optimizer_kwargs: dict = {},
+        nprocs: int | None = None,
     ) -> None:
         self.calculator = driver.ase_calculator
         if optimizer is None:
@@ -438,6 +708,7 @@ class ASEMinimizer(Minimizer):
         }
         self.fmax = fmax
         self.max_steps = max_steps
+        self.nprocs = nprocs
 
     def minimize(self, data: dict) -> dict:
         """Minimize the geometry.
@@ -452,16 +723,13 @@ class ASEMinimizer(Minimizer):
         dict
             labeled data with minimized coordinates, energies, and forces
         """
-        system = dpdata.System(data=data)
-        # list[Atoms]
-        structures = system.to_ase_structure()
-        labeled_system = dpdata.LabeledSystem()
-        for atoms in structures:
-            atoms.calc = self.calculator
-            dyn = self.optimizer(atoms, **self.optimizer_kwargs)
-            dyn.run(fmax=self.fmax, steps=self.max_steps)
-            ls = dpdata.LabeledSystem(
-                atoms, fmt="ase/structure", type_map=data["atom_names"]
-            )
-            labeled_system.append(ls)
-        return labeled_system.data
+        return _map_frames(
+            data,
+            self.calculator,
+            None,
+            self.nprocs,
+            optimizer=self.optimizer,
+            optimizer_kwargs=self.optimizer_kwargs,
+            fmax=self.fmax,
+            max_steps=self.max_steps,
+        )
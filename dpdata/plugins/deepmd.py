@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import os
 from typing import TYPE_CHECKING
 
@@ -406,13 +407,23 @@ class DPDriver(Driver):
     ----------
     dp : deepmd.DeepPot or str
         The deepmd-kit potential class or the filename of the model.
+    batch_size : int, optional
+        The number of frames evaluated at once. By default, all frames are
+        evaluated at once if deepmd-kit supports auto batch size (since v2.0.2),
+        otherwise frames are evaluated one by one.
+
+    Notes
+    -----
+    If `dp` is a filename, the driver is fingerprinted by the hash of the
+    model file for :class:`dpdata.driver.CachedDriver`. Otherwise, the
+    fingerprint should be given to CachedDriver.
 
     Examples
     --------
     >>> DPDriver("frozen_model.pb")
     """
 
-    def __init__(self, dp: str) -> None:
+    def __init__(self, dp: str, batch_size: int | None = None) -> None:
         try:
             # DP 1.x
             import deepmd.DeepPot as DeepPot
@@ -421,11 +432,15 @@ class DPDriver(Driver):
             from deepmd.infer import DeepPot
         if not isinstance(dp, DeepPot):
             self.dp = DeepPot(dp)
+            # identifies the model for CachedDriver
+            with open(dp, "rb") as f:
+                self.fingerprint = hashlib.sha256(f.read()).hexdigest()
         else:
             self.dp = dp
         self.enable_auto_batch_size = (
             "auto_batch_size" in DeepPot.__init__.__code__.co_varnames
         )
+        self.batch_size = batch_size
 
     def label(self, data: dict) -> dict:
         """Label a system data by deepmd-kit. Returns new data with energy, forces, and virials.
@@ -441,41 +456,36 @@ class DPDriver(Driver):
             labeled data with energies and forces
         """
         type_map = self.dp.get_type_map()
-
-        ori_sys = dpdata.System.from_dict({"data": data})
-        ori_sys_copy = ori_sys.copy()
-        ori_sys.sort_atom_names(type_map=type_map)
-        atype = ori_sys["atom_types"]
-        ori_sys = ori_sys_copy
-
-        if not self.enable_auto_batch_size:
-            labeled_sys = dpdata.LabeledSystem()
-            for ss in ori_sys:
-                coord = ss["coords"].reshape((1, ss.get_natoms() * 3))
-                if not ss.nopbc:
-                    cell = ss["cells"].reshape((1, 9))
-                else:
-                    cell = None
-                e, f, v = self.dp.eval(coord, cell, atype)
-                data = ss.data
-                data["energies"] = e.reshape((1,))
-                data["forces"] = f.reshape((1, ss.get_natoms(), 3))
-                data["virials"] = v.reshape((1, 3, 3))
-                this_sys = dpdata.LabeledSystem.from_dict({"data": data})
-                labeled_sys.append(this_sys)
-            data = labeled_sys.data
+        # atom types in the type map of the model
+        assert set(data["atom_names"]).issubset(set(type_map))
+        atype = np.array([type_map.index(name) for name in data["atom_names"]])[
+            data["atom_types"]
+        ]
+
+        nframes, natoms = data["coords"].shape[:2]
+        coord = data["coords"].reshape((nframes, natoms * 3))
+        if not data.get("nopbc", False):
+            cell = data["cells"].reshape((nframes, 9))
         else:
-            # since v2.0.2, auto batch size is supported
-            coord = ori_sys.data["coords"].reshape(
-                (ori_sys.get_nframes(), ori_sys.get_natoms() * 3)
+            cell = None
+        batch_size = self.batch_size
+        if batch_size is None:
+            batch_size = nframes if self.enable_auto_batch_size else 1
+        batch_size = max(batch_size, 1)
+
+        energies = np.empty((nframes,))
+        forces = np.empty((nframes, natoms, 3))
+        virials = np.empty((nframes, 3, 3))
+        for start in range(0, nframes, batch_size):
+            batch = slice(start, start + batch_size)
+            e, f, v = self.dp.eval(
+                coord[batch], None if cell is None else cell[batch], atype
             )
-            if not ori_sys.nopbc:
-                cell = ori_sys.data["cells"].reshape((ori_sys.get_nframes(), 9))
-            else:
-                cell = None
-            e, f, v = self.dp.eval(coord, cell, atype)
-            data = ori_sys.data.copy()
-            data["energies"] = e.reshape((ori_sys.get_nframes(),))
-            data["forces"] = f.reshape((ori_sys.get_nframes(), ori_sys.get_natoms(), 3))
-            data["virials"] = v.reshape((ori_sys.get_nframes(), 3, 3))
+            energies[batch] = e.reshape((-1,))
+            forces[batch] = f.reshape((-1, natoms, 3))
+            virials[batch] = v.reshape((-1, 3, 3))
+        data = data.copy()
+        data["energies"] = energies
+        data["forces"] = forces
+        data["virials"] = virials
         return data
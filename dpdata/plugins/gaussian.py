@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import glob
 import os
 import subprocess as sp
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 import dpdata.gaussian.gjf
 import dpdata.gaussian.log
 from dpdata.driver import Driver
 from dpdata.format import Format
-from dpdata.utils import open_file
+from dpdata.utils import (
+    concat_systems,
+    dump_frames,
+    frame_file_names,
+    open_file,
+    sub_frames,
+)
 
 if TYPE_CHECKING:
     from dpdata.utils import FileType
@@ -17,18 +27,61 @@ if TYPE_CHECKING:
 
 @Format.register("gaussian/log")
 class GaussianLogFormat(Format):
+    """Gaussian log file.
+
+    Examples
+    --------
+    Read all log files under a directory in parallel:
+
+    >>> ms = dpdata.MultiSystems.from_file("logs", fmt="gaussian/log", nprocs=8)
+    """
+
     def from_labeled_system(self, file_name: FileType, md=False, **kwargs):
+        if isinstance(file_name, dict):
+            # the data has been read by from_multi_systems
+            return file_name
         try:
             return dpdata.gaussian.log.to_system_data(file_name, md=md)
         except AssertionError:
             return {"energies": [], "forces": [], "nopbc": True}
 
+    def from_multi_systems(
+        self, directory, md=False, nprocs=None, pattern="**/*.log", **kwargs
+    ):
+        """Read the log files under a directory.
+
+        Parameters
+        ----------
+        directory : str
+            the directory of the log files
+        md : bool, default False
+            whether to read multiple frames from each file
+        nprocs : int, optional
+            number of processes to read the files
+        pattern : str, default=**/*.log
+            the glob pattern of the log files relative to the directory
+        **kwargs : dict
+            other parameters
+
+        Returns
+        -------
+        list[dict]
+            system data of each file from which frames are found
+        """
+        file_names = sorted(glob.glob(os.path.join(directory, pattern), recursive=True))
+        data = dpdata.gaussian.log.read_logs(file_names, md=md, nprocs=nprocs)
+        return [dd for dd in data if dd is not None]
+
 
 @Format.register("gaussian/md")
 class GaussianMDFormat(Format):
     def from_labeled_system(self, file_name: FileType, **kwargs):
         return GaussianLogFormat().from_labeled_system(file_name, md=True)
 
+    def from_multi_systems(self, directory, **kwargs):
+        kwargs["md"] = True
+        return GaussianLogFormat().from_multi_systems(directory, **kwargs)
+
 
 @Format.register("gaussian/gjf")
 class GaussiaGJFFormat(Format):
@@ -48,7 +101,16 @@ class GaussiaGJFFormat(Format):
             text = fp.read()
         return dpdata.gaussian.gjf.read_gaussian_input(text)
 
-    def to_system(self, data: dict, file_name: FileType, **kwargs):
+    def to_system(
+        self,
+        data: dict,
+        file_name: FileType,
+        frame_idx=0,
+        nprocs=None,
+        name_template="{idx:06d}.gjf",
+        shard_size=None,
+        **kwargs,
+    ):
         """Generate Gaussian input file.
 
         Parameters
@@ -56,13 +118,48 @@ class GaussiaGJFFormat(Format):
         data : dict
             system data
         file_name : str
-            file name
+            file name. If multiple frames are dumped, it is the directory of
+            the input files
+        frame_idx : int or list[int] or None, default=0
+            index of the frame to dump. If a list is given, an input file is
+            dumped for each listed frame. If None, all frames are dumped
+        nprocs : int, optional
+            number of processes to dump multiple frames
+        name_template : str, default={idx:06d}.gjf
+            template of the file name of each frame, formatted with the frame
+            index ``idx``
+        shard_size : int, optional
+            if given, the files are sharded into subdirectories, each containing
+            ``shard_size`` frames
         **kwargs : dict
             Other parameters to make input files. See :meth:`dpdata.gaussian.gjf.make_gaussian_input`
+
+        Returns
+        -------
+        list[str] or None
+            the file of each frame if multiple frames are dumped
         """
-        text = dpdata.gaussian.gjf.make_gaussian_input(data, **kwargs)
-        with open_file(file_name, "w") as fp:
-            fp.write(text)
+        if isinstance(frame_idx, (int, np.integer)):
+            text = dpdata.gaussian.gjf.make_gaussian_input(
+                sub_frames(data, [frame_idx]), **kwargs
+            )
+            with open_file(file_name, "w") as fp:
+                fp.write(text)
+            return None
+        if frame_idx is None:
+            frame_idx = range(len(data["coords"]))
+        file_names = frame_file_names(
+            file_name, frame_idx, name_template, shard_size=shard_size
+        )
+        dump_frames(
+            dpdata.gaussian.gjf.make_gaussian_inputs,
+            data,
+            frame_idx,
+            file_names,
+            nprocs=nprocs,
+            **kwargs,
+        )
+        return file_names
 
 
 @Driver.register("gaussian")
@@ -76,6 +173,8 @@ class GaussianDriver(Driver):
     ----------
     gaussian_exec : str, default=g16
         path to gaussian program
+    max_workers : int, default=1
+        maximum number of Gaussian processes running concurrently
     **kwargs : dict
         other arguments to make input files. See :meth:`dpdata.gaussian.gjf.make_gaussian_input`
 
@@ -88,13 +187,71 @@ class GaussianDriver(Driver):
     -1102.714590995794
     """
 
-    def __init__(self, gaussian_exec: str = "g16", **kwargs) -> None:
+    def __init__(
+        self, gaussian_exec: str = "g16", max_workers: int = 1, **kwargs
+    ) -> None:
         self.gaussian_exec = gaussian_exec
+        self.max_workers = max_workers
         self.kwargs = kwargs
 
+    def prepare_frame(self, ss, work_dir: str) -> list[str]:
+        """Write the input file of a frame.
+
+        Parameters
+        ----------
+        ss : dpdata.System
+            system with a single frame
+        work_dir : str
+            directory to run the frame, which is created
+
+        Returns
+        -------
+        list[str]
+            command to run Gaussian
+        """
+        os.makedirs(work_dir)
+        inp_fn = os.path.join(work_dir, "input.gjf")
+        ss.to("gaussian/gjf", inp_fn, **self.kwargs)
+        return [*self.gaussian_exec.split(), inp_fn]
+
+    def read_frame(self, work_dir: str, returncode: int):
+        """Read the labeled frame after Gaussian exits.
+
+        Parameters
+        ----------
+        work_dir : str
+            directory to run the frame
+        returncode : int
+            exit code of Gaussian
+
+        Returns
+        -------
+        dpdata.LabeledSystem
+            labeled frame
+
+        Raises
+        ------
+        RuntimeError
+            if Gaussian fails
+        """
+        out_fn = os.path.join(work_dir, "input.log")
+        if returncode != 0:
+            with open_file(out_fn) as f:
+                out = f.read()
+            raise RuntimeError("Run gaussian failed! Output:\n" + out)
+        return dpdata.LabeledSystem(out_fn, fmt="gaussian/log")
+
+    def _label_frame(self, ss, work_dir: str):
+        cmd = self.prepare_frame(ss, work_dir)
+        returncode = sp.run(cmd, stdout=sp.PIPE).returncode
+        return self.read_frame(work_dir, returncode)
+
     def label(self, data: dict) -> dict:
         """Label a system data. Returns new data with energy, forces, and virials.
 
+        The frames are run in their own directories by at most `max_workers`
+        concurrent processes, and the results keep the order of the frames.
+
         Parameters
         ----------
         data : dict
@@ -106,17 +263,8 @@ class GaussianDriver(Driver):
             labeled data with energies and forces
         """
         ori_system = dpdata.System(data=data)
-        labeled_system = dpdata.LabeledSystem()
         with tempfile.TemporaryDirectory() as d:
-            for ii, ss in enumerate(ori_system):
-                inp_fn = os.path.join(d, "%d.gjf" % ii)  # noqa: UP031
-                out_fn = os.path.join(d, "%d.log" % ii)  # noqa: UP031
-                ss.to("gaussian/gjf", inp_fn, **self.kwargs)
-                try:
-                    sp.check_output([*self.gaussian_exec.split(), inp_fn])
-                except sp.CalledProcessError as e:
-                    with open_file(out_fn) as f:
-                        out = f.read()
-                    raise RuntimeError("Run gaussian failed! Output:\n" + out) from e
-                labeled_system.append(dpdata.LabeledSystem(out_fn, fmt="gaussian/log"))
-        return labeled_system.data
+            work_dirs = [os.path.join(d, str(ii)) for ii in range(len(ori_system))]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                systems = list(executor.map(self._label_frame, ori_system, work_dirs))
+        return concat_systems(systems, cls=dpdata.LabeledSystem).data
@@ -47,11 +47,7 @@ class GromacsGroFormat(Format):
         """
         assert frame_idx < len(data["coords"])
         if frame_idx == -1:
-            strs = []
-            for idx in range(data["coords"].shape[0]):
-                gro_str = dpdata.gromacs.gro.from_system_data(data, f_idx=idx, **kwargs)
-                strs.append(gro_str)
-            gro_str = "\n".join(strs)
+            gro_str = dpdata.gromacs.gro.from_system_frames(data, **kwargs)
         else:
             gro_str = dpdata.gromacs.gro.from_system_data(
                 data, f_idx=frame_idx, **kwargs
@@ -18,30 +18,84 @@ force_convert = ForceConversion("hartree/bohr", "eV/angstrom").value()
 
 
 def match_indices(atype1, atype2):
-    # Ensure atype2 is a numpy array for efficient operations
-    atype2 = np.array(atype2)
-    # Placeholder for matched indices
-    matched_indices = []
-    # Track used indices to handle duplicates
-    used_indices = set()
-
-    # Iterate over each element in atype1
-    for element in atype1:
-        # Find all indices of the current element in atype2
-        # np.where returns a tuple, so [0] is used to access the array of indices
-        indices = np.where(atype2 == element)[0]
-
-        # Find the first unused index
-        for index in indices:
-            if index not in used_indices:
-                # Add the index to the results and mark it as used
-                matched_indices.append(index)
-                used_indices.add(index)
-                break  # Move to the next element in atype1
-
+    """Find the order of `atype2` that matches `atype1`.
+
+    The i-th atom of a type in `atype1` is matched to the i-th atom of
+    the same type in `atype2`. Both arrays should contain the same number
+    of atoms of each type.
+
+    Parameters
+    ----------
+    atype1 : np.ndarray
+        the reference atom types
+    atype2 : np.ndarray
+        the atom types to be reordered
+
+    Returns
+    -------
+    np.ndarray
+        indices such that ``atype2[indices]`` equals to `atype1`
+    """
+    atype1 = np.asarray(atype1)
+    atype2 = np.asarray(atype2)
+    matched_indices = np.empty(len(atype1), dtype=int)
+    # stable sorts keep the relative order of the atoms of the same type
+    matched_indices[np.argsort(atype1, kind="stable")] = np.argsort(
+        atype2, kind="stable"
+    )
     return matched_indices
 
 
+def _read_structures(file):
+    """Iterate over the structures of a n2p2 file.
+
+    Parameters
+    ----------
+    file : file object
+        the opened n2p2 file
+
+    Yields
+    ------
+    cell : np.ndarray
+        the cell in shape (3, 3)
+    coord : np.ndarray
+        the coordinates in shape (natoms, 3)
+    atype : np.ndarray
+        the element of each atom
+    force : np.ndarray
+        the forces in shape (natoms, 3)
+    energy : float
+        the energy
+    """
+    lattice_lines = None
+    for line in file:
+        line = line.strip()  # Remove leading/trailing whitespace
+        if line.lower() == "begin":
+            # Start a new section
+            lattice_lines = []
+            atom_lines = []
+            energy = None
+        elif line.lower() == "end":
+            # x y z element charge energy fx fy fz
+            atoms = np.array(" ".join(atom_lines).split()).reshape(len(atom_lines), -1)
+            yield (
+                np.array(" ".join(lattice_lines).split(), dtype=float).reshape(-1, 3),
+                atoms[:, 0:3].astype(float),
+                atoms[:, 3],
+                atoms[:, 6:9].astype(float),
+                float(energy),
+            )
+            lattice_lines = None  # Reset for the next section
+        elif lattice_lines is not None:
+            # If we are inside a section, collect the line by its keyword
+            if line.startswith("lattice"):
+                lattice_lines.append(line[7:])
+            elif line.startswith("atom"):
+                atom_lines.append(line[4:])
+            elif line.startswith("energy"):
+                energy = line.split()[1]
+
+
 @Format.register("n2p2")
 class N2P2Format(Format):
     """n2p2.
@@ -67,82 +121,46 @@ class N2P2Format(Format):
         """
         cells = []
         coords = []
-        atypes = []
         forces = []
         energies = []
-        natom0 = None
-        natoms0 = None
         atom_types0 = None
         with open_file(file_name) as file:
-            for line in file:
-                line = line.strip()  # Remove leading/trailing whitespace
-                if line.lower() == "begin":
-                    current_section = []  # Start a new section
-                    cell = []
-                    coord = []
-                    atype = []
-                    force = []
-                    energy = None
-                elif line.lower() == "end":
-                    # If we are at the end of a section, process the section
-                    assert len(coord) == len(atype) == len(force), (
-                        "Number of atoms, atom types, and forces must match."
+            for cell, coord, atype, force, energy in _read_structures(file):
+                assert len(coord) == len(atype) == len(force), (
+                    "Number of atoms, atom types, and forces must match."
+                )
+                if atom_types0 is None:
+                    atom_types0 = atype
+                    # the atom names are ordered by their first appearance
+                    unique_atypes, first_index, natoms = np.unique(
+                        atype, return_index=True, return_counts=True
                     )
-
+                    type_order = np.argsort(first_index)
+                    atom_names = unique_atypes[type_order].tolist()
+                    atom_numbs = natoms[type_order].tolist()
+                else:
                     # Check if the number of atoms is consistent across all frames
-                    natom = len(coord)
-                    if natom0 is None:
-                        natom0 = natom
-                    else:
-                        assert natom == natom0, (
-                            "The number of atoms in all frames must be the same."
-                        )
-
+                    assert len(atype) == len(atom_types0), (
+                        "The number of atoms in all frames must be the same."
+                    )
                     # Check if the number of atoms of each type is consistent across all frames
-                    atype = np.array(atype)
-                    unique_dict = {element: None for element in atype}
-                    unique_atypes = np.array(list(unique_dict.keys()))
-                    unique_atypes_list = list(unique_atypes)
-                    ntypes = len(unique_atypes)
-                    natoms = [len(atype[atype == at]) for at in unique_atypes]
-                    if natoms0 is None:
-                        natoms0 = natoms
-                    else:
-                        assert natoms == natoms0, (
-                            "The number of atoms of each type in all frames must be the same."
-                        )
-                    if atom_types0 is None:
-                        atom_types0 = atype
+                    assert [np.count_nonzero(atype == at) for at in atom_names] == (
+                        atom_numbs
+                    ), (
+                        "The number of atoms of each type in all frames must be the same."
+                    )
                     atom_order = match_indices(atom_types0, atype)
+                    coord = coord[atom_order]
+                    force = force[atom_order]
+
+                cells.append(cell)
+                coords.append(coord)
+                forces.append(force)
+                energies.append(energy)
 
-                    cell = np.array(cell, dtype=float)
-                    coord = np.array(coord, dtype=float)[atom_order]
-                    force = np.array(force, dtype=float)[atom_order]
-
-                    cells.append(cell)
-                    coords.append(coord)
-                    forces.append(force)
-                    energies.append(float(energy))
-
-                    current_section = None  # Reset for the next section
-                elif current_section is not None:
-                    # If we are inside a section, append the line to the current section
-                    # current_section.append(line)
-                    line_contents = line.split()
-                    if line_contents[0] == "lattice":
-                        cell.append(line_contents[1:])
-                    elif line_contents[0] == "atom":
-                        coord.append(line_contents[1:4])
-                        atype.append(line_contents[4])
-                        force.append(line_contents[7:10])
-                    elif line_contents[0] == "energy":
-                        energy = line_contents[1]
-
-        atom_names = unique_atypes_list
-        atom_numbs = natoms
         atom_types = np.zeros(len(atom_types0), dtype=int)
-        for i in range(ntypes):
-            atom_types[atom_types0 == unique_atypes_list[i]] = i
+        for i, name in enumerate(atom_names):
+            atom_types[atom_types0 == name] = i
 
         cells = np.array(cells) * length_convert
         coords = np.array(coords) * length_convert
@@ -177,27 +195,33 @@ class N2P2Format(Format):
         **kwargs : dict
             keyword arguments that will be passed from the method
         """
-        buff = []
         nframe = len(data["energies"])
-        natom = len(data["atom_types"])
         atom_names = data["atom_names"]
-        for frame in range(nframe):
-            coord = data["coords"][frame] / length_convert
-            force = data["forces"][frame] / force_convert
-            energy = data["energies"][frame] / energy_convert
-            cell = data["cells"][frame] / length_convert
-            atype = data["atom_types"]
-            buff.append("begin")
-            for i in range(3):
-                buff.append(
-                    f"lattice {cell[i][0]:15.6f}  {cell[i][1]:15.6f}  {cell[i][2]:15.6f}"
-                )
-            for i in range(natom):
-                buff.append(
-                    f"atom {coord[i][0]:15.6f} {coord[i][1]:15.6f} {coord[i][2]:15.6f} {atom_names[atype[i]]:>7} {0:15.6f} {0:15.6f} {force[i][0]:15.6e} {force[i][1]:15.6e} {force[i][2]:15.6e}"
-                )
-            buff.append(f"energy {energy:15.6f}")
-            buff.append(f"charge {0:15.6f}")
-            buff.append("end")
+        # the template of a frame is shared by all frames since the atom types
+        # do not change, so each frame is formatted by a single operation
+        frame_template = "\n".join(
+            [
+                "begin",
+                *["lattice %15.6f  %15.6f  %15.6f"] * 3,
+                *[
+                    f"atom %15.6f %15.6f %15.6f {atom_names[tt]:>7} {0:15.6f} {0:15.6f} %15.6e %15.6e %15.6e"
+                    for tt in data["atom_types"]
+                ],
+                "energy %15.6f",
+                f"charge {0:15.6f}",
+                "end",
+            ]
+        )
+        cells = data["cells"].reshape(nframe, 9) / length_convert
+        atoms = np.concatenate(
+            (data["coords"] / length_convert, data["forces"] / force_convert),
+            axis=2,
+        ).reshape(nframe, -1)
+        energies = data["energies"] / energy_convert
         with open_file(file_name, "w") as fp:
-            fp.write("\n".join(buff))
+            fp.write(
+                "\n".join(
+                    frame_template % (*cells[frame], *atoms[frame], energies[frame])
+                    for frame in range(nframe)
+                )
+            )
@@ -9,7 +9,7 @@ import dpdata.vasp.poscar
 import dpdata.vasp.xml
 from dpdata.data_type import Axis, DataType
 from dpdata.format import Format
-from dpdata.utils import open_file, uniq_atom_names
+from dpdata.utils import dump_frames, frame_file_names, open_file, uniq_atom_names
 
 if TYPE_CHECKING:
     from dpdata.utils import FileType
@@ -41,7 +41,7 @@ class VASPPoscarFormat(Format):
         register_move_data(data)
         return data
 
-    def to_system(self, data, file_name: FileType, frame_idx=0, **kwargs):
+    def to_system(self, data, file_name: FileType, frame_idx=0, nprocs=None, **kwargs):
         """Dump the system in vasp POSCAR format.
 
         Parameters
@@ -49,15 +49,31 @@ class VASPPoscarFormat(Format):
         data : dict
             The system data
         file_name : str
-            The output file name
-        frame_idx : int
-            The index of the frame to dump
+            The output file name. If multiple frames are dumped, it is the
+            directory where the frame ``ii`` is dumped to ``{file_name}/{ii:06d}/POSCAR``
+        frame_idx : int or list[int] or None
+            The index of the frame to dump. If a list is given, the listed
+            frames are dumped. If None, all frames are dumped
+        nprocs : int, optional
+            The number of processes to dump multiple frames
         **kwargs : dict
             other parameters
         """
-        w_str = VASPStringFormat().to_system(data, frame_idx=frame_idx)
-        with open_file(file_name, "w") as fp:
-            fp.write(w_str)
+        if isinstance(frame_idx, (int, np.integer)):
+            w_str = VASPStringFormat().to_system(data, frame_idx=frame_idx)
+            with open_file(file_name, "w") as fp:
+                fp.write(w_str)
+            return
+        if frame_idx is None:
+            frame_idx = range(len(data["coords"]))
+        file_names = frame_file_names(file_name, frame_idx, "{idx:06d}/POSCAR")
+        dump_frames(
+            dpdata.vasp.poscar.from_system_frames,
+            data,
+            frame_idx,
+            file_names,
+            nprocs=nprocs,
+        )
 
 
 @Format.register("vasp/string")
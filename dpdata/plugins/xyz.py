@@ -9,7 +9,7 @@ from dpdata.utils import open_file
 
 if TYPE_CHECKING:
     from dpdata.utils import FileType
-from dpdata.xyz.quip_gap_xyz import QuipGapxyzSystems
+from dpdata.xyz.quip_gap_xyz import QuipGapxyzSystems, format_frames
 from dpdata.xyz.xyz import coord_to_xyz, xyz_to_coord
 
 
@@ -50,9 +50,71 @@ class XYZFormat(Format):
 @Format.register("quip/gap/xyz")
 @Format.register("quip/gap/xyz_file")
 class QuipGapXYZFormat(Format):
+    """The extended XYZ format used by QUIP/GAP.
+
+    Examples
+    --------
+    Read frames in parallel and write them back:
+
+    >>> ms = dpdata.MultiSystems.from_file("a.xyz", fmt="quip/gap/xyz", nprocs=4)
+    >>> ms.to("quip/gap/xyz", "b.xyz")
+    """
+
     def from_labeled_system(self, data, **kwargs):
         return data
 
-    def from_multi_systems(self, file_name, **kwargs):
+    def from_multi_systems(self, file_name, nprocs=None, **kwargs):
+        """Read the extended XYZ file.
+
+        Parameters
+        ----------
+        file_name : str
+            file name
+        nprocs : int, optional
+            number of processes to parse the frames
+        **kwargs : dict
+            other parameters
+
+        Returns
+        -------
+        QuipGapxyzSystems
+            iterator of data dicts
+        """
         # here directory is the file_name
-        return QuipGapxyzSystems(file_name)
+        return QuipGapxyzSystems(file_name, nprocs=nprocs)
+
+    def to_labeled_system(self, data, file_name: FileType, **kwargs):
+        """Write all frames of the system in the extended XYZ format.
+
+        Parameters
+        ----------
+        data : dict
+            system data
+        file_name : str or file object
+            file name
+        **kwargs : dict
+            other parameters
+        """
+        with open_file(file_name, "w") as fp:
+            fp.write(format_frames(data))
+
+    def to_multi_systems(self, formulas, directory, **kwargs):
+        """Write all systems into the same file.
+
+        Parameters
+        ----------
+        formulas : list[str]
+            list of formulas
+        directory : str
+            the extended XYZ file
+        **kwargs : dict
+            other parameters
+
+        Yields
+        ------
+        file object
+            the opened file shared by all systems
+        """
+        with open_file(directory, "w") as fp:
+            for _ in formulas:
+                yield fp
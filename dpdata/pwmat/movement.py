@@ -21,16 +21,9 @@ def system_info(lines, type_idx_zero=False):
     atomic_number = []
     for idx, ii in enumerate(lines):
         if ("Position" in ii) and ("nonperiodic_Position" not in ii):
-            for kk in range(idx + 1, idx + 1 + natoms):
-                min = kk
-                for jj in range(kk + 1, idx + 1 + natoms):
-                    if int(lines[jj].split()[0]) < int(lines[min].split()[0]):
-                        min = jj
-                        lines[min], lines[kk] = lines[kk], lines[min]
-            for gg in range(idx + 1, idx + 1 + natoms):
-                tmpn = int(lines[gg].split()[0])
-                atomic_number.append(tmpn)
-    for ii in np.unique(sorted(atomic_number)):
+            atomic_number = np.sort(_parse_atom_block(lines, idx, natoms)[:, 0])
+            atomic_number = atomic_number.astype(int).tolist()
+    for ii in np.unique(atomic_number):
         atom_numbs.append(atomic_number.count(ii))
     atom_types = []
     for idx, ii in enumerate(atom_numbs):
@@ -39,11 +32,52 @@ def system_info(lines, type_idx_zero=False):
                 atom_types.append(idx)
             else:
                 atom_types.append(idx + 1)
-    for ii in np.unique(sorted(atomic_number)):
+    for ii in np.unique(atomic_number):
         atom_names.append(ELEMENTS[ii - 1])
     return atom_names, atom_numbs, np.array(atom_types, dtype=int), nelm
 
 
+def _parse_atom_block(lines, idx, ntot):
+    """Parse the per-atom table following the header at `lines[idx]`.
+
+    The rows are sorted by the atomic number in the first column with a
+    stable sort, so that the atoms of the same element keep their order.
+
+    Parameters
+    ----------
+    lines : list of str
+        lines of the block
+    idx : int
+        index of the header line of the table
+    ntot : int
+        number of atoms
+
+    Returns
+    -------
+    np.ndarray
+        the table in shape (ntot, ncols)
+    """
+    rows = lines[idx + 1 : idx + 1 + ntot]
+    table = np.array(" ".join(rows).split(), dtype=float).reshape(ntot, -1)
+    return table[np.argsort(table[:, 0], kind="stable")]
+
+
+def skip_movement_block(fp):
+    """Skip a block without storing its lines.
+
+    Returns
+    -------
+    bool
+        whether a (possibly incomplete) block is skipped
+    """
+    found = False
+    for ii in fp:
+        found = True
+        if "------------" in ii:
+            break
+    return found
+
+
 def get_movement_block(fp):
     blk = []
     for ii in fp:
@@ -89,8 +123,13 @@ def get_frames(fname, begin=0, step=1, convergence_check=True):
             if not is_converge:
                 rec_failed.append(cc + 1)
 
-        blk = get_movement_block(fp)
         cc += 1
+        # skip the frames that are not requested without parsing them
+        while cc < begin or (cc - begin) % step != 0:
+            if not skip_movement_block(fp):
+                break
+            cc += 1
+        blk = get_movement_block(fp)
 
     if len(rec_failed) > 0:
         prt = (
@@ -154,16 +193,7 @@ def analyze_block(lines, ntot, nelm):
                     tmp_l = lines[idx + 1 + dd]
                     cell.append([float(ss) for ss in tmp_l.split()[0:3]])
                     tmp_v.append([float(stress) for stress in tmp_l.split()[5:8]])
-                virial = np.zeros([3, 3])
-                virial[0][0] = tmp_v[0][0]
-                virial[0][1] = tmp_v[0][1]
-                virial[0][2] = tmp_v[0][2]
-                virial[1][0] = tmp_v[1][0]
-                virial[1][1] = tmp_v[1][1]
-                virial[1][2] = tmp_v[1][2]
-                virial[2][0] = tmp_v[2][0]
-                virial[2][1] = tmp_v[2][1]
-                virial[2][2] = tmp_v[2][2]
+                virial = np.array(tmp_v)
                 volume = np.linalg.det(np.array(cell))
                 virial = virial * 160.2 * 10.0 / volume
             else:
@@ -178,28 +208,10 @@ def analyze_block(lines, ntot, nelm):
         #                                 for ss in tmp_l.split()[0:3]])
         #                virial = np.zeros([3,3])
         elif ("Position" in ii) and ("nonperiodic_Position" not in ii):
-            for kk in range(idx + 1, idx + 1 + ntot):
-                min = kk
-                for jj in range(kk + 1, idx + 1 + ntot):
-                    if int(lines[jj].split()[0]) < int(lines[min].split()[0]):
-                        min = jj
-                        lines[min], lines[kk] = lines[kk], lines[min]
-            for gg in range(idx + 1, idx + 1 + ntot):
-                info = [float(jj) for jj in lines[gg].split()[1:4]]
-                info = np.matmul(np.array(info), np.array(cell))
-                coord.append(info)
+            coord = np.matmul(_parse_atom_block(lines, idx, ntot)[:, 1:4], cell)
         elif "Force" in ii:
-            for kk in range(idx + 1, idx + 1 + ntot):
-                min = kk
-                for jj in range(kk + 1, idx + 1 + ntot):
-                    if int(lines[jj].split()[0]) < int(lines[min].split()[0]):
-                        min = jj
-                        lines[min], lines[kk] = lines[kk], lines[min]
-            for gg in range(idx + 1, idx + 1 + ntot):
-                info = [
-                    -float(ss) for ss in lines[gg].split()
-                ]  # forces in MOVEMENT file are dE/dR, lacking a minus sign
-                force.append(info[1:4])
+            # forces in MOVEMENT file are dE/dR, lacking a minus sign
+            force = -_parse_atom_block(lines, idx, ntot)[:, 1:4]
     #        elif 'Atomic-Energy' in ii:
     #            for jj in range(idx+1, idx+1+ntot) :
     #                tmp_l = lines[jj]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from functools import lru_cache
+from functools import cached_property
 from typing import Any
 
 import numpy as np
@@ -41,6 +41,247 @@ def rmse(errors: np.ndarray) -> np.floating[Any]:
     return np.sqrt(np.mean(np.square(errors)))
 
 
+class ErrorAccumulator:
+    """Accumulate the statistics of errors incrementally.
+
+    Only the running sums are kept, so the errors can be added chunk by chunk
+    without keeping them in memory.
+
+    Parameters
+    ----------
+    bins : np.ndarray, optional
+        bin edges of the histogram of absolute errors. Absolute errors
+        below the first edge are counted in the first bin, and those beyond
+        the last edge are counted in the last bin, so that every error is
+        counted
+
+    Examples
+    --------
+    >>> acc = ErrorAccumulator()
+    >>> acc.update(np.array([1.0, -2.0]))
+    >>> acc.update(np.array([2.0]))
+    >>> print(acc.mae, acc.max_error)
+    1.6666666666666667 2.0
+    """
+
+    def __init__(self, bins: np.ndarray | None = None) -> None:
+        self.count = 0
+        self.abs_sum = 0.0
+        self.square_sum = 0.0
+        self.max_error = 0.0
+        if bins is None:
+            self.bins = None
+            self.hist = None
+        else:
+            self.bins = np.asarray(bins, dtype=float)
+            self.hist = np.zeros(len(self.bins) - 1, dtype=np.int64)
+
+    def update(self, errors: np.ndarray) -> None:
+        """Add errors.
+
+        Parameters
+        ----------
+        errors : np.ndarray
+            errors between two values, in any shape
+        """
+        errors = np.abs(np.asarray(errors, dtype=float)).ravel()
+        if errors.size == 0:
+            return
+        self.count += errors.size
+        self.abs_sum += float(np.sum(errors))
+        self.square_sum += float(np.dot(errors, errors))
+        self.max_error = max(self.max_error, float(np.max(errors)))
+        if self.hist is not None:
+            self.hist += np.histogram(
+                np.clip(errors, self.bins[0], self.bins[-1]), bins=self.bins
+            )[0]
+
+    def merge(self, other: ErrorAccumulator) -> None:
+        """Add the errors accumulated by another accumulator.
+
+        Parameters
+        ----------
+        other : ErrorAccumulator
+            the other accumulator, with the same bins
+        """
+        self.count += other.count
+        self.abs_sum += other.abs_sum
+        self.square_sum += other.square_sum
+        self.max_error = max(self.max_error, other.max_error)
+        if self.hist is not None:
+            self.hist += other.hist
+
+    @property
+    def mae(self) -> float:
+        """Mean absolute error (MAE)."""
+        return self.abs_sum / self.count if self.count else np.nan
+
+    @property
+    def rmse(self) -> float:
+        """Root mean squared error (RMSE)."""
+        return np.sqrt(self.square_sum / self.count) if self.count else np.nan
+
+
+class ErrorStats:
+    """Compute the statistics of errors between labeled systems incrementally.
+
+    Pairs of systems are added one by one, and the frames of each pair are
+    processed in chunks, so the errors of all frames are never kept in
+    memory. Besides the total statistics, the force errors are broken down
+    by elements, and all errors are broken down by formulas.
+
+    Parameters
+    ----------
+    bins : np.ndarray, optional
+        bin edges of the histograms of absolute errors. See
+        :class:`ErrorAccumulator`
+
+    Attributes
+    ----------
+    energy, force, virial : ErrorAccumulator
+        statistics of all energy, force, and virial errors
+    elements : dict[str, ErrorAccumulator]
+        statistics of the force errors of each element
+    formulas : dict[str, dict[str, ErrorAccumulator]]
+        statistics of the energy, force, and virial errors of each formula
+
+    Examples
+    --------
+    >>> stats = dpdata.stat.ErrorStats().update_multi(system_1, system_2)
+    >>> print("%.4f %.4f" % (stats.f_rmse, stats.elements["H"].rmse))
+    """
+
+    def __init__(self, bins: np.ndarray | None = None) -> None:
+        self.bins = bins
+        self.energy = ErrorAccumulator(bins)
+        self.force = ErrorAccumulator(bins)
+        self.virial = ErrorAccumulator(bins)
+        self.elements = {}
+        self.formulas = {}
+
+    def update(
+        self,
+        system_1: LabeledSystem,
+        system_2: LabeledSystem,
+        chunk_size: int | None = 1000,
+    ) -> ErrorStats:
+        """Add the errors between two labeled systems.
+
+        The atoms of the two systems should be in the same order.
+
+        Parameters
+        ----------
+        system_1 : LabeledSystem
+            system 1
+        system_2 : LabeledSystem
+            system 2
+        chunk_size : int, optional, default=1000
+            number of frames processed at a time. If None, all frames
+
+        Returns
+        -------
+        ErrorStats
+            this object
+        """
+        assert isinstance(system_1, LabeledSystem), "system_1 should be LabeledSystem"
+        assert isinstance(system_2, LabeledSystem), "system_2 should be LabeledSystem"
+        nframes = system_1.get_nframes()
+        if chunk_size is None:
+            chunk_size = max(nframes, 1)
+        formula = self.formulas.setdefault(
+            system_1.formula,
+            {
+                "energy": ErrorAccumulator(self.bins),
+                "force": ErrorAccumulator(self.bins),
+                "virial": ErrorAccumulator(self.bins),
+            },
+        )
+        atom_names = system_1["atom_names"]
+        atom_types = system_1["atom_types"]
+        elements = [
+            (
+                self.elements.setdefault(name, ErrorAccumulator(self.bins)),
+                atom_types == ii,
+            )
+            for ii, name in enumerate(atom_names)
+            if np.any(atom_types == ii)
+        ]
+        has_virial = "virials" in system_1.data and "virials" in system_2.data
+        for start in range(0, nframes, chunk_size):
+            sl = slice(start, start + chunk_size)
+            e_errors = system_1["energies"][sl] - system_2["energies"][sl]
+            self.energy.update(e_errors)
+            formula["energy"].update(e_errors)
+            f_errors = system_1["forces"][sl] - system_2["forces"][sl]
+            self.force.update(f_errors)
+            formula["force"].update(f_errors)
+            for acc, mask in elements:
+                acc.update(f_errors[:, mask])
+            if has_virial:
+                v_errors = system_1["virials"][sl] - system_2["virials"][sl]
+                self.virial.update(v_errors)
+                formula["virial"].update(v_errors)
+        return self
+
+    def update_multi(
+        self,
+        system_1: MultiSystems,
+        system_2: MultiSystems,
+        chunk_size: int | None = 1000,
+    ) -> ErrorStats:
+        """Add the errors between two MultiSystems.
+
+        Parameters
+        ----------
+        system_1 : MultiSystems
+            system 1
+        system_2 : MultiSystems
+            system 2, which has all systems in system 1
+        chunk_size : int, optional, default=1000
+            number of frames processed at a time. If None, all frames
+
+        Returns
+        -------
+        ErrorStats
+            this object
+        """
+        assert isinstance(system_1, MultiSystems), "system_1 should be MultiSystems"
+        assert isinstance(system_2, MultiSystems), "system_2 should be MultiSystems"
+        for nn in system_1.systems.keys():
+            self.update(system_1[nn], system_2[nn], chunk_size=chunk_size)
+        return self
+
+    @property
+    def e_mae(self) -> float:
+        """Energy MAE."""
+        return self.energy.mae
+
+    @property
+    def e_rmse(self) -> float:
+        """Energy RMSE."""
+        return self.energy.rmse
+
+    @property
+    def f_mae(self) -> float:
+        """Force MAE."""
+        return self.force.mae
+
+    @property
+    def f_rmse(self) -> float:
+        """Force RMSE."""
+        return self.force.rmse
+
+    @property
+    def v_mae(self) -> float:
+        """Virial MAE."""
+        return self.virial.mae
+
+    @property
+    def v_rmse(self) -> float:
+        """Virial RMSE."""
+        return self.virial.rmse
+
+
 class ErrorsBase(metaclass=ABCMeta):
     """Compute errors (deviations) between two systems. The type of system is assigned by SYSTEM_TYPE.
 
@@ -74,6 +315,11 @@ class ErrorsBase(metaclass=ABCMeta):
     def f_errors(self) -> np.ndarray:
         """Force errors."""
 
+    @property
+    @abstractmethod
+    def v_errors(self) -> np.ndarray:
+        """Virial errors."""
+
     @property
     def e_mae(self) -> np.floating[Any]:
         """Energy MAE."""
@@ -94,6 +340,16 @@ class ErrorsBase(metaclass=ABCMeta):
         """Force RMSE."""
         return rmse(self.f_errors)
 
+    @property
+    def v_mae(self) -> np.floating[Any]:
+        """Virial MAE."""
+        return mae(self.v_errors)
+
+    @property
+    def v_rmse(self) -> np.floating[Any]:
+        """Virial RMSE."""
+        return rmse(self.v_errors)
+
 
 class Errors(ErrorsBase):
     """Compute errors (deviations) between two LabeledSystems.
@@ -115,26 +371,34 @@ class Errors(ErrorsBase):
 
     SYSTEM_TYPE = LabeledSystem
 
-    @property
-    @lru_cache
+    @cached_property
     def e_errors(self) -> np.ndarray:
         """Energy errors."""
         assert isinstance(self.system_1, self.SYSTEM_TYPE)
         assert isinstance(self.system_2, self.SYSTEM_TYPE)
         return self.system_1["energies"] - self.system_2["energies"]
 
-    @property
-    @lru_cache
+    @cached_property
     def f_errors(self) -> np.ndarray:
         """Force errors."""
         assert isinstance(self.system_1, self.SYSTEM_TYPE)
         assert isinstance(self.system_2, self.SYSTEM_TYPE)
         return (self.system_1["forces"] - self.system_2["forces"]).ravel()
 
+    @cached_property
+    def v_errors(self) -> np.ndarray:
+        """Virial errors."""
+        assert isinstance(self.system_1, self.SYSTEM_TYPE)
+        assert isinstance(self.system_2, self.SYSTEM_TYPE)
+        return (self.system_1["virials"] - self.system_2["virials"]).ravel()
+
 
 class MultiErrors(ErrorsBase):
     """Compute errors (deviations) between two MultiSystems.
 
+    The MAE and RMSE are computed by :class:`ErrorStats` system by system,
+    without concatenating the errors of all systems.
+
     Parameters
     ----------
     system_1 : object
@@ -152,28 +416,103 @@ class MultiErrors(ErrorsBase):
 
     SYSTEM_TYPE = MultiSystems
 
-    @property
-    @lru_cache
-    def e_errors(self) -> np.ndarray:
-        """Energy errors."""
-        assert isinstance(self.system_1, self.SYSTEM_TYPE)
-        assert isinstance(self.system_2, self.SYSTEM_TYPE)
+    @cached_property
+    def stats(self) -> ErrorStats:
+        """Statistics of the errors."""
+        return ErrorStats().update_multi(self.system_1, self.system_2)
+
+    def _errors(self, key: str) -> np.ndarray:
         errors = []
         for nn in self.system_1.systems.keys():
             ss1 = self.system_1[nn]
             ss2 = self.system_2[nn]
-            errors.append(Errors(ss1, ss2).e_errors.ravel())
+            errors.append(getattr(Errors(ss1, ss2), key).ravel())
         return np.concatenate(errors)
 
     @property
-    @lru_cache
+    def e_errors(self) -> np.ndarray:
+        """Energy errors."""
+        return self._errors("e_errors")
+
+    @property
     def f_errors(self) -> np.ndarray:
         """Force errors."""
-        assert isinstance(self.system_1, self.SYSTEM_TYPE)
-        assert isinstance(self.system_2, self.SYSTEM_TYPE)
-        errors = []
-        for nn in self.system_1.systems.keys():
-            ss1 = self.system_1[nn]
-            ss2 = self.system_2[nn]
-            errors.append(Errors(ss1, ss2).f_errors.ravel())
-        return np.concatenate(errors)
+        return self._errors("f_errors")
+
+    @property
+    def v_errors(self) -> np.ndarray:
+        """Virial errors."""
+        return self._errors("v_errors")
+
+    @property
+    def e_mae(self) -> float:
+        """Energy MAE."""
+        return self.stats.e_mae
+
+    @property
+    def e_rmse(self) -> float:
+        """Energy RMSE."""
+        return self.stats.e_rmse
+
+    @property
+    def f_mae(self) -> float:
+        """Force MAE."""
+        return self.stats.f_mae
+
+    @property
+    def f_rmse(self) -> float:
+        """Force RMSE."""
+        return self.stats.f_rmse
+
+    @property
+    def v_mae(self) -> float:
+        """Virial MAE."""
+        return self.stats.v_mae
+
+    @property
+    def v_rmse(self) -> float:
+        """Virial RMSE."""
+        return self.stats.v_rmse
+
+
+def model_devi(
+    energies: np.ndarray,
+    forces: np.ndarray,
+    virials: np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    """Compute the deviations of the predictions of several models.
+
+    The deviation of a quantity is the standard deviation among the models.
+    The energy and virial deviations are normalized by the number of atoms.
+
+    Parameters
+    ----------
+    energies : np.ndarray
+        energies predicted by each model, in shape (nmodels, nframes)
+    forces : np.ndarray
+        forces predicted by each model, in shape (nmodels, nframes, natoms, 3)
+    virials : np.ndarray, optional
+        virials predicted by each model, in shape (nmodels, nframes, 3, 3)
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        the deviations of each frame: `devi_e`, `max_devi_f`, `min_devi_f`,
+        `avg_devi_f`, and `devi_f` of each atom in shape (nframes, natoms).
+        If virials are given, also `max_devi_v`, `min_devi_v`, and `avg_devi_v`.
+    """
+    natoms = forces.shape[2]
+    devi = {}
+    devi["devi_e"] = np.std(energies, axis=0) / natoms
+    # norm of the standard deviation vector of the force on each atom
+    devi_f = np.sqrt(np.sum(np.var(forces, axis=0), axis=-1))
+    devi["devi_f"] = devi_f
+    devi["max_devi_f"] = np.max(devi_f, axis=-1)
+    devi["min_devi_f"] = np.min(devi_f, axis=-1)
+    devi["avg_devi_f"] = np.mean(devi_f, axis=-1)
+    if virials is not None:
+        devi_v = np.std(virials, axis=0).reshape(virials.shape[1], 9) / natoms
+        devi["max_devi_v"] = np.max(devi_v, axis=-1)
+        devi["min_devi_v"] = np.min(devi_v, axis=-1)
+        devi["avg_devi_v"] = np.mean(devi_v, axis=-1)
+    return devi
@@ -1,10 +1,15 @@
 # %%
 from __future__ import annotations
 
+import asyncio
 import glob
 import hashlib
+import json
+import logging
 import numbers
 import os
+import shutil
+import time
 import warnings
 from copy import deepcopy
 from typing import (
@@ -23,22 +28,30 @@ import dpdata.md.pbc
 # ensure all plugins are loaded!
 import dpdata.plugins
 import dpdata.plugins.deepmd
-from dpdata.amber.mask import load_param_file, pick_by_amber_mask
+from dpdata.amber.mask import (
+    load_param_file,
+    pick_by_amber_mask,
+    pick_by_amber_mask_frames,
+)
 from dpdata.data_type import Axis, DataError, DataType, get_data_types
-from dpdata.driver import Driver, Minimizer
+from dpdata.driver import AsyncDriver, Driver, Minimizer, driver_fingerprint
 from dpdata.format import Format
 from dpdata.plugin import Plugin
 from dpdata.utils import (
     add_atom_names,
+    concat_systems,
     elements_index_map,
     remove_pbc,
     sort_atom_names,
+    sub_frames,
     utf8len,
 )
 
 if TYPE_CHECKING:
     import parmed
 
+logger = logging.getLogger(__name__)
+
 
 def load_format(fmt):
     fmt = fmt.lower()
@@ -932,7 +945,14 @@ class System:
         return idx
 
     def predict(
-        self, *args: Any, driver: str | Driver = "dp", **kwargs: Any
+        self,
+        *args: Any,
+        driver: str | Driver = "dp",
+        chunk_size: int | None = None,
+        checkpoint_dir: str | None = None,
+        checkpoint_fmt: str = "deepmd/npy",
+        fingerprint: str | None = None,
+        **kwargs: Any,
     ) -> LabeledSystem:
         """Predict energies and forces by a driver.
 
@@ -942,6 +962,20 @@ class System:
             Arguments passing to the driver
         driver : str, default=dp
             The assigned driver. For compatibility, default is dp
+        chunk_size : int, optional
+            label the frames in chunks of `chunk_size` frames. By default,
+            all frames are labeled at once. The throughput of each chunk is
+            logged by the `dpdata.system` logger at the INFO level
+        checkpoint_dir : str, optional
+            the directory to save each labeled chunk, with a manifest
+            `manifest.json` recording the finished chunks and the throughput.
+            The chunks finished in a previous run by the same driver are
+            loaded instead of labeled again
+        checkpoint_fmt : {"deepmd/npy", "deepmd/hdf5"}, default=deepmd/npy
+            the format to save the chunks
+        fingerprint : str, optional
+            identifies the driver and its settings in the checkpoints. By
+            default, it is made by :func:`dpdata.driver.driver_fingerprint`
         **kwargs : dict
             Other arguments passing to the driver
 
@@ -955,12 +989,273 @@ class System:
         The default driver is DP:
 
         >>> labeled_sys = ori_sys.predict("frozen_model_compressed.pb")
+
+        Label the frames by Gaussian in chunks of 100 frames, which can be
+        resumed after the job is interrupted:
+
+        >>> labeled_sys = ori_sys.predict(
+        ...     keywords="force B3LYP/6-31G*",
+        ...     driver="gaussian",
+        ...     chunk_size=100,
+        ...     checkpoint_dir="checkpoint",
+        ... )
         """
         if not isinstance(driver, Driver):
             driver = Driver.get_driver(driver)(*args, **kwargs)
-        data = driver.label(self.data.copy())
+        if chunk_size is None and checkpoint_dir is None:
+            data = driver.label(self.data.copy())
+            return LabeledSystem(data=data)
+        if checkpoint_dir is not None and fingerprint is None:
+            fingerprint = driver_fingerprint(driver)
+        return self._predict_chunks(
+            driver, chunk_size, checkpoint_dir, checkpoint_fmt, fingerprint
+        )
+
+    async def apredict(
+        self, *args: Any, driver: str | Driver = "dp", **kwargs: Any
+    ) -> LabeledSystem:
+        """Predict energies and forces by a driver asynchronously.
+
+        An :class:`AsyncDriver` labels the frames in the running event loop.
+        Other drivers run in a thread, so that the event loop is not blocked.
+
+        Parameters
+        ----------
+        *args : iterable
+            Arguments passing to the driver
+        driver : str, default=dp
+            The assigned driver. For compatibility, default is dp
+        **kwargs : dict
+            Other arguments passing to the driver
+
+        Returns
+        -------
+        labeled_sys : LabeledSystem
+            A new labeled system.
+
+        Examples
+        --------
+        Run the sqm jobs of two systems concurrently, at most 100 at a time:
+
+        >>> driver = AsyncSubprocessDriver({"type": "sqm", "theory": "DFTB3"}, max_jobs=100)
+        >>> async def main():
+        ...     return await asyncio.gather(
+        ...         sys1.apredict(driver=driver), sys2.apredict(driver=driver)
+        ...     )
+        >>> labeled_sys1, labeled_sys2 = asyncio.run(main())
+        """
+        if not isinstance(driver, Driver):
+            driver = Driver.get_driver(driver)(*args, **kwargs)
+        if isinstance(driver, AsyncDriver):
+            data = await driver.alabel(self.data.copy())
+        else:
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, driver.label, self.data.copy())
         return LabeledSystem(data=data)
 
+    def _predict_chunks(
+        self,
+        driver: Driver,
+        chunk_size: int | None,
+        checkpoint_dir: str | None,
+        checkpoint_fmt: str,
+        fingerprint: str | None = None,
+    ) -> LabeledSystem:
+        """Label the frames chunk by chunk, optionally with checkpoints.
+
+        A chunk is named by the short name of the system and its frames. It
+        is reused only if the manifest records it with the same format, the
+        same driver fingerprint, and the same hash of the fingerprint, its
+        atoms, coordinates, and cells.
+        """
+        nframes = self.get_nframes()
+        if chunk_size is None:
+            chunk_size = nframes
+        if chunk_size <= 0:
+            raise ValueError("chunk_size should be positive")
+        if checkpoint_fmt not in ("deepmd/npy", "deepmd/hdf5"):
+            raise ValueError("checkpoint_fmt should be deepmd/npy or deepmd/hdf5")
+        suffix = ".hdf5" if checkpoint_fmt == "deepmd/hdf5" else ""
+        manifest_file = None
+        manifest = {"chunks": {}}
+        if checkpoint_dir is not None:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            manifest_file = os.path.join(checkpoint_dir, "manifest.json")
+            if os.path.isfile(manifest_file):
+                with open(manifest_file) as f:
+                    manifest = json.load(f)
+
+        chunks = []
+        for start in range(0, nframes, chunk_size):
+            stop = min(start + chunk_size, nframes)
+            data = sub_frames(self.data, slice(start, stop))
+            name = f"{self.short_name}.{start:08d}-{stop:08d}"
+            if checkpoint_dir is None:
+                chunks.append(self._label_chunk(driver, data, name)[0])
+                continue
+            path = os.path.join(checkpoint_dir, name + suffix)
+            digest = hashlib.sha256()
+            digest.update(fingerprint.encode())
+            digest.update(json.dumps(data["atom_names"]).encode())
+            for key in ("atom_types", "coords", "cells"):
+                digest.update(np.ascontiguousarray(data[key]).tobytes())
+            record = manifest["chunks"].get(name)
+            if (
+                record is not None
+                and record["fmt"] == checkpoint_fmt
+                and record.get("driver") == fingerprint
+                and record["hash"] == digest.hexdigest()
+                and os.path.exists(path)
+            ):
+                chunks.append(
+                    LabeledSystem(
+                        path, fmt=checkpoint_fmt, type_map=self.data["atom_names"]
+                    )
+                )
+                continue
+            chunk, elapsed = self._label_chunk(driver, data, name)
+            # write to a temporary path first, so that an interrupted write
+            # is never taken as a finished chunk
+            tmp_path = path + ".tmp" + suffix
+            for pp in (path, tmp_path):
+                if os.path.isdir(pp):
+                    shutil.rmtree(pp)
+                elif os.path.exists(pp):
+                    os.remove(pp)
+            chunk.to(checkpoint_fmt, tmp_path)
+            os.replace(tmp_path, path)
+            manifest["chunks"][name] = {
+                "fmt": checkpoint_fmt,
+                "driver": fingerprint,
+                "hash": digest.hexdigest(),
+                "nframes": stop - start,
+                "seconds": elapsed,
+                "frames_per_second": (stop - start) / elapsed if elapsed else None,
+            }
+            with open(manifest_file + ".tmp", "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(manifest_file + ".tmp", manifest_file)
+            chunks.append(chunk)
+        if not chunks:
+            return LabeledSystem(data=driver.label(self.data.copy()))
+        return concat_systems(chunks, cls=LabeledSystem)
+
+    @staticmethod
+    def _label_chunk(
+        driver: Driver, data: dict, name: str
+    ) -> tuple[LabeledSystem, float]:
+        """Label a chunk and log its throughput.
+
+        Returns
+        -------
+        LabeledSystem
+            the labeled chunk
+        float
+            the seconds to label the chunk
+        """
+        nframes = len(data["coords"])
+        t0 = time.perf_counter()
+        chunk = LabeledSystem(data=driver.label(data))
+        elapsed = time.perf_counter() - t0
+        logger.info(
+            "labeled chunk %s: %d frames in %.3f s (%.3f frames/s)",
+            name,
+            nframes,
+            elapsed,
+            nframes / elapsed if elapsed else float("inf"),
+        )
+        return chunk, elapsed
+
+    def model_devi(
+        self,
+        drivers: list[str | dict | Driver],
+        batch_size: int | None = None,
+        f_trust_lo: float | None = None,
+        f_trust_hi: float | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Compute the model deviation among the predictions of several drivers.
+
+        The frames are passed through all drivers batch by batch, and only
+        the deviations are kept.
+
+        Parameters
+        ----------
+        drivers : list[str or dict or Driver]
+            the drivers, e.g. models trained with different random seeds.
+            For a dict, it should contain `type` as the name of the driver,
+            and others are arguments of the driver.
+        batch_size : int, optional
+            number of frames in a batch. By default, all frames are in one batch.
+        f_trust_lo : float, optional
+            lower trust level of the max force deviation
+        f_trust_hi : float, optional
+            higher trust level of the max force deviation
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            deviations of each frame. See :func:`dpdata.stat.model_devi` for
+            the keys. If any trust level is given, the frames are classified by
+            their max force deviation into the masks `accurate` (below
+            f_trust_lo), `failed` (not below f_trust_hi), and `candidate`
+            (others).
+
+        Examples
+        --------
+        >>> devi = system.model_devi(
+        ...     [{"type": "dp", "dp": f"graph.{ii:03d}.pb"} for ii in range(4)],
+        ...     f_trust_lo=0.05,
+        ...     f_trust_hi=0.15,
+        ... )
+        >>> candidates = system.sub_system(np.flatnonzero(devi["candidate"]))
+        """
+        from dpdata.stat import model_devi
+
+        drivers_ = []
+        for driver in drivers:
+            if isinstance(driver, Driver):
+                drivers_.append(driver)
+            elif isinstance(driver, str):
+                drivers_.append(Driver.get_driver(driver)())
+            elif isinstance(driver, dict):
+                driver = driver.copy()
+                driver_type = driver.pop("type")
+                drivers_.append(Driver.get_driver(driver_type)(**driver))
+            else:
+                raise TypeError("driver should be Driver, str or dict")
+
+        nframes = self.get_nframes()
+        if batch_size is None:
+            batch_size = nframes
+        batch_size = max(batch_size, 1)
+        devi: dict[str, np.ndarray] = {}
+        for start in range(0, nframes, batch_size):
+            batch = np.arange(start, min(start + batch_size, nframes))
+            data = sub_frames(self.data, batch)
+            labels = [driver.label(data.copy()) for driver in drivers_]
+            has_virials = all("virials" in lb for lb in labels)
+            batch_devi = model_devi(
+                np.array([lb["energies"] for lb in labels]),
+                np.array([lb["forces"] for lb in labels]),
+                np.array([lb["virials"] for lb in labels]) if has_virials else None,
+            )
+            if not devi:
+                devi = {
+                    kk: np.empty((nframes, *vv.shape[1:]), dtype=vv.dtype)
+                    for kk, vv in batch_devi.items()
+                }
+            for kk in devi:
+                devi[kk][batch] = batch_devi[kk]
+
+        if f_trust_lo is not None or f_trust_hi is not None:
+            max_devi_f = devi["max_devi_f"]
+            lo = -np.inf if f_trust_lo is None else f_trust_lo
+            hi = np.inf if f_trust_hi is None else f_trust_hi
+            devi["accurate"] = max_devi_f < lo
+            devi["failed"] = max_devi_f >= hi
+            devi["candidate"] = ~devi["accurate"] & ~devi["failed"]
+        return devi
+
     def minimize(
         self, *args: Any, minimizer: str | Minimizer, **kwargs: Any
     ) -> LabeledSystem:
@@ -1061,6 +1356,7 @@ class System:
         maskstr: str,
         pass_coords: bool = False,
         nopbc: bool | None = None,
+        nprocs: int | None = None,
     ):
         """Pick atoms by amber mask.
 
@@ -1077,14 +1373,27 @@ class System:
             LabeledSystem.
         nopbc : Boolen (default: None)
             If nopbc is True or False, set nopbc
+        nprocs : int, optional
+            If pass_coords is true, the number of processes to evaluate the
+            mask of each frame.
         """
         parm = load_param_file(param)
         if pass_coords:
+            seles = pick_by_amber_mask_frames(
+                parm, maskstr, self["coords"], nprocs=nprocs
+            )
+            # consecutive frames with the same selection are picked at once,
+            # which keeps the order of frames in each formula
             ms = MultiSystems()
-            for sub_s in self:
-                # TODO: this can computed in pararrel
-                idx = pick_by_amber_mask(parm, maskstr, sub_s["coords"][0])
-                ms.append(sub_s.pick_atom_idx(idx, nopbc=nopbc))
+            start = 0
+            for ii in range(1, len(seles) + 1):
+                if ii == len(seles) or seles[ii] != seles[start]:
+                    ms.append(
+                        self.sub_system(list(range(start, ii))).pick_atom_idx(
+                            list(seles[start]), nopbc=nopbc
+                        )
+                    )
+                    start = ii
             return ms
         else:
             idx = pick_by_amber_mask(parm, maskstr)
@@ -1547,7 +1856,14 @@ class MultiSystems:
         system.sort_atom_names(type_map=self.atom_names)
 
     def predict(
-        self, *args: Any, driver: str | Driver = "dp", **kwargs: Any
+        self,
+        *args: Any,
+        driver: str | Driver = "dp",
+        chunk_size: int | None = None,
+        checkpoint_dir: str | None = None,
+        checkpoint_fmt: str = "deepmd/npy",
+        fingerprint: str | None = None,
+        **kwargs: Any,
     ) -> MultiSystems:
         """Predict energies and forces by a driver.
 
@@ -1557,6 +1873,16 @@ class MultiSystems:
             Arguments passing to the driver
         driver : str, default=dp
             The assigned driver. For compatibility, default is dp
+        chunk_size : int, optional
+            label the frames of each system in chunks of `chunk_size` frames
+        checkpoint_dir : str, optional
+            the directory to save each labeled chunk. All systems share the
+            directory and its manifest. See :meth:`System.predict`
+        checkpoint_fmt : {"deepmd/npy", "deepmd/hdf5"}, default=deepmd/npy
+            the format to save the chunks
+        fingerprint : str, optional
+            identifies the driver and its settings in the checkpoints. See
+            :meth:`System.predict`
         **kwargs : dict
             Other arguments passing to the driver
 
@@ -1567,9 +1893,53 @@ class MultiSystems:
         """
         if not isinstance(driver, Driver):
             driver = Driver.get_driver(driver)(*args, **kwargs)
+        if checkpoint_dir is not None and fingerprint is None:
+            # before the driver changes its state by labeling
+            fingerprint = driver_fingerprint(driver)
         new_multisystems = dpdata.MultiSystems(type_map=self.atom_names)
         for ss in self:
-            new_multisystems.append(ss.predict(*args, driver=driver, **kwargs))
+            new_multisystems.append(
+                ss.predict(
+                    *args,
+                    driver=driver,
+                    chunk_size=chunk_size,
+                    checkpoint_dir=checkpoint_dir,
+                    checkpoint_fmt=checkpoint_fmt,
+                    fingerprint=fingerprint,
+                    **kwargs,
+                )
+            )
+        return new_multisystems
+
+    async def apredict(
+        self, *args: Any, driver: str | Driver = "dp", **kwargs: Any
+    ) -> MultiSystems:
+        """Predict energies and forces by a driver asynchronously.
+
+        All systems are labeled concurrently. See :meth:`System.apredict`.
+
+        Parameters
+        ----------
+        *args : iterable
+            Arguments passing to the driver
+        driver : str, default=dp
+            The assigned driver. For compatibility, default is dp
+        **kwargs : dict
+            Other arguments passing to the driver
+
+        Returns
+        -------
+        MultiSystems
+            A new labeled MultiSystems.
+        """
+        if not isinstance(driver, Driver):
+            driver = Driver.get_driver(driver)(*args, **kwargs)
+        labeled_systems = await asyncio.gather(
+            *[ss.apredict(driver=driver) for ss in self]
+        )
+        new_multisystems = dpdata.MultiSystems(type_map=self.atom_names)
+        for ss in labeled_systems:
+            new_multisystems.append(ss)
         return new_multisystems
 
     def minimize(
@@ -168,3 +168,173 @@ def open_file(file: FileType, *args, **kwargs) -> Generator[io.IOBase, None, Non
             yield f
     else:
         raise ValueError("file must be a file object or a file path.")
+
+
+def sub_frames(data: dict, f_idx) -> dict:
+    """Select frames from the system data.
+
+    The data whose shape has the frame axis is sliced, and other data is kept.
+
+    Parameters
+    ----------
+    data : dict
+        system data
+    f_idx : list[int] or np.ndarray
+        indexes of the frames
+
+    Returns
+    -------
+    dict
+        system data of the selected frames
+    """
+    from dpdata.data_type import Axis
+    from dpdata.system import LabeledSystem, System
+
+    dtypes = {tt.name: tt for tt in (*System.DTYPES, *LabeledSystem.DTYPES)}
+    sub_data = {}
+    for name, value in data.items():
+        tt = dtypes.get(name)
+        if tt is not None and tt.shape is not None and Axis.NFRAMES in tt.shape:
+            index = [slice(None)] * np.ndim(value)
+            index[tt.shape.index(Axis.NFRAMES)] = f_idx
+            sub_data[name] = np.asarray(value)[tuple(index)]
+        else:
+            sub_data[name] = value
+    return sub_data
+
+
+def frame_file_names(
+    directory: str, frame_idx, name_template: str, shard_size: int | None = None
+) -> list[str]:
+    """Get the file names to dump frames into a directory.
+
+    The parent directories of the files are created.
+
+    Parameters
+    ----------
+    directory : str
+        the top-level directory
+    frame_idx : list[int]
+        indexes of the frames
+    name_template : str
+        template of the file name of a frame relative to the directory,
+        formatted with the frame index ``idx``, e.g. ``{idx:06d}.gjf``
+    shard_size : int, optional
+        if given, the files are sharded into subdirectories ``{shard:04d}``,
+        each containing ``shard_size`` consecutive frames
+
+    Returns
+    -------
+    list[str]
+        the file name of each frame
+    """
+    file_names = []
+    for idx in frame_idx:
+        file_name = name_template.format(idx=idx)
+        if shard_size is not None:
+            file_name = os.path.join(f"{idx // shard_size:04d}", file_name)
+        file_name = os.path.join(directory, file_name)
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        file_names.append(file_name)
+    return file_names
+
+
+def _write_frames(make_texts, data, file_names, kwargs):
+    for file_name, text in zip(file_names, make_texts(data, **kwargs)):
+        with open(file_name, "w") as fp:
+            fp.write(text)
+
+
+def dump_frames(
+    make_texts, data: dict, frame_idx, file_names: list[str], nprocs=None, **kwargs
+):
+    """Dump each frame into its own file, optionally in parallel.
+
+    Parameters
+    ----------
+    make_texts : callable
+        ``make_texts(data, **kwargs)`` returns the text of each frame in the
+        data. It must be a module-level function if ``nprocs`` is given
+    data : dict
+        system data
+    frame_idx : list[int]
+        indexes of the frames to dump
+    file_names : list[str]
+        the file of each frame
+    nprocs : int, optional
+        number of processes. Each process only receives the frames it dumps
+    **kwargs : dict
+        other parameters passed to ``make_texts``
+    """
+    frame_idx = np.asarray(frame_idx, dtype=int)
+    if nprocs is None or nprocs <= 1 or len(frame_idx) <= 1:
+        _write_frames(make_texts, sub_frames(data, frame_idx), file_names, kwargs)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # several chunks per process to balance the load
+    chunks = np.array_split(np.arange(len(frame_idx)), min(len(frame_idx), nprocs * 4))
+    with ProcessPoolExecutor(max_workers=nprocs) as executor:
+        futures = [
+            executor.submit(
+                _write_frames,
+                make_texts,
+                sub_frames(data, frame_idx[chunk]),
+                [file_names[ii] for ii in chunk],
+                kwargs,
+            )
+            for chunk in chunks
+        ]
+        for future in futures:
+            future.result()
+
+
+def concat_systems(systems, cls=None):
+    """Concatenate the frames of systems by a single concatenation.
+
+    The systems without frames, e.g. non-converged ones, are skipped. If the
+    atoms of the systems are not in the same order, the systems are appended
+    one by one instead.
+
+    Parameters
+    ----------
+    systems : list[System]
+        the systems to concatenate
+    cls : type, optional
+        the class of the returned system. By default, the class of the first
+        system
+
+    Returns
+    -------
+    System
+        the concatenated system
+    """
+    from dpdata.data_type import Axis
+
+    if cls is None:
+        cls = type(systems[0])
+    ret = cls()
+    systems = [ss for ss in systems if len(ss.data["atom_numbs"])]
+    if not systems:
+        return ret
+    first = systems[0]
+    same_atoms = all(
+        ss.data["atom_names"] == first.data["atom_names"]
+        and np.array_equal(ss.data["atom_types"], first.data["atom_types"])
+        and ss.data.keys() == first.data.keys()
+        for ss in systems[1:]
+    )
+    if not same_atoms:
+        for ss in systems:
+            ret.append(ss)
+        return ret
+    ret.data = first.data.copy()
+    for tt in ret.DTYPES:
+        if tt.name in ret.data and tt.shape is not None and Axis.NFRAMES in tt.shape:
+            ret.data[tt.name] = np.concatenate(
+                [ss.data[tt.name] for ss in systems],
+                axis=tt.shape.index(Axis.NFRAMES),
+            )
+    ret.data["nopbc"] = all(ss.nopbc for ss in systems)
+    return ret
@@ -5,57 +5,45 @@ import numpy as np
 
 
 def _to_system_data_lower(lines, cartesian=True, selective_dynamics=False):
-    def move_flag_mapper(flag):
-        if flag == "T":
-            return True
-        elif flag == "F":
-            return False
-        else:
-            raise RuntimeError(f"Invalid move flag: {flag}")
-
     """Treat as cartesian poscar."""
     system = {}
     system["atom_names"] = [str(ii) for ii in lines[5].split()]
     system["atom_numbs"] = [int(ii) for ii in lines[6].split()]
     scale = float(lines[1])
-    cell = []
-    move_flags = []
-    for ii in range(2, 5):
-        boxv = [float(jj) for jj in lines[ii].split()]
-        boxv = np.array(boxv) * scale
-        cell.append(boxv)
-    system["cells"] = [np.array(cell)]
+    cell = np.array(" ".join(lines[2:5]).split(), dtype=float).reshape(3, 3) * scale
+    system["cells"] = cell.reshape(1, 3, 3)
     natoms = sum(system["atom_numbs"])
-    coord = []
-    for ii in range(8, 8 + natoms):
-        tmp = lines[ii].split()
-        tmpv = [float(jj) for jj in tmp[:3]]
-        if cartesian:
-            tmpv = np.array(tmpv) * scale
-        else:
-            tmpv = np.matmul(np.array(tmpv), system["cells"][0])
-        coord.append(tmpv)
-        if selective_dynamics:
-            if len(tmp) == 6:
-                move_flags.append(list(map(move_flag_mapper, tmp[3:])))
-            else:
+    coord_lines = lines[8 : 8 + natoms]
+    ncols = 6 if selective_dynamics else 3
+    tokens = " ".join(coord_lines).split()
+    if len(tokens) == natoms * ncols:
+        block = np.array(tokens).reshape(natoms, ncols)
+    else:
+        # some lines have extra columns, e.g. the site labels
+        rows = [line.split() for line in coord_lines]
+        for tmp in rows:
+            if selective_dynamics and len(tmp) != 6:
                 raise RuntimeError(
                     f"Invalid move flags, should be 6 columns, got {tmp}"
                 )
+        block = np.array([tmp[:ncols] for tmp in rows])
+    coord = block[:, :3].astype(float)
+    if cartesian:
+        coord *= scale
+    else:
+        coord = np.matmul(coord, cell)
 
-    system["coords"] = [np.array(coord)]
+    system["coords"] = coord.reshape(1, natoms, 3)
     system["orig"] = np.zeros(3)
-    atom_types = []
-    for idx, ii in enumerate(system["atom_numbs"]):
-        for jj in range(ii):
-            atom_types.append(idx)
-    system["atom_types"] = np.array(atom_types, dtype=int)
-    system["cells"] = np.array(system["cells"])
-    system["coords"] = np.array(system["coords"])
-    if move_flags:
-        move_flags = np.array(move_flags, dtype=bool)
-        move_flags = move_flags.reshape((1, natoms, 3))
-        system["move"] = np.array(move_flags, dtype=bool)
+    system["atom_types"] = np.repeat(
+        np.arange(len(system["atom_numbs"])), system["atom_numbs"]
+    ).astype(int)
+    if selective_dynamics:
+        flags = block[:, 3:6]
+        invalid = ~np.isin(flags, ["T", "F"])
+        if invalid.any():
+            raise RuntimeError(f"Invalid move flag: {flags[invalid][0]}")
+        system["move"] = (flags == "T").reshape((1, natoms, 3))
     return system
 
 
@@ -82,10 +70,7 @@ def from_system_data(system, f_idx=0, skip_zeros=True):
         ret += "%s%d " % (name, ii)  # noqa: UP031
     ret += "\n"
     ret += "1.0\n"
-    for ii in system["cells"][f_idx]:
-        for jj in ii:
-            ret += f"{jj:.16e} "
-        ret += "\n"
+    ret += "%.16e %.16e %.16e \n" * 3 % tuple(system["cells"][f_idx].ravel())
     for idx, ii in enumerate(system["atom_names"]):
         if system["atom_numbs"][idx] == 0:
             continue
@@ -97,7 +82,8 @@ def from_system_data(system, f_idx=0, skip_zeros=True):
         ret += "%d " % ii  # noqa: UP031
     ret += "\n"
     move = system.get("move", None)
-    if move is not None and len(move) > 0:
+    has_move = move is not None and len(move) > 0
+    if has_move:
         ret += "Selective Dynamics\n"
 
     # should use Cartesian for VESTA software
@@ -107,28 +93,37 @@ def from_system_data(system, f_idx=0, skip_zeros=True):
     # atype_idx = [[idx,tt] for idx,tt in enumerate(atype)]
     # sort_idx = np.argsort(atype, kind = 'mergesort')
     sort_idx = np.lexsort((np.arange(len(atype)), atype))
-    atype = atype[sort_idx]
     posis = posis[sort_idx]
-    if move is not None and len(move) > 0:
-        move = move[f_idx][sort_idx]
 
-    if isinstance(move, np.ndarray):
-        move = move.tolist()
+    # all the lines are formatted by a single operation
+    line_fmt = "%15.10f %15.10f %15.10f"
+    if has_move:
+        move = np.asarray(move[f_idx])[sort_idx]
+        if move.ndim != 2 or move.shape[1] != 3:
+            raise RuntimeError(
+                f"Invalid move flags: {move.tolist()}, should be a list of 3 bools"
+            )
+        flags = np.where(move.astype(bool), "T", "F")
+        template = "".join(
+            f"{line_fmt} {ff[0]} {ff[1]} {ff[2]}\n" for ff in flags.tolist()
+        )
+    else:
+        template = (line_fmt + "\n") * len(posis)
+    ret += template % tuple(posis.ravel())
+    return ret
+
 
-    posi_list = []
-    for idx in range(len(posis)):
-        ii_posi = posis[idx]
-        line = f"{ii_posi[0]:15.10f} {ii_posi[1]:15.10f} {ii_posi[2]:15.10f}"
-        if move is not None and len(move) > 0:
-            move_flags = move[idx]
-            if not isinstance(move_flags, list) or len(move_flags) != 3:
-                raise RuntimeError(
-                    f"Invalid move flags: {move_flags}, should be a list of 3 bools"
-                )
-            line += " " + " ".join("T" if flag else "F" for flag in move_flags)
+def from_system_frames(system):
+    """Format all frames of a system in the POSCAR format.
 
-        posi_list.append(line)
+    Parameters
+    ----------
+    system : dict
+        system data
 
-    posi_list.append("")
-    ret += "\n".join(posi_list)
-    return ret
+    Returns
+    -------
+    list[str]
+        the POSCAR of each frame
+    """
+    return [from_system_data(system, ii) for ii in range(len(system["coords"]))]
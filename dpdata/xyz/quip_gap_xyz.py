@@ -3,44 +3,74 @@
 from __future__ import annotations
 
 import re
-from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 import numpy as np
 
+field_value_pattern = re.compile(
+    r"(?P<key>\S+)=(?P<quote>[\'\"]?)(?P<value>.*?)(?P=quote)\s+"
+)
+prop_pattern = re.compile(r"(?P<key>\w+?):(?P<datatype>[a-zA-Z]):(?P<value>\d+)")
+atom_num_pattern = re.compile(rb"^\s*(\d+)\s*")
+
+# the properties that can be read and their required datatypes
+prop_datatypes = {
+    "species": "S",
+    "pos": "R",
+    "Z": "I",
+    "force": "R",
+}
+
 
 class QuipGapxyzSystems:
-    """deal with QuipGapxyzFile."""
+    """deal with QuipGapxyzFile.
+
+    The offsets of all frames are indexed in one pass over the file, and then
+    the frames are parsed, optionally in parallel. Consecutive frames sharing
+    the same atoms are merged into one data dict.
 
-    def __init__(self, file_name):
-        self.file_object = open(file_name)
+    Parameters
+    ----------
+    file_name : str
+        the extended xyz file
+    nprocs : int, optional
+        number of processes to parse the frames
+    """
+
+    def __init__(self, file_name, nprocs=None):
+        self.file_name = file_name
+        self.nprocs = nprocs
+        self.frame_offsets = index_frames(file_name)
         self.block_generator = self.get_block_generator()
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        return self.handle_single_xyz_frame(next(self.block_generator))
-
-    def __del__(self):
-        self.file_object.close()
+        return next(self.block_generator)
 
     def get_block_generator(self):
-        p3 = re.compile(r"^\s*(\d+)\s*")
-        while True:
-            line = self.file_object.readline()
-            if not line:
-                break
-            if p3.match(line):
-                atom_num = int(p3.match(line).group(1))
-                lines = []
-                lines.append(line)
-                for ii in range(atom_num + 1):
-                    lines.append(self.file_object.readline())
-                if not lines[-1]:
-                    raise RuntimeError(
-                        f"this xyz file may lack of lines, should be {atom_num + 2};lines:{lines}"
-                    )
-                yield lines
+        offsets = self.frame_offsets
+        if self.nprocs is None or self.nprocs <= 1 or len(offsets) <= 1:
+            yield from merge_frames(iter_frames(self.file_name, offsets))
+            return
+        # several chunks per process to balance the load
+        nchunks = min(len(offsets), self.nprocs * 4)
+        chunks = np.array_split(np.arange(len(offsets)), nchunks)
+        with ProcessPoolExecutor(max_workers=self.nprocs) as executor:
+            # the frames are merged chunk by chunk as the chunks finish, so
+            # that a parsed chunk is released once it is merged
+            frames = (
+                ff
+                for frames_chunk in executor.map(
+                    read_frames,
+                    [self.file_name] * nchunks,
+                    [[offsets[ii] for ii in chunk] for chunk in chunks],
+                )
+                for ff in frames_chunk
+            )
+            yield from merge_frames(frames)
 
     @staticmethod
     def handle_single_xyz_frame(lines):
@@ -49,137 +79,258 @@ class QuipGapxyzSystems:
             raise RuntimeError(
                 f"format error, atom_num=={atom_num}, {len(lines)}!=atom_num+2"
             )
-        data_format_line = lines[1].strip("\n").strip() + " "
-        field_value_pattern = re.compile(
-            r"(?P<key>\S+)=(?P<quote>[\'\"]?)(?P<value>.*?)(?P=quote)\s+"
-        )
-        prop_pattern = re.compile(
-            r"(?P<key>\w+?):(?P<datatype>[a-zA-Z]):(?P<value>\d+)"
-        )
+        field_dict = parse_field_line(lines[1])
+        columns = parse_properties(field_dict["Properties"])
 
-        data_format_list = [
-            kv_dict.groupdict()
-            for kv_dict in field_value_pattern.finditer(data_format_line)
-        ]
-        field_dict = {}
-        for item in data_format_list:
-            field_dict[item["key"]] = item["value"]
-
-        Properties = field_dict["Properties"]
-        prop_list = [
-            kv_dict.groupdict() for kv_dict in prop_pattern.finditer(Properties)
-        ]
-
-        data_lines = []
-        for line in lines[2:]:
-            data_lines.append(list(filter(bool, line.strip().split())))
-        data_array = np.array(data_lines)
-        used_colomn = 0
-
-        type_array = None
-        coords_array = None
-        Z_array = None
-        force_array = None
-        virials = None
-        for kv_dict in prop_list:
-            if kv_dict["key"] == "species":
-                if kv_dict["datatype"] != "S":
-                    raise RuntimeError(
-                        "datatype for species must be 'S' instead of {}".format(
-                            kv_dict["datatype"]
-                        )
-                    )
-                field_length = int(kv_dict["value"])
-                type_array = data_array[
-                    :, used_colomn : used_colomn + field_length
-                ].flatten()
-                used_colomn += field_length
-                continue
-            elif kv_dict["key"] == "pos":
-                if kv_dict["datatype"] != "R":
-                    raise RuntimeError(
-                        "datatype for pos must be 'R' instead of {}".format(
-                            kv_dict["datatype"]
-                        )
-                    )
-                field_length = int(kv_dict["value"])
-                coords_array = data_array[:, used_colomn : used_colomn + field_length]
-                used_colomn += field_length
-                continue
-            elif kv_dict["key"] == "Z":
-                if kv_dict["datatype"] != "I":
-                    raise RuntimeError(
-                        "datatype for pos must be 'R' instead of {}".format(
-                            kv_dict["datatype"]
-                        )
-                    )
-                field_length = int(kv_dict["value"])
-                Z_array = data_array[
-                    :, used_colomn : used_colomn + field_length
-                ].flatten()
-                used_colomn += field_length
-                continue
-            elif kv_dict["key"] == "force":
-                if kv_dict["datatype"] != "R":
-                    raise RuntimeError(
-                        "datatype for pos must be 'R' instead of {}".format(
-                            kv_dict["datatype"]
-                        )
-                    )
-                field_length = int(kv_dict["value"])
-                force_array = data_array[:, used_colomn : used_colomn + field_length]
-                used_colomn += field_length
-                continue
-            else:
-                raise RuntimeError("unknown field {}".format(kv_dict["key"]))
-
-        type_num_dict = OrderedDict()
-        atom_type_list = []
-        type_map = {}
-        temp_atom_max_index = 0
-        if type_array is None:
+        ncols = columns[-1][1] + columns[-1][2]
+        data_array = np.array("".join(lines[2:]).split()).reshape(atom_num, -1)
+        if data_array.shape[1] < ncols:
+            raise RuntimeError(
+                f"format error, {data_array.shape[1]} columns are given, but {ncols} are required by Properties"
+            )
+        arrays = {key: data_array[:, ii : ii + nn] for key, ii, nn in columns}
+        if "species" not in arrays:
             raise RuntimeError("type_array can't be None type, check .xyz file")
-        for ii in type_array:
-            if ii not in type_map:
-                type_map[ii] = temp_atom_max_index
-                temp_atom_max_index += 1
-                temp_atom_index = type_map[ii]
-                atom_type_list.append(temp_atom_index)
-                type_num_dict[ii] = 1
-            else:
-                temp_atom_index = type_map[ii]
-                atom_type_list.append(temp_atom_index)
-                type_num_dict[ii] += 1
-        type_num_list = []
-        for atom_type, atom_num in type_num_dict.items():
-            type_num_list.append((atom_type, atom_num))
-        type_num_array = np.array(type_num_list)
-        if field_dict.get("virial", None):
-            virials = np.array(
-                [
-                    np.array(
-                        list(filter(bool, field_dict["virial"].split(" ")))
-                    ).reshape(3, 3)
-                ]
-            ).astype(np.float64)
-        else:
-            virials = None
+        type_array = arrays["species"].ravel()
+
+        # the atom names are ordered by their first appearance
+        unique_types, first_index, atom_types, atom_numbs = np.unique(
+            type_array, return_index=True, return_inverse=True, return_counts=True
+        )
+        type_order = np.argsort(first_index)
+        type_rank = np.empty_like(type_order)
+        type_rank[type_order] = np.arange(len(type_order))
 
         info_dict = {}
-        info_dict["atom_names"] = list(type_num_array[:, 0])
-        info_dict["atom_numbs"] = list(type_num_array[:, 1].astype(int))
-        info_dict["atom_types"] = np.array(atom_type_list).astype(int)
+        info_dict["atom_names"] = unique_types[type_order].tolist()
+        info_dict["atom_numbs"] = atom_numbs[type_order].tolist()
+        info_dict["atom_types"] = type_rank[atom_types.ravel()].astype(int)
         info_dict["cells"] = np.array(
-            [
-                np.array(list(filter(bool, field_dict["Lattice"].split(" ")))).reshape(
-                    3, 3
-                )
-            ]
-        ).astype(np.float64)
-        info_dict["coords"] = np.array([coords_array]).astype(np.float64)
+            field_dict["Lattice"].split(), dtype=np.float64
+        ).reshape(1, 3, 3)
+        info_dict["coords"] = arrays["pos"].astype(np.float64).reshape(1, atom_num, 3)
         info_dict["energies"] = np.array([field_dict["energy"]]).astype(np.float64)
-        info_dict["forces"] = np.array([force_array]).astype(np.float64)
-        if virials is not None:
-            info_dict["virials"] = virials
+        info_dict["forces"] = arrays["force"].astype(np.float64).reshape(1, atom_num, 3)
+        if field_dict.get("virial", None):
+            info_dict["virials"] = np.array(
+                field_dict["virial"].split(), dtype=np.float64
+            ).reshape(1, 3, 3)
         info_dict["orig"] = np.zeros(3)
         return info_dict
+
+
+def parse_field_line(line):
+    """Parse the key=value pairs in the comment line of a frame.
+
+    Parameters
+    ----------
+    line : str
+        the comment (second) line of a frame
+
+    Returns
+    -------
+    dict
+        the value of each key
+    """
+    data_format_line = line.strip("\n").strip() + " "
+    return {
+        kv_dict.group("key"): kv_dict.group("value")
+        for kv_dict in field_value_pattern.finditer(data_format_line)
+    }
+
+
+@lru_cache(maxsize=None)
+def parse_properties(properties):
+    """Parse the Properties schema, which is cached for each distinct schema.
+
+    Parameters
+    ----------
+    properties : str
+        the value of Properties, e.g. species:S:1:pos:R:3
+
+    Returns
+    -------
+    tuple
+        the key, the first column, and the number of columns of each property
+
+    Raises
+    ------
+    RuntimeError
+        if the property is unknown or its datatype is wrong
+    """
+    columns = []
+    used_colomn = 0
+    for kv_dict in prop_pattern.finditer(properties):
+        key = kv_dict["key"]
+        if key not in prop_datatypes:
+            raise RuntimeError(f"unknown field {key}")
+        if kv_dict["datatype"] != prop_datatypes[key]:
+            raise RuntimeError(
+                "datatype for {} must be '{}' instead of {}".format(
+                    key, prop_datatypes[key], kv_dict["datatype"]
+                )
+            )
+        field_length = int(kv_dict["value"])
+        columns.append((key, used_colomn, field_length))
+        used_colomn += field_length
+    return tuple(columns)
+
+
+def index_frames(file_name):
+    """Find the offset of each frame in one pass, without parsing the atoms.
+
+    Parameters
+    ----------
+    file_name : str
+        the extended xyz file
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        the offset in bytes and the number of atoms of each frame
+
+    Raises
+    ------
+    RuntimeError
+        if the last frame is incomplete
+    """
+    offsets = []
+    with open(file_name, "rb") as fp:
+        while True:
+            offset = fp.tell()
+            line = fp.readline()
+            if not line:
+                break
+            match = atom_num_pattern.match(line)
+            if match:
+                atom_num = int(match.group(1))
+                for _ in range(atom_num + 1):
+                    line = fp.readline()
+                if not line:
+                    raise RuntimeError(
+                        f"this xyz file may lack of lines, should be {atom_num + 2}"
+                    )
+                offsets.append((offset, atom_num))
+    return offsets
+
+
+def iter_frames(file_name, offsets):
+    """Iterate over the frames at the given offsets.
+
+    Parameters
+    ----------
+    file_name : str
+        the extended xyz file
+    offsets : list[tuple[int, int]]
+        the offset in bytes and the number of atoms of each frame
+
+    Yields
+    ------
+    dict
+        data dict of each frame
+    """
+    with open(file_name, "rb") as fp:
+        for offset, atom_num in offsets:
+            fp.seek(offset)
+            lines = [fp.readline().decode() for _ in range(atom_num + 2)]
+            yield QuipGapxyzSystems.handle_single_xyz_frame(lines)
+
+
+def read_frames(file_name, offsets):
+    """Read the frames at the given offsets, used by the worker processes.
+
+    Parameters
+    ----------
+    file_name : str
+        the extended xyz file
+    offsets : list[tuple[int, int]]
+        the offset in bytes and the number of atoms of each frame
+
+    Returns
+    -------
+    list[dict]
+        data dict of each frame
+    """
+    return list(iter_frames(file_name, offsets))
+
+
+def merge_frames(frames):
+    """Merge consecutive frames sharing the same atoms into one data dict.
+
+    Parameters
+    ----------
+    frames : Iterable[dict]
+        data dict of each frame
+
+    Yields
+    ------
+    dict
+        data dict of consecutive frames
+    """
+
+    def concat(group):
+        if len(group) == 1:
+            return group[0]
+        merged = group[0].copy()
+        for key in ("cells", "coords", "energies", "forces", "virials"):
+            if key in merged:
+                merged[key] = np.concatenate([ff[key] for ff in group])
+        return merged
+
+    group = []
+    for ff in frames:
+        if group and not (
+            ff["atom_names"] == group[0]["atom_names"]
+            and np.array_equal(ff["atom_types"], group[0]["atom_types"])
+            and ("virials" in ff) == ("virials" in group[0])
+        ):
+            yield concat(group)
+            group = []
+        group.append(ff)
+    if group:
+        yield concat(group)
+
+
+def format_frames(data):
+    """Format a labeled system as frames of the extended xyz format.
+
+    The template of a frame is shared by all frames, so each frame is
+    formatted by a single operation.
+
+    Parameters
+    ----------
+    data : dict
+        system data
+
+    Returns
+    -------
+    str
+        the extended xyz frames
+    """
+    nframes = data["coords"].shape[0]
+    species = np.array(data["atom_names"])[data["atom_types"]]
+    has_virial = "virials" in data
+    header = "energy=%.12g"
+    if has_virial:
+        header += ' virial="' + " ".join(["%.12g"] * 9) + '"'
+    header += (
+        ' Lattice="'
+        + " ".join(["%.12g"] * 9)
+        + '" Properties=species:S:1:pos:R:3:force:R:3'
+    )
+    frame_template = "\n".join(
+        [
+            str(len(species)),
+            header,
+            *[f"{ss} %16.8f %16.8f %16.8f %16.8f %16.8f %16.8f" for ss in species],
+        ]
+    )
+    values = [data["energies"].reshape(nframes, 1)]
+    if has_virial:
+        values.append(data["virials"].reshape(nframes, 9))
+    values.append(data["cells"].reshape(nframes, 9))
+    values.append(
+        np.concatenate((data["coords"], data["forces"]), axis=2).reshape(nframes, -1)
+    )
+    values = np.concatenate(values, axis=1)
+    return "".join(frame_template % tuple(vv) + "\n" for vv in values)
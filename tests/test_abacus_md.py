@@ -6,6 +6,7 @@ import unittest
 import numpy as np
 from context import dpdata
 
+from dpdata.abacus.scf import kbar2evperang3
 from dpdata.unit import LengthConversion
 
 bohr2ang = LengthConversion("bohr", "angstrom").value()
@@ -250,5 +251,52 @@ class TestABACUSMD(unittest.TestCase):
                 self.assertEqual(iline, 30)
 
 
+class TestABACUSMDUnconverged(unittest.TestCase):
+    """The unconverged step of abacus.md.unconv is dropped from all labels."""
+
+    def setUp(self):
+        path = "abacus.md.unconv/OUT.ABACUS"
+        with open(os.path.join(path, "MD_dump")) as fp:
+            blocks = fp.read().split("MDSTEP")[1:]
+        celldm, cells, virials, atoms = [], [], [], []
+        for block in blocks:
+            lines = block.strip().split("\n")
+            celldm.append(float(lines[1].split()[1]) * bohr2ang)
+            cells.append([ll.split() for ll in lines[3:6]])
+            virials.append([ll.split() for ll in lines[7:10]])
+            atoms.append([ll.split()[2:8] for ll in lines[11:14]])
+        celldm = np.array(celldm)[:, None, None]
+        atoms = np.array(atoms, dtype=float)
+        self.cells = np.array(cells, dtype=float) * celldm
+        self.coords = atoms[:, :, 0:3] * celldm
+        self.forces = atoms[:, :, 3:6]
+        self.virials = (
+            np.array(virials, dtype=float)
+            * kbar2evperang3
+            * np.linalg.det(self.cells)[:, None, None]
+        )
+        energies = []
+        with open(os.path.join(path, "running_md.log")) as fp:
+            for line in fp:
+                if "final etot is" in line:
+                    energies.append(float(line.split()[-2]))
+                elif "convergence has not been achieved" in line:
+                    energies.append(np.nan)
+        self.energies = np.array(energies)
+
+    def test_unconverged_frame(self):
+        unconv = np.flatnonzero(np.isnan(self.energies))
+        self.assertEqual(unconv.tolist(), [4])
+        with self.assertWarnsRegex(UserWarning, r"Structure 4 +are unconverged"):
+            system = dpdata.LabeledSystem("abacus.md.unconv", fmt="abacus/md")
+        kept = np.delete(np.arange(len(self.energies)), unconv)
+        self.assertEqual(system.get_nframes(), len(kept))
+        np.testing.assert_allclose(system["energies"], self.energies[kept])
+        np.testing.assert_allclose(system["cells"], self.cells[kept])
+        np.testing.assert_allclose(system["coords"], self.coords[kept])
+        np.testing.assert_allclose(system["forces"], self.forces[kept])
+        np.testing.assert_allclose(system["virials"], self.virials[kept])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -30,6 +30,21 @@ class TestAmberMD(unittest.TestCase, CompLabeledSys, IsPBC):
             shutil.rmtree("tmp.deepmd.npy")
 
 
+class TestAmberMDBeginStep(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.system_1 = dpdata.LabeledSystem("amber/02_Heat", fmt="amber/md")[1:4:2]
+        self.system_2 = dpdata.LabeledSystem(
+            "amber/02_Heat", fmt="amber/md", begin=1, end=4, step=2
+        )
+        self.places = 5
+        self.e_places = 4
+        self.f_places = 6
+        self.v_places = 6
+
+    def test_nframes(self):
+        self.assertEqual(len(self.system_2), 2)
+
+
 @unittest.skipIf(
     skip_parmed_related_test, "skip parmed related test. install parmed to fix"
 )
@@ -81,3 +81,28 @@ class TestAmberSqmIn(unittest.TestCase):
     def tearDown(self):
         if os.path.isfile("amber/sqm_test.in"):
             os.remove("amber/sqm_test.in")
+
+
+class TestAmberSqmInFrames(unittest.TestCase):
+    def setUp(self):
+        self.system = dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar")
+
+    def tearDown(self):
+        shutil.rmtree("tmp.sqm.in", ignore_errors=True)
+
+    def test_sqm_in_frames(self):
+        file_names = self.system.to(
+            "sqm/in", "tmp.sqm.in", frame_idx=[0, 2], nprocs=2, charge=1
+        )
+        self.assertEqual(
+            file_names,
+            [
+                os.path.join("tmp.sqm.in", "000000.in"),
+                os.path.join("tmp.sqm.in", "000002.in"),
+            ],
+        )
+        for ii, file_name in zip([0, 2], file_names):
+            with open(file_name) as f:
+                self.assertEqual(
+                    f.read(), self.system.to("sqm/in", frame_idx=ii, charge=1)
+                )
@@ -91,5 +91,31 @@ class TestASEtraj4Labeled(unittest.TestCase, CompLabeledSys, IsPBC):
         self.v_places = 4
 
 
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestASEtrajBeginStep(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.system_1 = dpdata.LabeledSystem("ase_traj/MoS2", fmt="deepmd")[1::2]
+        self.system_2 = dpdata.LabeledSystem(
+            "ase_traj/MoS2.traj", fmt="ase/traj", begin=1, step=2
+        )
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestASEStructureList(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.system_1 = dpdata.LabeledSystem("ase_traj/MoS2", fmt="deepmd")
+        self.system_2 = dpdata.LabeledSystem(
+            self.system_1.to_ase_structure(), fmt="ase/structure"
+        )
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+
 if __name__ == "__main__":
     unittest.main()
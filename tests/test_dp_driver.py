@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from context import dpdata
+
+
+class FakeDeepPot:
+    """Stand-in of deepmd.infer.DeepPot, which records the evaluated batches.
+
+    The energy and forces depend on the atom types, so that a wrong type
+    mapping is detected.
+    """
+
+    def __init__(self, model_file=None, auto_batch_size=True):
+        self.batches = []
+
+    def get_type_map(self):
+        return ["H", "C", "O"]
+
+    def eval(self, coords, cells, atype):
+        nframes = coords.shape[0]
+        self.batches.append(nframes)
+        weights = np.asarray(atype, dtype=float) + 1.0
+        forces = coords.reshape(nframes, -1, 3) * weights[None, :, None]
+        energies = forces.sum(axis=(1, 2)).reshape(nframes, 1)
+        if cells is None:
+            virials = np.zeros((nframes, 9))
+        else:
+            virials = cells.reshape(nframes, 9) * 2.0
+        return energies, forces.reshape(nframes, -1), virials
+
+
+class FakeDeepPotNoAutoBatch(FakeDeepPot):
+    """Stand-in of DeepPot before deepmd-kit v2.0.2, without auto batch size."""
+
+    def __init__(self, model_file=None):
+        super().__init__(model_file)
+
+
+class TestDPDriver(unittest.TestCase):
+    def setUp(self):
+        self.system = dpdata.System(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        # the types in the order of the model, which differs from the system
+        weights = np.where(np.array(self.system["atom_types"]) == 0, 3.0, 1.0)
+        coords = self.system["coords"]
+        self.forces = coords * weights[None, :, None]
+        self.energies = self.forces.sum(axis=(1, 2))
+        self.virials = self.system["cells"] * 2.0
+
+    def patch_deepmd(self, deep_pot):
+        deepmd = types.ModuleType("deepmd")
+        infer = types.ModuleType("deepmd.infer")
+        infer.DeepPot = deep_pot
+        deepmd.infer = infer
+        patcher = patch.dict(sys.modules, {"deepmd": deepmd, "deepmd.infer": infer})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def check(self, labeled):
+        np.testing.assert_allclose(labeled["energies"], self.energies)
+        np.testing.assert_allclose(labeled["forces"], self.forces)
+        np.testing.assert_allclose(labeled["virials"], self.virials)
+
+    def test_batch_size(self):
+        self.patch_deepmd(FakeDeepPot)
+        for batch_size, batches in ((None, [3]), (2, [2, 1]), (1, [1, 1, 1])):
+            with self.subTest(batch_size=batch_size):
+                dp = FakeDeepPot()
+                labeled = self.system.predict(dp, batch_size=batch_size, driver="dp")
+                self.assertEqual(dp.batches, batches)
+                self.check(labeled)
+
+    def test_no_auto_batch_size(self):
+        self.patch_deepmd(FakeDeepPotNoAutoBatch)
+        dp = FakeDeepPotNoAutoBatch()
+        labeled = self.system.predict(dp, driver="dp")
+        self.assertEqual(dp.batches, [1, 1, 1])
+        self.check(labeled)
+
+    def test_model_file(self):
+        self.patch_deepmd(FakeDeepPot)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model_file = os.path.join(tmpdir, "model.pb")
+            with open(model_file, "wb") as f:
+                f.write(b"model 1")
+            driver_1 = dpdata.driver.Driver.get_driver("dp")(model_file)
+            with open(model_file, "wb") as f:
+                f.write(b"model 2")
+            driver_2 = dpdata.driver.Driver.get_driver("dp")(model_file)
+        self.assertNotEqual(
+            dpdata.driver.driver_fingerprint(driver_1),
+            dpdata.driver.driver_fingerprint(driver_2),
+        )
+        self.check(self.system.predict(driver=driver_1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -58,5 +58,57 @@ class TestFhi_aims_Output(unittest.TestCase, TestFhi_aims_MD):
         self.system = dpdata.LabeledSystem("fhi_aims/out_md", fmt="fhi_aims/md")
 
 
+class TestFhi_aims_VariableCell(unittest.TestCase):
+    def setUp(self):
+        # out_md with the lattice vectors printed with the atoms of each step
+        self.system = dpdata.LabeledSystem(
+            "fhi_aims/out_md_variable_cell", fmt="fhi_aims/md"
+        )
+
+    def test_cell(self):
+        ref_cell = np.loadtxt("fhi_aims/ref_cell_md.txt").reshape(-1, 3, 3)
+        scales = np.array([1.0, 1.01, 1.02])
+        np.testing.assert_allclose(
+            self.system["cells"], ref_cell * scales[:, None, None], atol=1e-6
+        )
+
+    def test_coord(self):
+        ref_coord = np.loadtxt("fhi_aims/ref_coord_md.txt").reshape(-1, 3, 3)
+        np.testing.assert_allclose(self.system["coords"], ref_coord)
+
+    def test_energy(self):
+        ref_energy = np.loadtxt("fhi_aims/ref_energy_md.txt")
+        np.testing.assert_allclose(self.system["energies"], ref_energy)
+
+
+class TestFhi_aims_BeginStep(unittest.TestCase):
+    def setUp(self):
+        self.ref_cell = np.loadtxt("fhi_aims/ref_cell_md.txt").reshape(-1, 3, 3)
+        self.ref_coord = np.loadtxt("fhi_aims/ref_coord_md.txt").reshape(-1, 3, 3)
+        self.ref_energy = np.loadtxt("fhi_aims/ref_energy_md.txt")
+        self.ref_force = np.loadtxt("fhi_aims/ref_force_md.txt").reshape(-1, 3, 3)
+
+    def check(self, system, idx):
+        self.assertEqual(system.get_nframes(), len(idx))
+        np.testing.assert_allclose(system["cells"], self.ref_cell[idx])
+        np.testing.assert_allclose(system["coords"], self.ref_coord[idx])
+        np.testing.assert_allclose(system["energies"], self.ref_energy[idx])
+        np.testing.assert_allclose(system["forces"], self.ref_force[idx])
+
+    def test_begin(self):
+        system = dpdata.LabeledSystem("fhi_aims/out_md", fmt="fhi_aims/md", begin=1)
+        self.check(system, [1, 2])
+
+    def test_step(self):
+        system = dpdata.LabeledSystem("fhi_aims/out_md", fmt="fhi_aims/md", step=2)
+        self.check(system, [0, 2])
+
+    def test_begin_step(self):
+        system = dpdata.LabeledSystem(
+            "fhi_aims/out_md", fmt="fhi_aims/md", begin=1, step=2
+        )
+        self.check(system, [1])
+
+
 if __name__ == "__main__":
     unittest.main()
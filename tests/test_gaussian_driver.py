@@ -3,6 +3,8 @@ from __future__ import annotations
 import importlib
 import os
 import shutil
+import sys
+import tempfile
 import unittest
 
 import numpy as np
@@ -128,3 +130,60 @@ class TestDumpGaussianGjf(unittest.TestCase):
     def tearDown(self):
         if os.path.exists("gaussian/tmp.gjf"):
             os.remove("gaussian/tmp.gjf")
+
+
+# a fake g16 that copies a log file, whose energy is the x coordinate of the
+# first atom in the input file
+FAKE_G16 = """
+import random
+import re
+import sys
+import time
+
+ref, inp = sys.argv[1:]
+with open(inp) as f:
+    lines = f.read().splitlines()
+idx = next(ii for ii, ll in enumerate(lines) if re.fullmatch(r"-?\\d+ \\d+", ll))
+x = float(lines[idx + 1].split()[1])
+time.sleep(random.random() * 0.05)
+with open(ref) as f:
+    log = f.read()
+with open(inp[:-4] + ".log", "w") as f:
+    f.write(log.replace("-40.5240137309", f"{x:.10f}"))
+"""
+
+
+class TestGaussianDriverMaxWorkers(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        fake_g16 = os.path.join(self.tmpdir.name, "g16.py")
+        with open(fake_g16, "w") as f:
+            f.write(FAKE_G16)
+        self.gaussian_exec = " ".join(
+            [sys.executable, fake_g16, os.path.abspath("gaussian/methane.gaussianlog")]
+        )
+        system = dpdata.LabeledSystem(
+            "gaussian/methane.gaussianlog", fmt="gaussian/log"
+        ).sub_system([0] * 8)
+        system.data["coords"] = system.data["coords"].copy()
+        system.data["coords"][:, 0, 0] = np.arange(8) * 0.1
+        self.system = dpdata.System(data=system.data)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_max_workers(self):
+        labeled_system = self.system.predict(
+            driver="gaussian",
+            gaussian_exec=self.gaussian_exec,
+            max_workers=4,
+            keywords="force B3LYP",
+            multiplicity=1,
+        )
+        self.assertEqual(labeled_system.get_nframes(), 8)
+        np.testing.assert_allclose(
+            labeled_system["energies"],
+            np.arange(8) * 0.1 * dpdata.gaussian.log.energy_convert,
+            atol=1e-6,
+        )
+        self.assertEqual(labeled_system["forces"].shape, (8, 5, 3))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import shutil
 import unittest
 
 from comp_sys import CompSys
@@ -27,3 +28,37 @@ class TestGaussianGJFComp(unittest.TestCase, CompSys):
         )
         os.remove("tmp.gjf")
         self.places = 6
+
+
+class TestGaussianGJFFrames(unittest.TestCase):
+    def setUp(self):
+        self.system = dpdata.LabeledSystem("poscars/OUTCAR.h2o.md", fmt="vasp/outcar")
+
+    def tearDown(self):
+        shutil.rmtree("tmp.gjfs", ignore_errors=True)
+
+    def test_dump_frames(self):
+        for nprocs in (None, 2):
+            for multiplicity in ("auto", 1):
+                file_names = self.system.to_gaussian_gjf(
+                    "tmp.gjfs",
+                    frame_idx=None,
+                    nprocs=nprocs,
+                    shard_size=2,
+                    keywords="force b3lyp/6-31g*",
+                    multiplicity=multiplicity,
+                )
+                self.assertEqual(len(file_names), self.system.get_nframes())
+                self.assertEqual(
+                    file_names[2], os.path.join("tmp.gjfs", "0001", "000002.gjf")
+                )
+                for ii, file_name in enumerate(file_names):
+                    self.system.to_gaussian_gjf(
+                        "tmp.gjf",
+                        frame_idx=ii,
+                        keywords="force b3lyp/6-31g*",
+                        multiplicity=multiplicity,
+                    )
+                    with open(file_name) as f0, open("tmp.gjf") as f1:
+                        self.assertEqual(f0.read(), f1.read())
+                os.remove("tmp.gjf")
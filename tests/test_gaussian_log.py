@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import numpy as np
@@ -115,5 +118,42 @@ class TestGaussianNoInputOrientation(unittest.TestCase):
             )
 
 
+class TestGaussianLoadLogDirectory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.file_names = [
+            "methane.gaussianlog",
+            "methane_sub.gaussianlog",
+            "oxygen.gaussianlog",
+            "noncoveraged.gaussianlog",
+        ]
+        for ii, ff in enumerate(self.file_names):
+            sub_dir = os.path.join(self.tmpdir.name, str(ii))
+            os.makedirs(sub_dir)
+            shutil.copy(os.path.join("gaussian", ff), os.path.join(sub_dir, "a.log"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load_directory(self):
+        for fmt in ("gaussian/log", "gaussian/md"):
+            ref = dpdata.MultiSystems(
+                *[
+                    dpdata.LabeledSystem(os.path.join("gaussian", ff), fmt=fmt)
+                    for ff in self.file_names[:3]
+                ]
+            )
+            for nprocs in (None, 2):
+                ms = dpdata.MultiSystems.from_file(
+                    self.tmpdir.name, fmt=fmt, nprocs=nprocs
+                )
+                self.assertEqual(ms.get_nframes(), ref.get_nframes())
+                self.assertEqual(sorted(ms.systems), sorted(ref.systems))
+                for kk, ss in ref.systems.items():
+                    np.testing.assert_allclose(ms[kk]["coords"], ss["coords"])
+                    np.testing.assert_allclose(ms[kk]["energies"], ss["energies"])
+                    np.testing.assert_allclose(ms[kk]["forces"], ss["forces"])
+
+
 if __name__ == "__main__":
     unittest.main()
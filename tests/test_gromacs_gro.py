@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import unittest
 
+import numpy as np
 from context import dpdata
 
 
@@ -149,6 +150,18 @@ class TestDumpGromacsGro(unittest.TestCase):
         tmp = dpdata.System("gromacs/tmp_2.gro", type_map=["H", "O"])
         self.assertEqual(tmp.get_nframes(), 2)
 
+    def test_dump_multi_frames_string(self):
+        gro_str = self.system.to_gromacs_gro(None)
+        frames = [
+            self.system.to_gromacs_gro(None, frame_idx=ii)
+            for ii in range(self.system.get_nframes())
+        ]
+        self.assertEqual(gro_str, "\n".join(frames))
+        self.system.to_gromacs_gro("gromacs/tmp_2.gro")
+        tmp = dpdata.System("gromacs/tmp_2.gro", type_map=["H", "O"])
+        np.testing.assert_allclose(tmp["coords"], self.system["coords"], atol=1e-2)
+        np.testing.assert_allclose(tmp["cells"], self.system["cells"], atol=1e-2)
+
     def tearDown(self):
         if os.path.exists("gromacs/tmp_1.gro"):
             os.remove("gromacs/tmp_1.gro")
@@ -31,3 +31,58 @@ class TestMSD(unittest.TestCase):
             self.assertAlmostEqual(msd0[ii], ii * ii, msg="msd0[%d]" % ii)  # noqa: UP031
             self.assertAlmostEqual(msd1[ii], ii * ii * 4, msg="msd1[%d]" % ii)  # noqa: UP031
             self.assertAlmostEqual(msd[ii], (msd0[ii] + msd1[ii]) * 0.5, "msd[%d]" % ii)  # noqa: UP031
+
+
+class TestMSDWindow(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        nframes = 40
+        natoms = 6
+        self.cells = np.tile(np.diag([5.0, 6.0, 7.0]), (nframes, 1, 1))
+        self.cells[:, 1, 0] = 0.5
+        self.unwrapped = np.cumsum(rng.normal(0, 0.3, (nframes, natoms, 3)), axis=0)
+        self.system = dpdata.System()
+        self.system.data["atom_types"] = np.array([0, 1, 1, 0, 1, 1])
+        self.system.data["atom_names"] = ["O", "H"]
+        self.system.data["atom_numbs"] = [2, 4]
+        self.system.data["cells"] = self.cells
+        self.system.data["coords"] = dpdata.md.pbc.apply_pbc(self.unwrapped, self.cells)
+
+    def test_unwrap(self):
+        unwrapped = dpdata.md.pbc.unwrap_coords(
+            self.system["coords"], self.system["cells"]
+        )
+        np.testing.assert_allclose(
+            unwrapped - unwrapped[0], self.unwrapped - self.unwrapped[0], atol=1e-10
+        )
+
+    def test_msd_window(self):
+        begin, window = 3, 10
+        uu = self.unwrapped
+        expected = np.mean(
+            [
+                np.mean(np.sum((uu[ii : ii + window] - uu[ii]) ** 2, axis=-1), axis=1)
+                for ii in range(begin, len(uu) - window + 1)
+            ],
+            axis=0,
+        )
+        msd = dpdata.md.msd.msd(self.system, begin=begin, window=window, chunk_size=4)
+        np.testing.assert_allclose(msd, expected, atol=1e-10)
+
+    def test_msd_fft(self):
+        uu = self.unwrapped[2:]
+        nframes = len(uu)
+        expected = [
+            np.mean(np.sum((uu[mm:] - uu[: nframes - mm]) ** 2, axis=-1), axis=0)
+            for mm in range(nframes)
+        ]
+        expected = np.array(expected)
+        msd = dpdata.md.msd.msd_fft(self.system, begin=2, chunk_size=4)
+        np.testing.assert_allclose(msd, np.mean(expected, axis=1), atol=1e-10)
+        msd_types = dpdata.md.msd.msd_fft(self.system, begin=2, per_type=True)
+        for ii, name in enumerate(["O", "H"]):
+            np.testing.assert_allclose(
+                msd_types[name],
+                np.mean(expected[:, self.system["atom_types"] == ii], axis=1),
+                atol=1e-10,
+            )
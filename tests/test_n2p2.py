@@ -69,6 +69,15 @@ class TestN2P2(unittest.TestCase):
 
         self.assertListEqual(file1_lines, file2_lines)
 
+    def test_match_indices(self):
+        from dpdata.plugins.n2p2 import match_indices
+
+        atype1 = np.array(["O", "H", "H", "O", "H"])
+        atype2 = np.array(["H", "O", "H", "H", "O"])
+        indices = match_indices(atype1, atype2)
+        np.testing.assert_array_equal(indices, [1, 0, 2, 4, 3])
+        np.testing.assert_array_equal(atype2[indices], atype1)
+
     def tearDown(self):
         if os.path.isfile("n2p2/output.data"):
             os.remove("n2p2/output.data")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import unittest
 
+import numpy as np
 from comp_sys import CompSys, IsNoPBC
 from context import dpdata
 
@@ -47,5 +48,64 @@ class TestPickByAmberMask(unittest.TestCase, CompSys, IsNoPBC):
         )
 
 
+class TestPickByAmberMaskParallel(unittest.TestCase, CompSys, IsNoPBC):
+    def setUp(self):
+        parmfile = "amber/corr/qmmm.parm7"
+        interactwith = "(:1)<:6.000000&!@%EP"
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+        self.system_1 = dpdata.LabeledSystem(
+            "amber/corr/dp_corr", fmt="deepmd/npy"
+        ).pick_by_amber_mask(
+            parmfile, interactwith, pass_coords=True, nopbc=True, nprocs=2
+        )["C6EP0H11HW192O6OW96P1"]
+        self.system_2 = dpdata.LabeledSystem(
+            "amber/corr/dp_amber_mask/C6EP0H11HW192O6OW96P1", fmt="deepmd/npy"
+        )
+
+
+class TestPickByAmberMaskFrameOrder(unittest.TestCase, CompSys, IsNoPBC):
+    def setUp(self):
+        parmfile = "amber/corr/qmmm.parm7"
+        interactwith = "(:1)<:6.000000&!@%EP"
+        formula = "C6EP0H11HW192O6OW96P1"
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+        system = dpdata.LabeledSystem("amber/corr/dp_corr", fmt="deepmd/npy")
+        picked = dpdata.LabeledSystem(
+            "amber/corr/dp_amber_mask/" + formula, fmt="deepmd/npy"
+        )
+        # the second frame swaps a water inside the cutoff with one outside,
+        # so its selection differs from the others but the formula is the same
+        swapped = system.copy()
+        coords = swapped.data["coords"]
+        coords[0, [24, 25, 26, 27, 32, 33, 34, 35]] = coords[
+            0, [32, 33, 34, 35, 24, 25, 26, 27]
+        ]
+        # each frame is translated and shifted differently to tell the frames
+        # apart
+        traj = system.copy()
+        self.system_2 = picked.copy()
+        for ii, ss in enumerate((swapped, system.copy()), start=1):
+            frame = picked.copy()
+            for ff in (ss, frame):
+                ff.data["coords"] += ii
+                ff.data["energies"] += ii
+            traj.append(ss)
+            self.system_2.append(frame)
+        self.system_1 = traj.pick_by_amber_mask(
+            parmfile, interactwith, pass_coords=True, nopbc=True, nprocs=2
+        )[formula]
+
+    def test_frame_order(self):
+        np.testing.assert_almost_equal(
+            self.system_1["coords"], self.system_2["coords"], decimal=self.places
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
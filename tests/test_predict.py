@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import tempfile
 import unittest
 
 import numpy as np
 from comp_sys import CompLabeledSys, IsPBC
 from context import dpdata
 
+from dpdata.driver import CachedDriver
+from dpdata.utils import sub_frames
+
 try:
     import ase  # noqa: F401
 except ModuleNotFoundError:
@@ -83,6 +90,105 @@ class TestHybridDriver(unittest.TestCase, CompLabeledSys):
         self.v_places = 6
 
 
+class InPlaceDriver(ZeroDriver):
+    """Shift the coordinates in place, which a sub-driver must not do."""
+
+    def label(self, data):
+        data["coords"] += 1.0
+        return super().label(data)
+
+
+class TestHybridDriverSum(unittest.TestCase):
+    def setUp(self):
+        self.system = dpdata.System(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.scales = [0.5, 1.0, 2.5]
+
+    def test_parallel_sum(self):
+        expected = self.system.predict(driver=ScaledDriver(sum(self.scales)))
+        for executor in ("thread", "process"):
+            with self.subTest(executor=executor):
+                labeled = self.system.predict(
+                    [ScaledDriver(ss) for ss in self.scales],
+                    parallel=True,
+                    executor=executor,
+                    max_workers=2,
+                    driver="hybrid",
+                )
+                for key in ("energies", "forces", "virials"):
+                    np.testing.assert_allclose(labeled[key], expected[key])
+                # the input arrays are returned writable
+                self.assertTrue(labeled["coords"].flags.writeable)
+
+    def test_readonly(self):
+        coords = self.system["coords"].copy()
+        for parallel in (False, True):
+            with self.subTest(parallel=parallel):
+                with self.assertRaises(ValueError):
+                    self.system.predict(
+                        [ZeroDriver(), InPlaceDriver()],
+                        parallel=parallel,
+                        driver="hybrid",
+                    )
+                np.testing.assert_array_equal(self.system["coords"], coords)
+
+
+class AsyncOneDriver(dpdata.driver.AsyncDriver):
+    async def alabel(self, data):
+        await asyncio.sleep(0)
+        return OneDriver().label(data)
+
+
+class TestAsyncDriver(unittest.TestCase, CompLabeledSys):
+    def setUp(self):
+        ori_sys = dpdata.System(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.system_1 = ori_sys.predict(driver=AsyncOneDriver())
+        self.system_2 = asyncio.run(ori_sys.apredict(driver="one"))
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+    def test_multisystems(self):
+        ms = dpdata.MultiSystems(self.system_1)
+        labeled = asyncio.run(ms.apredict(driver=AsyncOneDriver()))
+        np.testing.assert_allclose(labeled[0]["energies"], 1.0)
+
+
+class TestHybridDriverParallel(unittest.TestCase, CompLabeledSys):
+    """Test HybridDriver running the drivers concurrently."""
+
+    executor = "thread"
+
+    def setUp(self):
+        ori_sys = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.system_1 = ori_sys.predict(
+            [OneDriver(), {"type": "one"}, {"type": "one"}, {"type": "zero"}],
+            parallel=True,
+            executor=self.executor,
+            driver="hybrid",
+        )
+        self.system_2 = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        for pp in ("energies", "forces", "virials"):
+            self.system_2.data[pp][:] = 3.0
+
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+
+class TestHybridDriverProcess(TestHybridDriverParallel):
+    executor = "process"
+
+
 @unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
 class TestASEDriver(unittest.TestCase, CompLabeledSys, IsPBC):
     def setUp(self):
@@ -133,3 +239,533 @@ class TestMinimizeMultiSystems(unittest.TestCase, CompLabeledSys, IsPBC):
         self.e_places = 6
         self.f_places = 6
         self.v_places = 4
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestASEDriverNprocs(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        ori_sys = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        one_driver = OneDriver()
+        self.system_1 = ori_sys.predict(one_driver.ase_calculator, driver="ase")
+        self.system_2 = ori_sys.predict(
+            one_driver.ase_calculator, nprocs=2, driver="ase"
+        )
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+    def test_calculator_factory(self):
+        from ase.calculators.emt import EMT
+
+        system = dpdata.System(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        serial = system.predict(EMT(), driver="ase")
+        parallel = system.predict(calculator_factory=EMT, nprocs=2, driver="ase")
+        np.testing.assert_allclose(parallel["energies"], serial["energies"])
+        np.testing.assert_allclose(parallel["forces"], serial["forces"])
+
+    def test_no_calculator(self):
+        with self.assertRaises(ValueError):
+            dpdata.driver.Driver.get_driver("ase")()
+
+
+class TypeDriver(dpdata.driver.Driver):
+    """Label the energy as the sum of atom types, keeping the input data."""
+
+    def label(self, data):
+        self.data = data
+        nframes, natoms = data["coords"].shape[:2]
+        data = data.copy()
+        data["energies"] = np.full(nframes, data["atom_types"].sum(), dtype=float)
+        data["forces"] = np.zeros((nframes, natoms, 3))
+        return data
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestDPDataCalculator(unittest.TestCase):
+    def test_atoms_changed(self):
+        from ase import Atoms
+
+        driver = TypeDriver()
+        calculator = driver.ase_calculator
+        atoms = Atoms("OH2", positions=np.eye(3), cell=np.eye(3) * 5, pbc=True)
+        atoms.calc = calculator
+        self.assertAlmostEqual(atoms.get_potential_energy(), 2.0)
+        self.assertEqual(driver.data["atom_names"], ["O", "H"])
+        self.assertEqual(driver.data["atom_numbs"], [1, 2])
+        self.assertFalse(driver.data["nopbc"])
+        np.testing.assert_allclose(driver.data["coords"][0], np.eye(3))
+        np.testing.assert_allclose(driver.data["cells"][0], np.eye(3) * 5)
+
+        atoms.positions += 0.1
+        self.assertAlmostEqual(atoms.get_potential_energy(), 2.0)
+        np.testing.assert_allclose(driver.data["coords"][0], np.eye(3) + 0.1)
+
+        atoms.set_chemical_symbols(["H", "H", "O"])
+        atoms.pbc = False
+        self.assertAlmostEqual(atoms.get_potential_energy(), 1.0)
+        self.assertEqual(driver.data["atom_names"], ["H", "O"])
+        self.assertEqual(driver.data["atom_numbs"], [2, 1])
+        self.assertTrue(driver.data["nopbc"])
+
+
+@unittest.skipIf(skip_ase, "skip ase related test. install ase to fix")
+class TestMinimizeNprocs(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        ori_sys = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        zero_driver = ZeroDriver()
+        self.system_1 = ori_sys.minimize(
+            driver=zero_driver, minimizer="ase", max_steps=100
+        )
+        self.system_2 = ori_sys.minimize(
+            driver=zero_driver, minimizer="ase", max_steps=100, nprocs=2
+        )
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 6
+
+
+class CountingDriver(dpdata.driver.Driver):
+    """Label the energy as the sum of coordinates and count the labeled frames."""
+
+    def __init__(self):
+        self.nlabeled = 0
+
+    def label(self, data):
+        self.nlabeled += data["coords"].shape[0]
+        data = data.copy()
+        data["energies"] = data["coords"].sum(axis=(1, 2))
+        data["forces"] = data["coords"].copy()
+        return data
+
+
+class DroppingDriver(CountingDriver):
+    """Label the frames like CountingDriver, but drop the frames in `dropped`."""
+
+    def __init__(self, dropped):
+        super().__init__()
+        self.dropped = dropped
+
+    def label(self, data):
+        data = super().label(data)
+        kept = [
+            ii
+            for ii, cc in enumerate(data["coords"])
+            if not any(np.array_equal(cc, dd) for dd in self.dropped)
+        ]
+        return sub_frames(data, kept)
+
+
+class UnknownModelDriver(CountingDriver):
+    def __init__(self):
+        super().__init__()
+        self.model = object()
+
+
+class WorkersDriver(CountingDriver):
+    """Label the frames like CountingDriver with a number of workers."""
+
+    def __init__(self, max_workers=1):
+        super().__init__()
+        self.max_workers = max_workers
+
+
+class TestCachedDriver(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.system = dpdata.System(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_cache_hit(self):
+        counting_driver = CountingDriver()
+        driver = CachedDriver(counting_driver, self.tmpdir.name)
+        system_1 = self.system[:3].predict(driver=driver)
+        self.assertEqual(counting_driver.nlabeled, 3)
+        # only the new frames are labeled
+        system_2 = self.system.predict(driver=driver)
+        self.assertEqual(counting_driver.nlabeled, self.system.get_nframes())
+        np.testing.assert_allclose(
+            system_2["energies"], self.system["coords"].sum(axis=(1, 2))
+        )
+        np.testing.assert_allclose(system_2["forces"], self.system["coords"])
+        np.testing.assert_allclose(system_2["forces"][:3], system_1["forces"])
+        # all frames are cached
+        system_3 = self.system.predict(driver=driver)
+        self.assertEqual(counting_driver.nlabeled, self.system.get_nframes())
+        np.testing.assert_allclose(system_3["energies"], system_2["energies"])
+
+    def test_fingerprint(self):
+        counting_driver = CountingDriver()
+        self.system.predict(
+            driver=CachedDriver(counting_driver, self.tmpdir.name, fingerprint="a")
+        )
+        self.system.predict(
+            driver=CachedDriver(counting_driver, self.tmpdir.name, fingerprint="b")
+        )
+        self.assertEqual(counting_driver.nlabeled, 2 * self.system.get_nframes())
+
+    def test_decimals(self):
+        counting_driver = CountingDriver()
+        driver = CachedDriver(counting_driver, self.tmpdir.name, decimals=4)
+        # keep away from the rounding boundaries
+        self.system.data["coords"] = np.round(self.system.data["coords"], 4)
+        self.system.predict(driver=driver)
+        system = self.system.copy()
+        system.data["coords"] = system.data["coords"] + 1e-7
+        system.predict(driver=driver)
+        self.assertEqual(counting_driver.nlabeled, self.system.get_nframes())
+
+    def test_max_size(self):
+        counting_driver = CountingDriver()
+        driver = CachedDriver(counting_driver, self.tmpdir.name)
+        self.system[:1].predict(driver=driver)
+        size = sum(
+            os.path.getsize(os.path.join(root, ff))
+            for root, _, files in os.walk(self.tmpdir.name)
+            for ff in files
+        )
+        driver = CachedDriver(counting_driver, self.tmpdir.name, max_size=2 * size)
+        self.system.predict(driver=driver)
+        nfiles = sum(len(files) for _, _, files in os.walk(self.tmpdir.name))
+        self.assertEqual(nfiles, 2)
+
+    def test_dict_driver(self):
+        driver = CachedDriver({"type": "one"}, self.tmpdir.name)
+        system = self.system.predict(driver=driver)
+        np.testing.assert_allclose(system["energies"], 1.0)
+        np.testing.assert_allclose(system["virials"], 1.0)
+        system = self.system.predict(driver=driver)
+        np.testing.assert_allclose(system["virials"], 1.0)
+
+    def test_dropped_frames(self):
+        coords = self.system["coords"]
+        counting_driver = DroppingDriver([coords[1]])
+        driver = CachedDriver(counting_driver, self.tmpdir.name, fingerprint="a")
+        system = self.system.predict(driver=driver)
+        kept = [0] + list(range(2, self.system.get_nframes()))
+        np.testing.assert_allclose(system["coords"], coords[kept])
+        np.testing.assert_allclose(system["energies"], coords[kept].sum(axis=(1, 2)))
+        # the frames are labeled in a batch, and then one by one
+        nframes = self.system.get_nframes()
+        self.assertEqual(counting_driver.nlabeled, 2 * nframes)
+        # only the dropped frame is labeled again
+        system = self.system.predict(driver=driver)
+        self.assertEqual(counting_driver.nlabeled, 2 * nframes + 1)
+        np.testing.assert_allclose(system["energies"], coords[kept].sum(axis=(1, 2)))
+
+    def test_all_frames_dropped(self):
+        counting_driver = DroppingDriver(list(self.system["coords"]))
+        driver = CachedDriver(counting_driver, self.tmpdir.name, fingerprint="a")
+        system = self.system.predict(driver=driver)
+        self.assertEqual(system.get_nframes(), 0)
+        self.assertEqual(system["energies"].shape, (0,))
+        self.assertEqual(system["forces"].shape, (0, self.system.get_natoms(), 3))
+
+    def test_corrupt_cache(self):
+        counting_driver = CountingDriver()
+        driver = CachedDriver(counting_driver, self.tmpdir.name)
+        self.system.predict(driver=driver)
+        keys = driver.frame_keys(self.system.data)
+        # a truncated file and a file of garbage
+        path = driver._path(keys[0])
+        with open(path, "rb") as f:
+            content = f.read()
+        with open(path, "wb") as f:
+            f.write(content[: len(content) // 2])
+        with open(driver._path(keys[1]), "wb") as f:
+            f.write(b"garbage")
+        labeled = self.system.predict(driver=driver)
+        self.assertEqual(counting_driver.nlabeled, self.system.get_nframes() + 2)
+        np.testing.assert_allclose(
+            labeled["energies"], self.system["coords"].sum(axis=(1, 2))
+        )
+        # the corrupt files are replaced
+        self.system.predict(driver=driver)
+        self.assertEqual(counting_driver.nlabeled, self.system.get_nframes() + 2)
+
+    def test_driver_fingerprint(self):
+        with self.assertRaises(ValueError):
+            CachedDriver(UnknownModelDriver(), self.tmpdir.name)
+        counting_driver = UnknownModelDriver()
+        counting_driver.fingerprint = "model a"
+        driver = CachedDriver(counting_driver, self.tmpdir.name)
+        self.system.predict(driver=driver)
+        counting_driver.fingerprint = "model b"
+        driver = CachedDriver(counting_driver, self.tmpdir.name)
+        self.system.predict(driver=driver)
+        self.assertEqual(counting_driver.nlabeled, 2 * self.system.get_nframes())
+
+    def test_concurrency_settings(self):
+        self.system.predict(driver=CachedDriver(WorkersDriver(1), self.tmpdir.name))
+        counting_driver = WorkersDriver(4)
+        labeled = self.system.predict(
+            driver=CachedDriver(counting_driver, self.tmpdir.name)
+        )
+        self.assertEqual(counting_driver.nlabeled, 0)
+        self.assertEqual(labeled.get_nframes(), self.system.get_nframes())
+
+    def test_composite_fingerprint(self):
+        fingerprint = dpdata.driver.driver_fingerprint
+        sqm_1 = dpdata.driver.Driver.get_driver("sqm")(theory="DFTB3", max_workers=1)
+        sqm_2 = dpdata.driver.Driver.get_driver("sqm")(theory="DFTB3", max_workers=8)
+        sqm_3 = dpdata.driver.Driver.get_driver("sqm")(theory="AM1")
+        self.assertEqual(fingerprint(sqm_1), fingerprint(sqm_2))
+        self.assertNotEqual(fingerprint(sqm_1), fingerprint(sqm_3))
+        hybrid = dpdata.driver.HybridDriver
+        self.assertEqual(
+            fingerprint(hybrid([sqm_1, ZeroDriver()])),
+            fingerprint(hybrid([sqm_2, ZeroDriver()], parallel=True, max_workers=2)),
+        )
+        self.assertNotEqual(
+            fingerprint(hybrid([sqm_1, ZeroDriver()])),
+            fingerprint(hybrid([sqm_3, ZeroDriver()])),
+        )
+        async_driver = dpdata.driver.AsyncSubprocessDriver
+        self.assertEqual(
+            fingerprint(async_driver(sqm_1, max_jobs=4)),
+            fingerprint(async_driver(sqm_2, max_jobs=64)),
+        )
+        cached = CachedDriver(hybrid([sqm_1, ZeroDriver()]), self.tmpdir.name)
+        self.assertNotEqual(fingerprint(cached), fingerprint(sqm_1))
+
+    @unittest.skipIf(skip_ase, "requires ase")
+    def test_ase_fingerprint(self):
+        from ase.calculators.emt import EMT
+        from ase.calculators.lj import LennardJones
+
+        from dpdata.ase_calculator import DPDataCalculator
+
+        fingerprint = dpdata.driver.driver_fingerprint
+        ase_driver = dpdata.driver.Driver.get_driver("ase")
+        self.assertEqual(
+            fingerprint(ase_driver(LennardJones(sigma=2.0))),
+            fingerprint(ase_driver(LennardJones(sigma=2.0), nprocs=4)),
+        )
+        self.assertNotEqual(
+            fingerprint(ase_driver(LennardJones(sigma=2.0))),
+            fingerprint(ase_driver(LennardJones(sigma=3.0))),
+        )
+        self.assertNotEqual(
+            fingerprint(ase_driver(DPDataCalculator(ZeroDriver()))),
+            fingerprint(ase_driver(DPDataCalculator(OneDriver()))),
+        )
+        self.assertNotEqual(
+            fingerprint(ase_driver(calculator_factory=EMT)),
+            fingerprint(ase_driver(EMT())),
+        )
+        with self.assertRaises(ValueError):
+            fingerprint(ase_driver(calculator_factory=lambda: EMT()))
+
+
+class InterruptedDriver(CountingDriver):
+    """Raise an error once `limit` frames have been labeled."""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def label(self, data):
+        if self.nlabeled >= self.limit:
+            raise RuntimeError("interrupted")
+        return super().label(data)
+
+
+class TestPredictCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.system = dpdata.System(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.expected = self.system.predict(driver=CountingDriver())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def check(self, labeled):
+        self.assertEqual(labeled.get_nframes(), self.expected.get_nframes())
+        for key in ("coords", "energies", "forces"):
+            np.testing.assert_allclose(labeled[key], self.expected[key])
+
+    def test_chunks(self):
+        driver = CountingDriver()
+        self.check(self.system.predict(driver=driver, chunk_size=2))
+        self.assertEqual(driver.nlabeled, 3)
+
+    def test_resume(self):
+        for fmt in ("deepmd/npy", "deepmd/hdf5"):
+            with self.subTest(fmt=fmt):
+                checkpoint_dir = os.path.join(self.tmpdir.name, fmt.replace("/", "_"))
+                driver = InterruptedDriver(limit=2)
+                with self.assertRaises(RuntimeError):
+                    self.system.predict(
+                        driver=driver,
+                        chunk_size=2,
+                        checkpoint_dir=checkpoint_dir,
+                        checkpoint_fmt=fmt,
+                        fingerprint="counting",
+                    )
+                # only the unfinished chunk is labeled again
+                driver = CountingDriver()
+                labeled = self.system.predict(
+                    driver=driver,
+                    chunk_size=2,
+                    checkpoint_dir=checkpoint_dir,
+                    checkpoint_fmt=fmt,
+                    fingerprint="counting",
+                )
+                self.assertEqual(driver.nlabeled, 1)
+                self.check(labeled)
+                with open(os.path.join(checkpoint_dir, "manifest.json")) as f:
+                    manifest = json.load(f)
+                self.assertEqual(
+                    sorted(rr["nframes"] for rr in manifest["chunks"].values()),
+                    [1, 2],
+                )
+
+    def test_changed_frames(self):
+        checkpoint_dir = self.tmpdir.name
+        self.system.predict(
+            driver=CountingDriver(), chunk_size=2, checkpoint_dir=checkpoint_dir
+        )
+        system = self.system.copy()
+        system.data["coords"][2] += 0.1
+        driver = CountingDriver()
+        system.predict(driver=driver, chunk_size=2, checkpoint_dir=checkpoint_dir)
+        self.assertEqual(driver.nlabeled, 1)
+
+    def test_changed_driver(self):
+        checkpoint_dir = self.tmpdir.name
+        self.system.predict(
+            driver=ScaledDriver(1.0), chunk_size=2, checkpoint_dir=checkpoint_dir
+        )
+        driver = ScaledDriver(2.0)
+        labeled = self.system.predict(
+            driver=driver, chunk_size=2, checkpoint_dir=checkpoint_dir
+        )
+        np.testing.assert_allclose(
+            labeled["energies"], self.system.predict(driver=driver)["energies"]
+        )
+        with open(os.path.join(checkpoint_dir, "manifest.json")) as f:
+            manifest = json.load(f)
+        for record in manifest["chunks"].values():
+            self.assertEqual(record["driver"], dpdata.driver.driver_fingerprint(driver))
+
+    def test_concurrency_settings(self):
+        checkpoint_dir = self.tmpdir.name
+        self.system.predict(
+            driver=WorkersDriver(1), chunk_size=2, checkpoint_dir=checkpoint_dir
+        )
+        driver = WorkersDriver(4)
+        self.check(
+            self.system.predict(
+                driver=driver, chunk_size=2, checkpoint_dir=checkpoint_dir
+            )
+        )
+        self.assertEqual(driver.nlabeled, 0)
+
+    def test_hybrid_driver(self):
+        checkpoint_dir = self.tmpdir.name
+        hybrid = dpdata.driver.HybridDriver([CountingDriver(), ZeroDriver()])
+        self.system.predict(driver=hybrid, chunk_size=2, checkpoint_dir=checkpoint_dir)
+        driver = CountingDriver()
+        hybrid = dpdata.driver.HybridDriver([driver, ZeroDriver()], parallel=True)
+        labeled = self.system.predict(
+            driver=hybrid, chunk_size=2, checkpoint_dir=checkpoint_dir
+        )
+        self.assertEqual(driver.nlabeled, 0)
+        self.check(labeled)
+
+    def test_log_throughput(self):
+        with self.assertLogs("dpdata.system", level="INFO") as cm:
+            self.system.predict(driver=CountingDriver(), chunk_size=2)
+        self.assertEqual(len(cm.output), 2)
+        self.assertIn("frames/s", cm.output[0])
+
+    def test_multisystems(self):
+        ms = dpdata.MultiSystems(self.system)
+        driver = CountingDriver()
+        ms.predict(driver=driver, chunk_size=2, checkpoint_dir=self.tmpdir.name)
+        driver = CountingDriver()
+        labeled = ms.predict(
+            driver=driver, chunk_size=2, checkpoint_dir=self.tmpdir.name
+        )
+        self.assertEqual(driver.nlabeled, 0)
+        self.check(labeled[0])
+
+
+@dpdata.driver.Driver.register("scaled")
+class ScaledDriver(dpdata.driver.Driver):
+    """Label the energy, forces, and virials as the coordinates times a scale."""
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+
+    def label(self, data):
+        data = data.copy()
+        coords = data["coords"]
+        data["energies"] = coords.sum(axis=(1, 2)) * self.scale
+        data["forces"] = coords * self.scale
+        data["virials"] = np.repeat(coords[:, :1, :], 3, axis=1) * self.scale
+        return data
+
+
+class TestModelDevi(unittest.TestCase):
+    def setUp(self):
+        self.system = dpdata.System(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.scales = [0.9, 1.0, 1.2]
+        self.drivers = [ScaledDriver(ss) for ss in self.scales]
+
+    def test_model_devi(self):
+        labels = [self.system.predict(driver=dd) for dd in self.drivers]
+        energies = np.array([ll["energies"] for ll in labels])
+        forces = np.array([ll["forces"] for ll in labels])
+        virials = np.array([ll["virials"] for ll in labels])
+        natoms = self.system.get_natoms()
+        devi_f = np.linalg.norm(np.std(forces, axis=0), axis=-1)
+        devi_v = np.std(virials, axis=0).reshape(-1, 9) / natoms
+        for batch_size in (None, 2):
+            devi = self.system.model_devi(
+                [
+                    self.drivers[0],
+                    {"type": "scaled", "scale": 1.0},
+                    self.drivers[2],
+                ],
+                batch_size=batch_size,
+            )
+            np.testing.assert_allclose(
+                devi["devi_e"], np.std(energies, axis=0) / natoms
+            )
+            np.testing.assert_allclose(devi["devi_f"], devi_f)
+            np.testing.assert_allclose(devi["max_devi_f"], devi_f.max(axis=1))
+            np.testing.assert_allclose(devi["min_devi_f"], devi_f.min(axis=1))
+            np.testing.assert_allclose(devi["avg_devi_f"], devi_f.mean(axis=1))
+            np.testing.assert_allclose(devi["max_devi_v"], devi_v.max(axis=1))
+            np.testing.assert_allclose(devi["min_devi_v"], devi_v.min(axis=1))
+            np.testing.assert_allclose(devi["avg_devi_v"], devi_v.mean(axis=1))
+            self.assertNotIn("candidate", devi)
+
+    def test_trust_levels(self):
+        devi = self.system.model_devi(self.drivers)
+        max_devi_f = np.sort(devi["max_devi_f"])
+        lo = (max_devi_f[0] + max_devi_f[1]) / 2
+        hi = (max_devi_f[1] + max_devi_f[2]) / 2
+        devi = self.system.model_devi(self.drivers, f_trust_lo=lo, f_trust_hi=hi)
+        self.assertEqual(np.count_nonzero(devi["accurate"]), 1)
+        self.assertEqual(np.count_nonzero(devi["candidate"]), 1)
+        self.assertEqual(np.count_nonzero(devi["failed"]), 1)
+        np.testing.assert_array_equal(
+            devi["candidate"], (devi["max_devi_f"] >= lo) & (devi["max_devi_f"] < hi)
+        )
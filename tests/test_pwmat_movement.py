@@ -128,5 +128,19 @@ class TestpwmatLabeledOutput1(unittest.TestCase, TestpwmatSinglePointEnergy1):
         self.system = dpdata.LabeledSystem("pwmat/MOVEMENT_1", fmt="pwmat/movement")
 
 
+class TestpwmatMovementBeginStep(unittest.TestCase):
+    def setUp(self):
+        self.system_all = dpdata.LabeledSystem("pwmat/MOVEMENT", fmt="pwmat/MOVEMENT")
+        self.system = dpdata.LabeledSystem(
+            "pwmat/MOVEMENT", fmt="pwmat/MOVEMENT", begin=3, step=7
+        )
+
+    def test_begin_step(self):
+        ref = self.system_all.sub_system(range(3, len(self.system_all), 7))
+        self.assertEqual(len(self.system), len(ref))
+        for kk in ("cells", "coords", "energies", "forces"):
+            np.testing.assert_allclose(self.system.data[kk], ref.data[kk])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import unittest
 
 from comp_sys import CompLabeledSys, IsPBC
@@ -116,5 +117,47 @@ class TestQuipGapxyzNoVirials(unittest.TestCase, CompLabeledSys, IsPBC):
         self.f_places = 6
 
 
+class TestQuipGapxyzParallel(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.multi_systems_1 = dpdata.MultiSystems.from_file(
+            "xyz/xyz_unittest.xyz", fmt="quip/gap/xyz", nprocs=2
+        )
+        self.system_1 = self.multi_systems_1.systems["B5C7"]
+        self.multi_systems_2 = dpdata.MultiSystems.from_file(
+            "xyz/xyz_unittest.xyz", fmt="quip/gap/xyz"
+        )
+        self.system_2 = self.multi_systems_2.systems["B5C7"]
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+
+class TestQuipGapxyzDump(unittest.TestCase, CompLabeledSys, IsPBC):
+    def setUp(self):
+        self.multi_systems = dpdata.MultiSystems.from_file(
+            "xyz/xyz_unittest.xyz", fmt="quip/gap/xyz"
+        )
+        self.multi_systems.to("quip/gap/xyz", "xyz/tmp.dump.xyz")
+        self.multi_systems_dumped = dpdata.MultiSystems.from_file(
+            "xyz/tmp.dump.xyz", fmt="quip/gap/xyz"
+        )
+        self.system_1 = self.multi_systems.systems["B1C9"]
+        self.system_2 = self.multi_systems_dumped.systems["B1C9"]
+        self.places = 6
+        self.e_places = 6
+        self.f_places = 6
+        self.v_places = 4
+
+    def tearDown(self):
+        if os.path.isfile("xyz/tmp.dump.xyz"):
+            os.remove("xyz/tmp.dump.xyz")
+
+    def test_nsystems(self):
+        self.assertEqual(
+            len(self.multi_systems_dumped.systems), len(self.multi_systems.systems)
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
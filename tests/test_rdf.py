@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import itertools
+import unittest
+
+import numpy as np
+from context import dpdata
+
+from dpdata.md.rdf import compute_rdf, partial_rdf, rdf
+
+
+def brute_force_counts(box, posis, atype, max_r, nbins):
+    """Count the pairs by enumerating the periodic images."""
+    # the atoms may be outside the box by one box length
+    nimages = 2 + int(
+        np.ceil(max_r / np.min(1.0 / np.linalg.norm(np.linalg.inv(box), axis=0)))
+    )
+    counts = np.zeros((atype.max() + 1, atype.max() + 1, nbins))
+    for image in itertools.product(range(-nimages, nimages + 1), repeat=3):
+        diff = posis[None, :, :] - posis[:, None, :] + np.dot(image, box)
+        dr = np.linalg.norm(diff, axis=-1)
+        for ii, jj in zip(*np.nonzero(dr < max_r)):
+            if ii == jj and not any(image):
+                continue
+            si = int(dr[ii, jj] / (max_r / nbins))
+            if si < nbins:
+                counts[atype[ii], atype[jj], si] += 1
+    return counts
+
+
+class TestRDF(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.box = np.array(
+            [[[6.0, 0.0, 0.0], [1.0, 5.0, 0.0], [0.5, -1.0, 7.0]]]
+        ).repeat(2, axis=0)
+        self.box[1] *= 1.05
+        self.posis = rng.uniform(-2.0, 8.0, (2, 20, 3))
+        self.atype = rng.integers(0, 2, 20)
+        self.max_r = 4.0
+        self.nbins = 20
+
+    def test_counts(self):
+        self.check_counts()
+
+    def test_counts_cell_list(self):
+        # the box is divided into 3 cells along two directions
+        self.box = self.box * 2.1
+        self.posis = self.posis * 2.1
+        self.check_counts()
+
+    def check_counts(self):
+        for sel_type in ([None, None], [0, [0, 1]], [1, 0]):
+            xx, gr, coord = compute_rdf(
+                self.box,
+                self.posis,
+                self.atype,
+                sel_type=sel_type,
+                max_r=self.max_r,
+                nbins=self.nbins,
+            )
+            sel = [[0, 1] if ss is None else np.ravel(ss) for ss in sel_type]
+            c0 = np.isin(self.atype, sel[0]).sum()
+            c1 = np.isin(self.atype, sel[1]).sum()
+            hh = self.max_r / self.nbins
+            vol = (
+                4.0 / 3.0 * np.pi * hh**3 * (np.arange(1, 21) ** 3 - np.arange(20) ** 3)
+            )
+            expected_gr = []
+            expected_coord = []
+            for box, posis in zip(self.box, self.posis):
+                counts = brute_force_counts(
+                    box, posis, self.atype, self.max_r, self.nbins
+                )
+                stat = counts[sel[0]][:, sel[1]].sum(axis=(0, 1))
+                expected_gr.append(stat / vol / (c1 / np.linalg.det(box)) / c0)
+                expected_coord.append(np.concatenate(([0], np.cumsum(stat)[:-1])) / c0)
+            np.testing.assert_allclose(xx, np.arange(20) * hh)
+            np.testing.assert_allclose(gr, np.mean(expected_gr, axis=0))
+            np.testing.assert_allclose(coord, np.mean(expected_coord, axis=0))
+
+    def test_partial_nprocs(self):
+        system = dpdata.System(
+            data={
+                "atom_names": ["A", "B"],
+                "atom_numbs": [np.sum(self.atype == 0), np.sum(self.atype == 1)],
+                "atom_types": self.atype,
+                "cells": self.box,
+                "coords": self.posis,
+                "orig": np.zeros(3),
+            }
+        )
+        xx, gr, coord = partial_rdf(
+            system, max_r=self.max_r, nbins=self.nbins, nprocs=2
+        )
+        for t0, t1 in itertools.product(range(2), repeat=2):
+            _, gr_sel, coord_sel = rdf(
+                system, sel_type=[t0, t1], max_r=self.max_r, nbins=self.nbins
+            )
+            np.testing.assert_allclose(gr[t0, t1], gr_sel)
+            np.testing.assert_allclose(coord[t0, t1], coord_sel)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import tempfile
 import unittest
 
 import numpy as np
@@ -158,5 +160,51 @@ class TestAimdSIESTALabeledOutput(unittest.TestCase, TestSIESTASinglePointEnergy
         # self.system.data = dpdata.siesta.output.obtain_frame('siesta/siesta_output')
 
 
+class TestAimdSIESTASteps(unittest.TestCase):
+    """Compare each step with the output of the former multi-pass parser."""
+
+    def setUp(self):
+        self.nframes = 5
+        self.ref = {
+            name: np.loadtxt(os.path.join("siesta/aimd", name))
+            for name in ("cell", "coord", "energy", "force", "virial")
+        }
+
+    def check(self, system, nframes):
+        self.assertEqual(system.get_nframes(), nframes)
+        cells = self.ref["cell"].reshape(self.nframes, 3, 3)[:nframes]
+        vols = np.linalg.det(cells)[:, None, None]
+        expected = {
+            "cells": cells,
+            "coords": self.ref["coord"].reshape(self.nframes, 64, 3)[:nframes],
+            "energies": self.ref["energy"][:nframes],
+            "forces": self.ref["force"].reshape(self.nframes, 64, 3)[:nframes],
+            "virials": self.ref["virial"].reshape(self.nframes, 3, 3)[:nframes] * vols,
+        }
+        for ii in range(nframes):
+            for key, value in expected.items():
+                np.testing.assert_allclose(
+                    system[key][ii], value[ii], atol=1e-6, err_msg=f"{key} {ii}"
+                )
+
+    def test_steps(self):
+        system = dpdata.LabeledSystem("siesta/aimd/output", fmt="siesta/aiMD_output")
+        self.check(system, self.nframes)
+
+    def test_truncated(self):
+        # the output ends in the force block of the last step
+        with open("siesta/aimd/output") as f:
+            lines = f.readlines()
+        last_force = max(
+            ii for ii, line in enumerate(lines) if "Atomic forces (eV/Ang)" in line
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "output")
+            with open(fname, "w") as f:
+                f.writelines(lines[: last_force + 10])
+            system = dpdata.LabeledSystem(fname, fmt="siesta/aiMD_output")
+        self.check(system, self.nframes - 1)
+
+
 if __name__ == "__main__":
     unittest.main()
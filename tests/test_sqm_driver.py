@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import shutil
+import sys
+import tempfile
 import unittest
 
 import numpy as np
@@ -34,3 +38,96 @@ class TestSQMdriver(unittest.TestCase, CompSys, IsNoPBC):
     def test_forces(self):
         forces = self.system_2["forces"]
         np.testing.assert_allclose(forces, np.zeros_like(forces))
+
+
+# a fake sqm that copies an output file, whose energy is the x coordinate of
+# the first atom in the input file
+FAKE_SQM = """
+import random
+import re
+import sys
+import time
+
+ref = sys.argv[1]
+inp = sys.argv[sys.argv.index("-i") + 1]
+out = sys.argv[sys.argv.index("-o") + 1]
+with open(inp) as f:
+    lines = f.read().splitlines()
+x = float(lines[lines.index(" /") + 1].split()[2])
+time.sleep(random.random() * 0.05)
+with open(ref) as f:
+    text = f.read()
+text = re.sub(
+    r"( Total SCF energy .*\\( +)\\S+( eV\\))", rf"\\g<1>{x:.8f}\\g<2>", text
+)
+with open(out, "w") as f:
+    f.write(text)
+"""
+
+
+class TestSQMdriverMaxWorkers(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        fake_sqm = os.path.join(self.tmpdir.name, "sqm.py")
+        with open(fake_sqm, "w") as f:
+            f.write(FAKE_SQM)
+        self.sqm_exec = " ".join(
+            [sys.executable, fake_sqm, os.path.abspath("amber/sqm_forces.out")]
+        )
+        self.system = dpdata.System(
+            data={
+                "atom_names": ["H"],
+                "atom_numbs": [1],
+                "atom_types": np.zeros((1,), dtype=int),
+                "coords": np.arange(8).reshape(8, 1, 1) * np.array([0.1, 0.0, 0.0]),
+                "cells": np.zeros((8, 3, 3)),
+                "orig": np.zeros(3),
+                "nopbc": True,
+            }
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_max_workers(self):
+        labeled_system = self.system.predict(
+            driver="sqm", sqm_exec=self.sqm_exec, max_workers=4
+        )
+        self.assertEqual(labeled_system.get_nframes(), 8)
+        np.testing.assert_allclose(
+            labeled_system["energies"], np.arange(8) * 0.1, atol=1e-6
+        )
+
+    def test_async(self):
+        driver = dpdata.driver.AsyncSubprocessDriver(
+            {"type": "sqm", "sqm_exec": self.sqm_exec}, max_jobs=4
+        )
+
+        async def main():
+            return await asyncio.gather(
+                self.system.apredict(driver=driver),
+                self.system.sub_system([3, 1]).apredict(driver=driver),
+            )
+
+        labeled_system, labeled_sub_system = asyncio.run(main())
+        np.testing.assert_allclose(
+            labeled_system["energies"], np.arange(8) * 0.1, atol=1e-6
+        )
+        np.testing.assert_allclose(
+            labeled_sub_system["energies"], [0.3, 0.1], atol=1e-6
+        )
+
+    def test_async_failed(self):
+        failed_sqm = os.path.join(self.tmpdir.name, "failed_sqm.py")
+        with open(failed_sqm, "w") as f:
+            f.write(
+                "import sys\n"
+                "with open(sys.argv[sys.argv.index('-o') + 1], 'w') as f:\n"
+                "    f.write('error')\n"
+                "sys.exit(1)\n"
+            )
+        with self.assertRaises(RuntimeError):
+            self.system.predict(
+                {"type": "sqm", "sqm_exec": f"{sys.executable} {failed_sqm}"},
+                driver="async",
+            )
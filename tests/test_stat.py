@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import unittest
 
+import numpy as np
 from context import dpdata
 
 
@@ -31,3 +32,76 @@ class TestStat(unittest.TestCase):
         self.assertAlmostEqual(e.e_rmse, 1014.7946598792427, 6)
         self.assertAlmostEqual(e.f_mae, 0.004113640526088011, 6)
         self.assertAlmostEqual(e.f_rmse, 0.005714011247538185, 6)
+
+
+class TestErrorStats(unittest.TestCase):
+    def setUp(self):
+        self.system1 = dpdata.LabeledSystem(
+            "poscars/deepmd.h2o.md", fmt="deepmd/raw", type_map=["O", "H"]
+        )
+        self.system2 = self.system1.copy()
+        rng = np.random.default_rng(1)
+        for key in ("energies", "forces", "virials"):
+            self.system2.data[key] = self.system2.data[key] + rng.normal(
+                size=self.system2.data[key].shape
+            )
+
+    def test_errors(self):
+        stats = dpdata.stat.ErrorStats().update(
+            self.system1, self.system2, chunk_size=2
+        )
+        e = dpdata.stat.Errors(self.system1, self.system2)
+        self.assertAlmostEqual(stats.e_mae, e.e_mae)
+        self.assertAlmostEqual(stats.e_rmse, e.e_rmse)
+        self.assertAlmostEqual(stats.f_mae, e.f_mae)
+        self.assertAlmostEqual(stats.f_rmse, e.f_rmse)
+        self.assertAlmostEqual(stats.v_mae, e.v_mae)
+        self.assertAlmostEqual(stats.v_rmse, e.v_rmse)
+        self.assertAlmostEqual(stats.force.max_error, np.max(np.abs(e.f_errors)))
+
+    def test_elements(self):
+        stats = dpdata.stat.ErrorStats().update(self.system1, self.system2)
+        f_errors = self.system1["forces"] - self.system2["forces"]
+        for ii, name in enumerate(self.system1["atom_names"]):
+            mask = self.system1["atom_types"] == ii
+            self.assertEqual(stats.elements[name].count, f_errors[:, mask].size)
+            self.assertAlmostEqual(
+                stats.elements[name].rmse,
+                dpdata.stat.rmse(f_errors[:, mask]),
+            )
+
+    def test_multi(self):
+        system3 = dpdata.LabeledSystem(
+            "gaussian/methane.gaussianlog", fmt="gaussian/log"
+        )
+        system4 = dpdata.LabeledSystem("amber/sqm_opt.out", fmt="sqm/out")
+        ms1 = dpdata.MultiSystems(self.system1, system3)
+        ms2 = dpdata.MultiSystems(self.system2, system4)
+        stats = dpdata.stat.ErrorStats().update_multi(ms1, ms2, chunk_size=1)
+        e = dpdata.stat.MultiErrors(ms1, ms2)
+        self.assertAlmostEqual(stats.e_rmse, dpdata.stat.rmse(e.e_errors))
+        self.assertAlmostEqual(stats.f_mae, dpdata.stat.mae(e.f_errors))
+        self.assertEqual(sorted(stats.formulas), sorted(ms1.systems))
+        e_h2o = dpdata.stat.Errors(self.system1, self.system2)
+        self.assertAlmostEqual(stats.formulas["O2H4C0"]["force"].mae, e_h2o.f_mae)
+
+    def test_histogram(self):
+        bins = np.array([0.0, 0.5, 1.0, 2.0])
+        acc = dpdata.stat.ErrorAccumulator(bins)
+        acc.update(np.array([0.1, -0.7, 1.5]))
+        acc.update(np.array([-3.0, 0.2]))
+        np.testing.assert_array_equal(acc.hist, [2, 1, 2])
+        self.assertEqual(acc.count, 5)
+        self.assertAlmostEqual(acc.max_error, 3.0)
+        other = dpdata.stat.ErrorAccumulator(bins)
+        other.update(np.array([0.6]))
+        acc.merge(other)
+        np.testing.assert_array_equal(acc.hist, [2, 2, 2])
+        self.assertAlmostEqual(acc.mae, (0.1 + 0.7 + 1.5 + 3.0 + 0.2 + 0.6) / 6)
+
+    def test_histogram_below_first_edge(self):
+        bins = np.array([0.1, 0.5, 1.0])
+        acc = dpdata.stat.ErrorAccumulator(bins)
+        acc.update(np.array([0.0, -0.05, 0.3, 2.0]))
+        np.testing.assert_array_equal(acc.hist, [3, 1])
+        self.assertEqual(acc.hist.sum(), acc.count)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import os
+import shutil
 import unittest
 
+import numpy as np
 from context import dpdata
 from poscars.poscar_ref_oh import TestPOSCARoh
 
@@ -73,5 +75,35 @@ class TestPOSCARSkipZeroAtomNumb(unittest.TestCase):
         myfilecmp(self, "POSCAR.tmp.1", "POSCAR.tmp.2")
 
 
+class TestPOSCARDumpFrames(unittest.TestCase):
+    def setUp(self):
+        self.system = dpdata.System(
+            os.path.join("poscars", "POSCAR.h2o.md"), fmt="vasp/poscar"
+        )
+        self.system.append(self.system.perturb(3, 0.01, 0.1))
+
+    def tearDown(self):
+        shutil.rmtree("tmp.poscars", ignore_errors=True)
+
+    def test_dump_all_frames(self):
+        for nprocs in (None, 2):
+            self.system.to_vasp_poscar("tmp.poscars", frame_idx=None, nprocs=nprocs)
+            for ii in range(self.system.get_nframes()):
+                with open(os.path.join("tmp.poscars", f"{ii:06d}", "POSCAR")) as fp:
+                    self.assertEqual(
+                        fp.read(), self.system.to_vasp_string(frame_idx=ii)
+                    )
+
+    def test_dump_selected_frames(self):
+        self.system.to_vasp_poscar("tmp.poscars", frame_idx=[1, 3], nprocs=2)
+        self.assertEqual(sorted(os.listdir("tmp.poscars")), ["000001", "000003"])
+        system = dpdata.System(
+            os.path.join("tmp.poscars", "000003", "POSCAR"), fmt="vasp/poscar"
+        )
+        np.testing.assert_allclose(
+            system["coords"][0], self.system["coords"][3], atol=1e-9
+        )
+
+
 if __name__ == "__main__":
     unittest.main()